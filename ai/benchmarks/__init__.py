@@ -0,0 +1,18 @@
+"""
+Benchmarks Module
+Synthetic semesters and performance measurements for the schedule generator and PDF parsing
+"""
+
+from .pdf_extraction import DEFAULT_PDF_COURSE_COUNTS, run_pdf_benchmark, run_pdf_case
+from .runner import (DEFAULT_SCENARIOS, ENGINES, compare_results, load_results, run_benchmark,
+                     run_scenario, save_results)
+from .synthetic import DAY_DISTRIBUTIONS, build_semester, sample_requests
+from .synthetic_pdf import build_offering_pdf, offering_rows, write_offering_pdf
+
+__all__ = [
+    'DEFAULT_SCENARIOS', 'ENGINES', 'DAY_DISTRIBUTIONS',
+    'build_semester', 'sample_requests',
+    'build_offering_pdf', 'offering_rows', 'write_offering_pdf',
+    'run_benchmark', 'run_scenario', 'save_results', 'load_results', 'compare_results',
+    'DEFAULT_PDF_COURSE_COUNTS', 'run_pdf_benchmark', 'run_pdf_case',
+]
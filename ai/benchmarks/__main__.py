@@ -0,0 +1,78 @@
+"""
+Benchmark command line
+
+    python -m ai.benchmarks                                  # default scenarios, every engine
+    python -m ai.benchmarks --courses 150 --sections 12 --lab-ratio 0.3 --days uniform
+    python -m ai.benchmarks --baseline data/benchmarks/benchmark-<stamp>.json --max-drop 0.2
+    python -m ai.benchmarks --pdf --pdf-courses 40 160        # PDF table extraction instead
+
+Exits with status 1 when --baseline is given and any engine's combinations/sec
+dropped by more than --max-drop.
+"""
+
+import argparse
+import sys
+
+from .pdf_extraction import DEFAULT_PDF_COURSE_COUNTS, run_pdf_benchmark
+from .runner import DEFAULT_SCENARIOS, ENGINES, compare_results, load_results, run_benchmark, save_results
+from .synthetic import DAY_DISTRIBUTIONS
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m ai.benchmarks', description=__doc__.split('\n\n')[0])
+    parser.add_argument('--engines', nargs='+', choices=ENGINES, help='engines to measure (default: all)')
+    parser.add_argument('--courses', type=int, help='courses in a custom semester (replaces the default scenarios)')
+    parser.add_argument('--sections', type=int, default=8, help='sections per course of the custom semester')
+    parser.add_argument('--lab-ratio', type=float, default=0.2, help='fraction of lab courses')
+    parser.add_argument('--days', choices=sorted(DAY_DISTRIBUTIONS), default='two_pairs',
+                        help='day distribution of the sections')
+    parser.add_argument('--request-courses', type=int, default=6, help='courses per student request')
+    parser.add_argument('--requests', type=int, default=20, help='student requests per scenario')
+    parser.add_argument('--top-k', type=int, default=5)
+    parser.add_argument('--deadline-ms', type=int, help='search budget per request (default: config)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='JSON report path (default: data/benchmarks/benchmark-<timestamp>.json)')
+    parser.add_argument('--baseline', help='earlier JSON report to gate against')
+    parser.add_argument('--max-drop', type=float, default=0.2,
+                        help='largest tolerated combinations/sec drop against the baseline (0.2 = 20%%)')
+    parser.add_argument('--pdf', action='store_true',
+                        help='time the fixed-layout PDF extractor against extract_tables instead')
+    parser.add_argument('--pdf-courses', type=int, nargs='+', default=DEFAULT_PDF_COURSE_COUNTS,
+                        help='courses in each synthetic offering PDF (with --sections sections each)')
+    args = parser.parse_args(argv)
+
+    if args.pdf:
+        report = run_pdf_benchmark(args.pdf_courses, args.sections, args.seed)
+        print(f"Saved {save_results(report, args.output)}")
+        return 0
+
+    scenarios = DEFAULT_SCENARIOS
+    if args.courses:
+        scenarios = [{
+            'name': f"custom-{args.courses}x{args.sections}",
+            'course_count': args.courses,
+            'sections_per_course': args.sections,
+            'lab_ratio': args.lab_ratio,
+            'day_distribution': args.days,
+            'request_courses': args.request_courses,
+            'requests': args.requests,
+        }]
+
+    report = run_benchmark(scenarios, args.engines, args.top_k, args.deadline_ms, args.seed)
+    print(f"Saved {save_results(report, args.output)}")
+
+    if not args.baseline:
+        return 0
+    regressions = compare_results(report, load_results(args.baseline), args.max_drop)
+    for regression in regressions:
+        print(f"REGRESSION {regression['scenario']}/{regression['engine']}: "
+              f"{regression['baseline']:,.0f} -> {regression['current']:,.0f} comb/s "
+              f"(-{regression['drop']:.0%})")
+    if regressions:
+        return 1
+    print(f"No engine slower than {args.max_drop:.0%} below the baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
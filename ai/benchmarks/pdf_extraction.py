@@ -0,0 +1,78 @@
+"""
+PDF Extraction Benchmarks
+Times the fixed-layout extractor against pdfplumber's extract_tables on synthetic offering PDFs
+"""
+
+import os
+import platform
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+import pdfplumber
+
+from ai.course_processor.fixed_layout import extract_fixed_layout
+from .synthetic_pdf import build_offering_pdf
+
+# Synthetic semesters measured unless others are given (6 sections per course)
+DEFAULT_PDF_COURSE_COUNTS = [40, 160]
+
+
+def _time_pages(path: str, extract: Callable) -> Tuple[float, List]:
+    """(seconds, table of every page) extracting each page of a freshly opened file"""
+    tables = []
+    started = time.perf_counter()
+    with pdfplumber.open(path) as pdf:
+        for page in pdf.pages:
+            tables.append(extract(page))
+            page.close()
+    return time.perf_counter() - started, tables
+
+
+def run_pdf_case(course_count: int, sections_per_course: int = 6, seed: int = 0) -> Dict:
+    """Write one synthetic offering PDF and time both extractors on it"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'offerings.pdf')
+        pages = build_offering_pdf(path, course_count, sections_per_course, seed=seed)
+        generic_s, generic = _time_pages(path, lambda page: page.extract_tables())
+        fixed_s, fixed = _time_pages(path, extract_fixed_layout)
+
+    matched = sum(table is not None and [table] == expected for table, expected in zip(fixed, generic))
+    result = {
+        'courses': course_count,
+        'pages': pages,
+        'rows': sum(len(table) - 1 for tables in generic for table in tables),
+        'extract_tables_s': round(generic_s, 4),
+        'fixed_layout_s': round(fixed_s, 4),
+        'extract_tables_pages_per_sec': round(pages / generic_s, 2),
+        'fixed_layout_pages_per_sec': round(pages / fixed_s, 2),
+        'speedup': round(generic_s / fixed_s, 2),
+        # Pages the fast path read exactly like extract_tables, and pages it left to it
+        'identical_pages': matched,
+        'fallback_pages': sum(table is None for table in fixed),
+    }
+    print(f"  {course_count:>5} courses {pages:>4} pages  "
+          f"extract_tables {result['extract_tables_pages_per_sec']:>7.1f} pages/s  "
+          f"fixed layout {result['fixed_layout_pages_per_sec']:>7.1f} pages/s  "
+          f"x{result['speedup']:.2f}  identical {matched}/{pages}")
+    return result
+
+
+def run_pdf_benchmark(course_counts: List[int] = None, sections_per_course: int = 6, seed: int = 0) -> Dict:
+    """
+    Time both extractors on synthetic PDFs of every size
+
+    Returns a JSON-serializable report (see runner.save_results)
+    """
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'pdfplumber': pdfplumber.__version__,
+        'seed': seed,
+        'pdf_extraction': [
+            run_pdf_case(course_count, sections_per_course, seed)
+            for course_count in course_counts or DEFAULT_PDF_COURSE_COUNTS
+        ],
+    }
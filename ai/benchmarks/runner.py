@@ -0,0 +1,241 @@
+"""
+Schedule Generator Benchmarks
+Runs every search engine on synthetic semesters and compares runs over time
+"""
+
+import contextlib
+import io
+import json
+import os
+import platform
+import time
+import tracemalloc
+from datetime import datetime
+from itertools import product
+from math import ceil, prod
+from typing import Dict, List, Optional, Tuple
+
+from ai.config import SCHEDULE_GENERATION_CONFIG
+from ai.schedule_generator import ScheduleGenerator
+from ai.schedule_generator.occupancy import occupancy_mask
+from ai.schedule_generator.patterns import pattern_key
+from .synthetic import build_semester, sample_requests
+
+# Every search_mode of ScheduleGenerator.generate_schedules
+ENGINES = ['auto', 'exhaustive', 'first_valid', 'branch_and_bound', 'meet_in_middle', 'genetic', 'local_search']
+
+# Semesters every run measures unless others are given; `requests` student
+# requests of `request_courses` courses each are drawn from every semester
+DEFAULT_SCENARIOS = [
+    {'name': 'small', 'course_count': 60, 'sections_per_course': 6, 'lab_ratio': 0.0,
+     'day_distribution': 'two_pairs', 'request_courses': 5, 'requests': 20},
+    {'name': 'labs', 'course_count': 80, 'sections_per_course': 8, 'lab_ratio': 0.4,
+     'day_distribution': 'uniform', 'request_courses': 6, 'requests': 20},
+    {'name': 'medium', 'course_count': 120, 'sections_per_course': 10, 'lab_ratio': 0.2,
+     'day_distribution': 'two_pairs', 'request_courses': 7, 'requests': 20},
+    {'name': 'large', 'course_count': 200, 'sections_per_course': 15, 'lab_ratio': 0.2,
+     'day_distribution': 'concentrated', 'request_courses': 9, 'requests': 5},
+]
+
+# Raw section combinations up to which a request is also solved by brute force
+BRUTE_FORCE_MAX = 300_000
+
+# Requests measured again under tracemalloc (which slows everything down) for peak memory
+MEMORY_SAMPLE_REQUESTS = 3
+
+DEFAULT_OUTPUT_DIR = os.path.join('data', 'benchmarks')
+
+
+def brute_force_scores(courses: List[Dict], preferences: dict, top_k: int) -> List[int]:
+    """
+    Top-K scores of every conflict-free combination of raw sections, taking
+    sections that meet at the same times once (as the engines do)
+    """
+    compiled = [
+        [(pattern_key(section), occupancy_mask(section), section) for section in course['sections']]
+        for course in courses
+    ]
+    valid = {}
+    for combination in product(*compiled):
+        occupied = 0
+        for _, mask, _ in combination:
+            if occupied & mask:
+                break
+            occupied |= mask
+        else:
+            key = tuple(key for key, _, _ in combination)
+            if key not in valid:
+                valid[key] = {'sections': [section for _, _, section in combination]}
+
+    generator = ScheduleGenerator(courses, preferences)
+    return [schedule['score'] for schedule in generator.score_schedules(list(valid.values()))[:top_k]]
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[max(0, ceil(fraction * len(ordered)) - 1)]
+
+
+def _generate(courses: List[Dict], preferences: dict, engine: str, top_k: int,
+              deadline_ms: Optional[int]) -> Tuple[List[Dict], Dict]:
+    """(schedules, last_run) of one request"""
+    generator = ScheduleGenerator(courses, preferences)
+    # The engines log every request; keep that out of the timings
+    with contextlib.redirect_stdout(io.StringIO()):
+        schedules = generator.generate_schedules(top_k, search_mode=engine, deadline_ms=deadline_ms)
+    return schedules, generator.last_run
+
+
+def run_engine(requests: List, engine: str, preferences: dict, top_k: int,
+               deadline_ms: Optional[int], reference: Dict[str, List[int]]) -> Dict:
+    """
+    Measure one engine on every request
+
+    Returns:
+        {'requests', 'combinations', 'seconds', 'combinations_per_sec',
+         'p50_ms', 'p99_ms', 'peak_memory_kb', 'incomplete', 'quality'}
+    """
+    latencies = []
+    combinations = 0
+    incomplete = 0
+    exact = compared = missed = 0
+    gaps = []
+
+    for student_id, courses in requests:
+        started = time.perf_counter()
+        schedules, last_run = _generate(courses, preferences, engine, top_k, deadline_ms)
+        latencies.append((time.perf_counter() - started) * 1000)
+        combinations += prod(len(course['sections']) for course in courses)
+        incomplete += not last_run.get('completed', True)
+
+        expected = reference.get(student_id)
+        if expected is None:
+            continue
+        scores = [schedule['score'] for schedule in schedules]
+        compared += 1
+        exact += scores == expected
+        if expected and not scores:
+            missed += 1
+        elif expected:
+            gaps.append(expected[0] - scores[0])
+
+    tracemalloc.start()
+    for _, courses in requests[:MEMORY_SAMPLE_REQUESTS]:
+        _generate(courses, preferences, engine, top_k, deadline_ms)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    seconds = sum(latencies) / 1000
+    return {
+        'requests': len(requests),
+        'combinations': combinations,
+        'seconds': round(seconds, 4),
+        'combinations_per_sec': round(combinations / seconds, 1) if seconds else 0.0,
+        'p50_ms': round(_percentile(latencies, 0.50), 3),
+        'p99_ms': round(_percentile(latencies, 0.99), 3),
+        'peak_memory_kb': peak // 1024,
+        'incomplete': incomplete,
+        'quality': {
+            # Requests small enough to brute-force, and how many got exactly its top-K scores
+            'compared': compared,
+            'exact_top_k': round(exact / compared, 4) if compared else None,
+            'missed': missed,
+            'mean_best_score_gap': round(sum(gaps) / len(gaps), 3) if gaps else None,
+        },
+    }
+
+
+def run_scenario(scenario: Dict, engines: List[str] = None, preferences: dict = None,
+                 top_k: int = 5, deadline_ms: Optional[int] = None, seed: int = 0) -> Dict:
+    """Build one synthetic semester, draw its requests and measure every engine on them"""
+    preferences = preferences or {'max_free_days': True, 'avoid_early': True}
+    semester = build_semester(scenario['course_count'], scenario['sections_per_course'],
+                              scenario.get('lab_ratio', 0.0), scenario.get('day_distribution', 'uniform'),
+                              seed=seed)
+    requests = sample_requests(semester, scenario['request_courses'], scenario['requests'], seed=seed)
+
+    reference = {
+        student_id: brute_force_scores(courses, preferences, top_k)
+        for student_id, courses in requests
+        if prod(len(course['sections']) for course in courses) <= BRUTE_FORCE_MAX
+    }
+
+    results = {}
+    for engine in engines or ENGINES:
+        results[engine] = run_engine(requests, engine, preferences, top_k, deadline_ms, reference)
+        print(f"  {scenario['name']:<8} {engine:<17} "
+              f"{results[engine]['combinations_per_sec']:>16,.0f} comb/s  "
+              f"p50 {results[engine]['p50_ms']:>8.1f} ms  p99 {results[engine]['p99_ms']:>8.1f} ms  "
+              f"{results[engine]['peak_memory_kb']:>7} KB  "
+              f"exact {results[engine]['quality']['exact_top_k']}")
+    return {'scenario': scenario, 'brute_forced': len(reference), 'engines': results}
+
+
+def run_benchmark(scenarios: List[Dict] = None, engines: List[str] = None, top_k: int = 5,
+                  deadline_ms: Optional[int] = None, seed: int = 0) -> Dict:
+    """
+    Measure every engine on every scenario
+
+    Returns a JSON-serializable report (see save_results / compare_results)
+    """
+    if deadline_ms is None:
+        deadline_ms = SCHEDULE_GENERATION_CONFIG['deadline_ms']
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'top_k': top_k,
+        'deadline_ms': deadline_ms,
+        'seed': seed,
+        'scenarios': {
+            scenario['name']: run_scenario(scenario, engines, top_k=top_k, deadline_ms=deadline_ms, seed=seed)
+            for scenario in scenarios or DEFAULT_SCENARIOS
+        },
+    }
+
+
+def save_results(report: Dict, path: str = None) -> str:
+    """Write a report as JSON (default: data/benchmarks/benchmark-<timestamp>.json); returns the path"""
+    if path is None:
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        path = os.path.join(DEFAULT_OUTPUT_DIR, f"benchmark-{stamp}.json")
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+    return path
+
+
+def load_results(path: str) -> Dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_results(current: Dict, baseline: Dict, max_drop: float = 0.2) -> List[Dict]:
+    """
+    Regression gate: every (scenario, engine) measured in both reports whose
+    combinations/sec fell by more than `max_drop` (0.2 = 20%)
+
+    Returns:
+        [{'scenario', 'engine', 'baseline', 'current', 'drop'}], empty when nothing regressed
+    """
+    regressions = []
+    for name, scenario in current['scenarios'].items():
+        base_scenario = baseline.get('scenarios', {}).get(name)
+        if base_scenario is None:
+            continue
+        for engine, metrics in scenario['engines'].items():
+            base = base_scenario['engines'].get(engine)
+            if not base or not base['combinations_per_sec']:
+                continue
+            drop = 1 - metrics['combinations_per_sec'] / base['combinations_per_sec']
+            if drop > max_drop:
+                regressions.append({
+                    'scenario': name,
+                    'engine': engine,
+                    'baseline': base['combinations_per_sec'],
+                    'current': metrics['combinations_per_sec'],
+                    'drop': round(drop, 4),
+                })
+    return regressions
@@ -0,0 +1,80 @@
+"""
+Synthetic Semesters
+Random course catalogs on the university's real theory and lab slots
+"""
+
+import random
+from typing import Dict, List, Tuple
+
+from backend.constants import LAB_TIME_SLOTS, SECTION_NAMES, TIME_SLOTS
+
+# Theory sections meet on one of these day pairs, labs once on a single day
+THEORY_DAY_PAIRS = [('Sat', 'Tue'), ('Sun', 'Wed'), ('Mon', 'Thu')]
+LAB_DAYS = ['Sat', 'Sun', 'Mon', 'Tue', 'Wed', 'Thu']
+
+# Weights over THEORY_DAY_PAIRS; labs follow the days of the chosen pair
+DAY_DISTRIBUTIONS = {
+    'uniform': [1, 1, 1],
+    # Like the uploaded semesters: almost everything on Sat/Tue and Sun/Wed
+    'two_pairs': [10, 11, 1],
+    'concentrated': [7, 2, 1],
+}
+
+
+def _db_time(slot: str) -> str:
+    """'08:30 AM - 09:50 AM' in the stored format '08:30:AM - 09:50:AM'"""
+    return slot.replace(' AM', ':AM').replace(' PM', ':PM')
+
+
+def build_semester(course_count: int, sections_per_course: int, lab_ratio: float = 0.0,
+                   day_distribution: str = 'uniform', seed: int = 0) -> List[Dict]:
+    """
+    A semester of courses in generator format
+
+    Args:
+        course_count: Courses offered
+        sections_per_course: Sections of every course
+        lab_ratio: Fraction of courses that are labs (one 160-minute meeting a week)
+        day_distribution: Key of DAY_DISTRIBUTIONS
+        seed: Same seed, same semester
+    """
+    rng = random.Random(seed)
+    weights = DAY_DISTRIBUTIONS[day_distribution]
+    lab_count = round(course_count * lab_ratio)
+    lab_courses = set(rng.sample(range(course_count), lab_count))
+
+    courses = []
+    section_id = 0
+    for c in range(course_count):
+        is_lab = c in lab_courses
+        code = f"SYN{c:04d}{'L' if is_lab else ''}"
+        sections = []
+        for s in range(sections_per_course):
+            section_id += 1
+            day1, day2 = rng.choices(THEORY_DAY_PAIRS, weights)[0]
+            section = {
+                'id': section_id,
+                'course_code': code,
+                'section': SECTION_NAMES[s] if s < len(SECTION_NAMES) else str(s + 1),
+                'course_type': 'L' if is_lab else 'T',
+                'credit': 1.0 if is_lab else 3.0,
+                'faculty_name': f"Faculty {rng.randrange(course_count)}",
+            }
+            if is_lab:
+                slot = _db_time(rng.choice(LAB_TIME_SLOTS))
+                section.update(day1=rng.choice([day1, day2]), day2='', time1=slot, time2='-')
+            else:
+                slot = _db_time(rng.choice(TIME_SLOTS))
+                section.update(day1=day1, day2=day2, time1=slot, time2=slot)
+            sections.append(section)
+        courses.append({'code': code, 'title': f"Synthetic {code}", 'credit': sections[0]['credit'],
+                        'sections': sections})
+    return courses
+
+
+def sample_requests(semester: List[Dict], request_courses: int, count: int,
+                    seed: int = 0) -> List[Tuple[str, List[Dict]]]:
+    """`count` student requests of `request_courses` distinct courses each: [(student id, courses)]"""
+    rng = random.Random(seed)
+    request_courses = min(request_courses, len(semester))
+    return [(f"student{i:05d}", rng.sample(semester, request_courses)) for i in range(count)]
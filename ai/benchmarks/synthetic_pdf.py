@@ -0,0 +1,144 @@
+"""
+Synthetic Offering PDFs
+Ruled 14-column offering tables like the uploaded semester PDFs, written without a PDF library
+"""
+
+import random
+import textwrap
+from typing import Dict, List
+
+from .synthetic import build_semester
+
+HEADER = ['SL', 'Program', 'Course Code', 'Title', 'Section', 'Room1', 'Room2', 'Day1', 'Day2',
+          'Time1', 'Time2', 'Faculty Name', 'Faculty Initial', 'Credit']
+COLUMN_WIDTHS = [22, 40, 52, 120, 34, 40, 40, 30, 30, 76, 76, 110, 58, 32]
+
+TITLE_WORDS = ['Introduction', 'to', 'Programming', 'Data', 'Structures', 'Discrete', 'Mathematics',
+               'Digital', 'Logic', 'Design', 'Computer', 'Architecture', 'Operating', 'Systems',
+               'Database', 'Management', 'Networks', 'Software', 'Engineering', 'Artificial',
+               'Intelligence', 'Algorithms', 'Theory', 'of', 'Computation', 'Laboratory']
+ROOMS = ['101', '204', '305', '410', '512', 'LAB-1', 'LAB-2']
+
+# A4 landscape, points
+PAGE_WIDTH = 842
+PAGE_HEIGHT = 595
+MARGIN = 30
+FONT_SIZE = 6
+LINE_HEIGHT = 8
+CELL_PADDING = 3
+# Title and faculty cells wrap after this many characters
+WRAP_CHARS = {3: 34, 11: 30}
+
+
+def offering_rows(semester: List[Dict], program: str = 'BSCSE', seed: int = 0) -> List[List[str]]:
+    """Table rows (without the header) for every section of a synthetic semester"""
+    rng = random.Random(seed)
+    rows = []
+    for course in semester:
+        title = ' '.join(rng.choices(TITLE_WORDS, k=rng.randint(2, 7)))
+        for section in course['sections']:
+            faculty = section['faculty_name']
+            rows.append([
+                str(len(rows) + 1), program, course['code'], title, section['section'],
+                rng.choice(ROOMS), rng.choice(ROOMS) if section['day2'] else '',
+                section['day1'], section['day2'] or '-', section['time1'], section['time2'],
+                faculty, ''.join(part[0] for part in faculty.split()) + section['section'],
+                str(int(section['credit'])),
+            ])
+    return rows
+
+
+def _escape(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def _page_stream(table: List[List[List[str]]]) -> bytes:
+    """Content stream drawing one page of wrapped rows with cell borders"""
+    ops = []
+    width = sum(COLUMN_WIDTHS)
+    y = PAGE_HEIGHT - MARGIN
+    row_tops = [y]
+    for cells in table:
+        height = max(len(lines) for lines in cells) * LINE_HEIGHT + 2 * CELL_PADDING
+        x = MARGIN
+        for column, lines in enumerate(cells):
+            for i, line in enumerate(lines):
+                baseline = y - CELL_PADDING - FONT_SIZE - i * LINE_HEIGHT
+                ops.append(f"BT /F1 {FONT_SIZE} Tf {x + CELL_PADDING} {baseline} Td ({_escape(line)}) Tj ET")
+            x += COLUMN_WIDTHS[column]
+        y -= height
+        row_tops.append(y)
+
+    for row_y in row_tops:
+        ops.append(f"{MARGIN} {row_y} m {MARGIN + width} {row_y} l S")
+    x = MARGIN
+    for column_width in [0] + COLUMN_WIDTHS:
+        x += column_width
+        ops.append(f"{x} {row_tops[0]} m {x} {row_tops[-1]} l S")
+    return '\n'.join(ops).encode('latin-1')
+
+
+def _paginate(rows: List[List[str]]) -> List[List[List[List[str]]]]:
+    """Rows split into pages, each starting with the header; every cell as its wrapped lines"""
+    def wrap(row):
+        return [textwrap.wrap(text, WRAP_CHARS[column]) if column in WRAP_CHARS and text else [text]
+                for column, text in enumerate(row)]
+
+    header = wrap(HEADER)
+    pages = []
+    page, used = None, 0
+    for row in rows:
+        cells = wrap(row)
+        height = max(len(lines) for lines in cells) * LINE_HEIGHT + 2 * CELL_PADDING
+        if page is None or used + height > PAGE_HEIGHT - 2 * MARGIN:
+            page = [header]
+            pages.append(page)
+            used = LINE_HEIGHT + 2 * CELL_PADDING
+        page.append(cells)
+        used += height
+    return pages
+
+
+def write_offering_pdf(path: str, rows: List[List[str]]) -> int:
+    """Write rows as a paginated PDF table; returns the page count"""
+    objects = [b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    pages = _paginate(rows)
+    contents = []
+    for table in pages:
+        stream = _page_stream(table)
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        contents.append(len(objects))
+
+    # Objects are numbered from 1: font, contents, pages, the page tree, the catalog
+    pages_id = len(objects) + len(contents) + 1
+    kids = []
+    for content_id in contents:
+        objects.append(b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] /Contents %d 0 R "
+                       b"/Resources << /Font << /F1 1 0 R >> >> >>"
+                       % (pages_id, PAGE_WIDTH, PAGE_HEIGHT, content_id))
+        kids.append(len(objects))
+    objects.append(b"<< /Type /Pages /Kids [%s] /Count %d >>"
+                   % (b' '.join(b"%d 0 R" % kid for kid in kids), len(kids)))
+    objects.append(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, len(objects), xref)
+
+    with open(path, 'wb') as f:
+        f.write(out)
+    return len(pages)
+
+
+def build_offering_pdf(path: str, course_count: int, sections_per_course: int = 6,
+                       lab_ratio: float = 0.2, seed: int = 0) -> int:
+    """Write the offering PDF of a synthetic semester; returns the page count"""
+    semester = build_semester(course_count, sections_per_course, lab_ratio, seed=seed)
+    return write_offering_pdf(path, offering_rows(semester, seed=seed))
@@ -8,6 +8,16 @@ COURSE_PROCESSING_CONFIG = {
     'max_file_size': 10 * 1024 * 1024,  # 10 MB
     'supported_formats': ['pdf'],
     'extract_methods': ['ocr', 'text_extraction', 'table_parsing'],
+    # Page-parallel table extraction (PDFParser.parse_pdf)
+    # 1 = parse uploads in the web server's process; more (None = one per CPU)
+    # share the long-lived process pool (ai.process_pool.submit_task)
+    'parse_workers': 1,
+    'parallel_min_pages': 8,  # smaller files are parsed in-process
+    # Read the known 14-column offering table from word positions (fixed_layout.py)
+    'fixed_layout_extraction': True,
+    # Cleaned rows of uploaded PDFs (CourseExtractor.extract_courses)
+    'parse_cache_dir': 'data/parse_cache',
+    'parse_cache_bytes': 32 * 1024 * 1024,
 }
 
 # Schedule Generation Settings
@@ -16,6 +26,33 @@ SCHEDULE_GENERATION_CONFIG = {
     'max_courses_per_schedule': 10,
     'min_courses_per_schedule': 3,
     'validation_strict': True,
+    # 'auto' lets planner.py pick per request; 'exhaustive' / 'branch_and_bound' / 'meet_in_middle'
+    # return the true top-N; 'first_valid' ranks the first N * 3 found; 'genetic' / 'local_search' approximate
+    'search_mode': 'auto',
+    # Planner thresholds (see ai/schedule_generator/planner.py)
+    'latency_target_ms': 1000,
+    'planner_exhaustive_max': 5_000,  # pattern combinations ranked exhaustively
+    'planner_nodes_per_ms': 5_000,  # estimated (unpruned) tree nodes branch-and-bound clears per ms
+    'planner_samples': 200,  # random probes for the search-tree estimate
+    'planner_mitm_min_courses': 8,
+    'planner_mitm_pairs_per_ms': 15_000,  # left x right partial pairs the meet-in-the-middle join clears per ms
+    'candidate_pool_size': None,  # valid schedules ranked in 'first_valid' mode (None = 3 x options)
+    # Process-pool search for large requests (None = one worker per CPU)
+    'parallel_workers': None,
+    'parallel_min_search_space': 50_000_000,  # combinations before going multi-process
+    # Anytime search: return the best schedules found so far after this budget (None = no limit)
+    'deadline_ms': 5000,
+    # Cached candidates for re-ranking when preferences change on /results
+    'rerank_pool_size': 20_000,
+    'rerank_cache_bytes': 64 * 1024 * 1024,
+    'rerank_cache_ttl': 3600,  # seconds
+    # Counting valid schedules: exact DP up to this many memo states, then a sampled estimate
+    'count_memo_limit': 200_000,
+    'count_estimate_samples': 2000,
+    # Registration-day bulk runs (AIScheduleEngine.generate_batch)
+    'batch_workers': None,  # None = one worker per CPU
+    'batch_chunk_size': 8,  # students sent to a worker at a time
+    'batch_target_students_per_sec': 25,  # also sets each student's search budget (workers / target)
 }
 
 # Optimization Settings
@@ -26,6 +63,12 @@ OPTIMIZATION_CONFIG = {
     'mutation_rate': 0.1,
     'crossover_rate': 0.8,
     'elite_size': 10,
+    'seed': 42,  # fixed seed so GA runs are reproducible (None = random)
+    
+    # Simulated annealing (ai/optimization/local_search.py)
+    'local_search_time_ms': 200,
+    'annealing_start_temperature': 10.0,
+    'annealing_end_temperature': 0.05,
     
     # Scoring weights (must sum to 1.0)
     'scoring_weights': {
@@ -0,0 +1,175 @@
+"""
+Fixed-Layout Table Extraction
+Reads the offering table from a page's words and the header row's column positions
+"""
+
+from bisect import bisect_right
+from typing import Dict, List, Optional
+
+# Words of one line whose tops differ by less than this (points) share a line,
+# and header words closer than one text height belong to the same header cell
+LINE_TOLERANCE = 3
+
+# Header text that identifies the offering table's header line
+HEADER_LANDMARKS = ('program', 'code', 'section', 'credit')
+
+# SL, Program, Course Code, Title, Section, Room1, Room2, Day1, Day2, Time1, Time2,
+# Faculty Name, Faculty Initial and (optionally) Credit
+COLUMN_COUNTS = (13, 14)
+
+# SL, Course Code, Section, Day1, Day2, Time1, Time2 and Credit never wrap;
+# a multi-line value there means the rows were split wrongly
+SINGLE_LINE_COLUMNS = (0, 2, 4, 7, 8, 9, 10, 13)
+
+Word = Dict
+Line = List[Word]
+
+
+def extract_fixed_layout(page) -> Optional[List[List[str]]]:
+    """
+    The page's offering table in extract_tables' shape (header row first), or
+    None when the page does not have the known layout
+
+    Words are taken once per page and bucketed into columns by x position:
+    the column boundaries are the table's vertical rules at the header line,
+    or, on unruled pages, the left edges of the header cells. Rows are the
+    bands between horizontal rules (on unruled pages, the lines from one
+    serial number in the SL column to the next), so wrapped titles keep
+    their line breaks.
+    """
+    lines = _lines(page.extract_words())
+    header_idx = next((i for i, line in enumerate(lines) if _is_header(line)), None)
+    if header_idx is None:
+        return None
+
+    header = lines[header_idx]
+    header_cells = _header_cells(header)
+    if len(header_cells) not in COLUMN_COUNTS:
+        return None
+    bounds = _column_bounds(page, header, header_cells)
+
+    body = [_bucket(line, bounds) for line in lines[header_idx + 1:]]
+    if any(_is_header(line) for line in lines[header_idx + 1:]):
+        # A second table on the page; leave it to the generic extractor
+        return None
+    anchors = [i for i, cells in enumerate(body) if cells[0] and _is_serial(cells[0])]
+    if not anchors:
+        return None
+
+    tops = [line[0]['top'] for line in lines[header_idx + 1:]]
+    rows = _rows(body, tops, anchors, _row_rules(page, header, header_cells[0]))
+    if rows is None:
+        return None
+    return [[' '.join(word['text'] for word in cell) for cell in header_cells]] + rows
+
+
+def _lines(words: List[Word]) -> List[Line]:
+    """Words grouped into lines, top to bottom, each line left to right"""
+    lines: List[Line] = []
+    for word in sorted(words, key=lambda word: (word['top'], word['x0'])):
+        if lines and word['top'] - lines[-1][0]['top'] < LINE_TOLERANCE:
+            lines[-1].append(word)
+        else:
+            lines.append([word])
+    for line in lines:
+        line.sort(key=lambda word: word['x0'])
+    return lines
+
+
+def _is_header(line: Line) -> bool:
+    text = ' '.join(word['text'] for word in line).lower()
+    return all(landmark in text for landmark in HEADER_LANDMARKS)
+
+
+def _is_serial(words: List[Word]) -> bool:
+    return len(words) == 1 and words[0]['text'].isdigit()
+
+
+def _header_cells(header: Line) -> List[Line]:
+    """Header words split into cells wherever the gap is wider than the text height"""
+    cells = [[header[0]]]
+    for word in header[1:]:
+        previous = cells[-1][-1]
+        if word['x0'] - previous['x1'] > previous['bottom'] - previous['top']:
+            cells.append([word])
+        else:
+            cells[-1].append(word)
+    return cells
+
+
+def _column_bounds(page, header: Line, header_cells: List[Line]) -> List[float]:
+    """x position where each column after the first starts"""
+    top = min(word['top'] for word in header)
+    bottom = max(word['bottom'] for word in header)
+    rules = sorted(
+        edge['x0'] for edge in page.vertical_edges
+        if edge['top'] <= top and edge['bottom'] >= bottom
+    )
+
+    bounds = []
+    for previous, cell in zip(header_cells, header_cells[1:]):
+        gap_start = previous[-1]['x1']
+        gap_end = cell[0]['x0']
+        in_gap = [x for x in rules if gap_start <= x <= gap_end]
+        # Unruled tables: text is left-aligned, so a column starts at its header
+        bounds.append(in_gap[-1] if in_gap else gap_end - LINE_TOLERANCE)
+    return bounds
+
+
+def _row_rules(page, header: Line, first_cell: Line) -> List[float]:
+    """y positions of the horizontal rules across the SL column, from the header's down"""
+    header_top = min(word['top'] for word in header)
+    x = (first_cell[0]['x0'] + first_cell[-1]['x1']) / 2
+    return sorted({
+        round(edge['top'], 1) for edge in page.horizontal_edges
+        if edge['x0'] <= x <= edge['x1'] and edge['top'] > header_top
+    })
+
+
+def _bucket(line: Line, bounds: List[float]) -> List[List[Word]]:
+    """A line's words per column, by the midpoint of each word"""
+    cells: List[List[Word]] = [[] for _ in range(len(bounds) + 1)]
+    for word in line:
+        cells[bisect_right(bounds, (word['x0'] + word['x1']) / 2)].append(word)
+    return cells
+
+
+def _rows(body: List[List[List[Word]]], tops: List[float], anchors: List[int],
+          rules: List[float]) -> Optional[List[List[str]]]:
+    """
+    Cell texts of every row; None if a row has no serial number or a
+    single-line column wrapped
+
+    Rows are the bands between the table's horizontal rules; on unruled
+    pages a row runs from its serial number to the next one.
+    """
+    if len(rules) >= 2:
+        bands: Dict[int, List[int]] = {}
+        for i, top in enumerate(tops):
+            band = bisect_right(rules, top)
+            # Band 0 is the rest of the header cell, the last one below the table
+            if 0 < band < len(rules):
+                bands.setdefault(band, []).append(i)
+        groups = [bands[band] for band in sorted(bands)]
+        anchor_set = set(anchors)
+        if any(sum(i in anchor_set for i in group) != 1 for group in groups):
+            return None
+    else:
+        ends = anchors[1:] + [len(tops)]
+        spacing = [tops[b] - tops[a] for a, b in zip(anchors, anchors[1:])]
+        pitch = sorted(spacing)[len(spacing) // 2] if spacing else float('inf')
+        groups = [list(range(start, end)) for start, end in zip(anchors, ends)]
+        # Text further below the last serial number than a usual row is not part of the table
+        groups[-1] = [i for i in groups[-1] if tops[i] - tops[anchors[-1]] < pitch]
+
+    rows = []
+    for group in groups:
+        cells = zip(*(body[i] for i in group))
+        texts = [
+            '\n'.join(' '.join(word['text'] for word in part) for part in cell if part)
+            for cell in cells
+        ]
+        if any(column < len(texts) and '\n' in texts[column] for column in SINGLE_LINE_COLUMNS):
+            return None
+        rows.append(texts)
+    return rows
@@ -0,0 +1,149 @@
+"""
+Parse Cache
+Cleaned course rows of uploaded PDFs on disk, keyed by file content and parser version
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from ai.config import COURSE_PROCESSING_CONFIG
+
+# Read uploads in 1 MB chunks while hashing
+HASH_CHUNK_BYTES = 1024 * 1024
+
+ENTRY_SUFFIX = '.json.gz'
+
+
+def file_digest(file_path: str) -> str:
+    """SHA-256 of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """
+    LRU cache of parsed course rows in a directory, bounded by total size
+
+    Each entry is one gzip-compressed JSON file holding the field names once
+    and every row as a list of values. A file's modification time is its last
+    use, so the least recently used entries are deleted first.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def key(self, file_path: str, parser_version: int, strategy: str = '') -> str:
+        """
+        Cache key of a PDF: its content hash, the version of the parser that
+        read it and a tag for the extraction strategy (settings that change
+        the parsed rows)
+        """
+        key = f"{file_digest(file_path)}-v{parser_version}"
+        return f"{key}-{strategy}" if strategy else key
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Rows stored under a key and mark them recently used; None on a miss"""
+        path = self._path(key)
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            # Missing, evicted meanwhile, or a truncated write
+            return None
+        fields = entry['fields']
+        return [dict(zip(fields, values)) for values in entry['rows']]
+
+    def put(self, key: str, rows: List[Dict[str, Any]]) -> bool:
+        """Store rows, evicting least recently used entries; False if they can never fit"""
+        fields = list(dict.fromkeys(field for row in rows for field in row))
+        entry = {'fields': fields, 'rows': [[row.get(field) for field in fields] for row in rows]}
+        data = gzip.compress(json.dumps(entry, separators=(',', ':')).encode('utf-8'))
+        if len(data) > self.max_bytes:
+            return False
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        # Write then rename, so readers never see a partial entry
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+        with self._lock:
+            self._evict()
+        return True
+
+    def clear(self):
+        """Delete every entry"""
+        with self._lock:
+            for path, _, _ in self._entries():
+                self._remove(path)
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def _entries(self) -> list:
+        """(path, size, last use) of every entry"""
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return entries
+        for name in names:
+            if not name.endswith(ENTRY_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _evict(self):
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+# Singleton instance
+_cache = None
+
+
+def get_parse_cache() -> ParseCache:
+    """Get or create the process-wide parse cache"""
+    global _cache
+    if _cache is None:
+        _cache = ParseCache(
+            COURSE_PROCESSING_CONFIG['parse_cache_dir'],
+            COURSE_PROCESSING_CONFIG['parse_cache_bytes'],
+        )
+    return _cache
@@ -5,53 +5,147 @@ Extracts structured data from PDF course documents using pdfplumber
 
 import pdfplumber
 import re
-from typing import List, Dict, Any
-from datetime import datetime
+from concurrent.futures import as_completed
+from typing import Callable, Iterator, List, Dict, Any, Tuple
+
+from ai.config import COURSE_PROCESSING_CONFIG
+from ai.process_pool import resolve_workers, submit_task
+from ai.time_parser import parse_range
+from .fixed_layout import extract_fixed_layout
+from .parse_cache import get_parse_cache
+
+# Page ranges per worker, so one table-heavy range does not leave the other workers idle
+RANGES_PER_WORKER = 2
+
+# Bump whenever parsing or cleaning changes its output, so cached rows are re-parsed
+PARSER_VERSION = 2
 
 
 class PDFParser:
     """Parse PDF and extract tables using pdfplumber"""
     
     @staticmethod
-    def parse_pdf(file_path: str) -> List[Dict[str, Any]]:
+    def parse_pdf(file_path: str, workers: int = None,
+                  progress_callback: Callable[[Dict[str, int]], None] = None) -> List[Dict[str, Any]]:
         """
         Extract course data from PDF file
-        Returns list of course dictionaries with all fields
+        Returns list of course dictionaries with all fields, in document order
+        
+        Files with at least COURSE_PROCESSING_CONFIG['parallel_min_pages'] pages
+        are split into page ranges parsed in the shared process pool (table
+        extraction is the slow part) when more than one worker is configured;
+        otherwise the file is streamed page by page in this process (see
+        iter_pdf_rows).
+        
+        Args:
+            workers: Processes to use; defaults to COURSE_PROCESSING_CONFIG['parse_workers']
+            progress_callback: Receives {'pages_done', 'total_pages', 'rows'} after
+                               every page (every page range when parsing in parallel)
         """
-        courses = []
+        workers = resolve_workers(workers or COURSE_PROCESSING_CONFIG['parse_workers'])
         
         try:
             with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    # Extract table from page
-                    tables = page.extract_tables()
-                    
-                    for table in tables:
-                        if not table or len(table) < 2:
-                            continue
-                        
-                        # First row is header
-                        headers = table[0]
-                        
-                        # Process data rows
-                        for row in table[1:]:
-                            if not row or len(row) < 13:  # Should have at least 13 columns
-                                continue
-                            
-                            # Skip empty rows
-                            if not any(cell for cell in row if cell and str(cell).strip()):
-                                continue
-                            
-                            # Map row to course dictionary
-                            course = PDFParser._map_row_to_course(headers, row)
-                            if course:
-                                courses.append(course)
+                page_count = len(pdf.pages)
+                if workers <= 1 or page_count < COURSE_PROCESSING_CONFIG['parallel_min_pages']:
+                    return list(PDFParser._iter_pages(pdf, progress_callback))
+            
+            rows = PDFParser._parse_parallel(file_path, page_count, workers, progress_callback)
         
         except Exception as e:
             print(f"Error parsing PDF: {e}")
             raise
         
-        return courses
+        # Page and row indices restore document order across workers
+        rows.sort(key=lambda item: (item[0], item[1]))
+        return [course for _, _, course in rows]
+    
+    @staticmethod
+    def iter_pdf_rows(file_path: str,
+                      progress_callback: Callable[[Dict[str, int]], None] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield course dictionaries page by page, in document order
+        
+        Each page's cached layout objects are released once its rows are
+        extracted, so memory stays flat whatever the page count.
+        
+        Args:
+            progress_callback: Receives {'pages_done', 'total_pages', 'rows'} after every page
+        """
+        with pdfplumber.open(file_path) as pdf:
+            yield from PDFParser._iter_pages(pdf, progress_callback)
+    
+    @staticmethod
+    def _iter_pages(pdf, progress_callback: Callable[[Dict[str, int]], None] = None) -> Iterator[Dict[str, Any]]:
+        """Courses of an open document, one page at a time"""
+        total_pages = len(pdf.pages)
+        rows = 0
+        for page_idx, page in enumerate(pdf.pages):
+            parsed = PDFParser._parse_page(page, page_idx)
+            # Drop the page's characters, lines and layout before the next page
+            page.close()
+            
+            rows += len(parsed)
+            if progress_callback:
+                progress_callback({'pages_done': page_idx + 1, 'total_pages': total_pages, 'rows': rows})
+            for _, _, course in parsed:
+                yield course
+    
+    @staticmethod
+    def _parse_parallel(file_path: str, page_count: int, workers: int,
+                        progress_callback: Callable[[Dict[str, int]], None] = None
+                        ) -> List[Tuple[int, int, Dict[str, Any]]]:
+        """Parse contiguous page ranges in the shared process pool; each worker opens the file itself"""
+        range_count = min(page_count, workers * RANGES_PER_WORKER)
+        bounds = [page_count * i // range_count for i in range(range_count + 1)]
+        
+        rows = []
+        pages_done = 0
+        futures = {
+            submit_task(_parse_page_range, file_path, start, stop): stop - start
+            for start, stop in zip(bounds, bounds[1:])
+        }
+        for future in as_completed(futures):
+            rows.extend(future.result())
+            pages_done += futures[future]
+            if progress_callback:
+                progress_callback({'pages_done': pages_done, 'total_pages': page_count, 'rows': len(rows)})
+        return rows
+    
+    @staticmethod
+    def _parse_page(page, page_idx: int) -> List[Tuple[int, int, Dict[str, Any]]]:
+        """Courses of one page as (page index, row index on the page, course)"""
+        rows = []
+        row_idx = 0
+        
+        # Extract table from page: the known column layout from the page's
+        # words when it matches, pdfplumber's line-based detection otherwise
+        table = extract_fixed_layout(page) if COURSE_PROCESSING_CONFIG['fixed_layout_extraction'] else None
+        tables = [table] if table else page.extract_tables()
+        
+        for table in tables:
+            if not table or len(table) < 2:
+                continue
+            
+            # First row is header
+            headers = table[0]
+            
+            # Process data rows
+            for row in table[1:]:
+                if not row or len(row) < 13:  # Should have at least 13 columns
+                    continue
+                
+                # Skip empty rows
+                if not any(cell for cell in row if cell and str(cell).strip()):
+                    continue
+                
+                # Map row to course dictionary
+                course = PDFParser._map_row_to_course(headers, row)
+                if course:
+                    rows.append((page_idx, row_idx, course))
+                    row_idx += 1
+        
+        return rows
     
     @staticmethod
     def _map_row_to_course(headers: List, row: List) -> Dict[str, Any]:
@@ -94,9 +188,48 @@ class PDFParser:
             return None
 
 
+def _parse_page_range(file_path: str, start: int, stop: int) -> List[Tuple[int, int, Dict[str, Any]]]:
+    """Pool worker: parse pages [start, stop) of the file"""
+    rows = []
+    with pdfplumber.open(file_path) as pdf:
+        for page_idx in range(start, stop):
+            page = pdf.pages[page_idx]
+            rows.extend(PDFParser._parse_page(page, page_idx))
+            page.close()
+    return rows
+
+
 class CourseExtractor:
     """Extract and process course details"""
     
+    @staticmethod
+    def extract_courses(file_path: str,
+                        progress_callback: Callable[[Dict[str, int]], None] = None) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Cleaned, valid courses of a PDF, and whether they came from the parse cache
+        
+        Repeat uploads of the same file (same bytes, same PARSER_VERSION and
+        table extraction setting) skip parsing; progress_callback is only
+        called when the file is parsed.
+        """
+        cache = get_parse_cache()
+        strategy = 'fixed' if COURSE_PROCESSING_CONFIG['fixed_layout_extraction'] else 'tables'
+        key = cache.key(file_path, PARSER_VERSION, strategy)
+        courses = cache.get(key)
+        if courses is not None:
+            return courses, True
+        
+        courses = []
+        for course in PDFParser.parse_pdf(file_path, progress_callback=progress_callback):
+            cleaned = CourseExtractor.clean_course_data(course)
+            if CourseExtractor.validate_course_data(cleaned):
+                courses.append(cleaned)
+        
+        # Failed or empty parses are not cached, so a fixed parser gets another try
+        if courses:
+            cache.put(key, courses)
+        return courses, False
+    
     @staticmethod
     def detect_course_type(course_data: Dict[str, Any]) -> str:
         """
@@ -134,27 +267,14 @@ class CourseExtractor:
     @staticmethod
     def _calculate_duration(time_str: str) -> int:
         """Calculate duration in minutes from time string like '08:30 AM - 09:50 AM'"""
-        try:
-            # Parse time string
-            parts = time_str.split('-')
-            if len(parts) != 2:
-                return 0
-            
-            # Normalize time format: "08:30:AM" or "02:00:PM" -> "08:30 AM" or "02:00 PM"
-            start_str = parts[0].strip().replace(':AM', ' AM').replace(':PM', ' PM')
-            end_str = parts[1].strip().replace(':AM', ' AM').replace(':PM', ' PM')
-            
-            # Convert to datetime
-            start = datetime.strptime(start_str, '%I:%M %p')
-            end = datetime.strptime(end_str, '%I:%M %p')
-            
-            # Calculate difference in minutes
-            duration = (end - start).total_seconds() / 60
-            return int(duration)
-            
-        except Exception as e:
-            # Silently return default duration to avoid log spam
+        if len(time_str.split('-')) != 2:
+            return 0
+        
+        times = parse_range(time_str)
+        if times is None:
+            # Default theory duration for unparseable times
             return 80
+        return times[1] - times[0]
     
     @staticmethod
     def validate_course_data(course_data: Dict[str, Any]) -> bool:
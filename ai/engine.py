@@ -3,10 +3,17 @@ Integration Layer - Connects AI modules with backend services
 Provides high-level API for UI/backend to use AI functionality
 """
 
+from ai.config import SCHEDULE_GENERATION_CONFIG
 from ai.course_processor import CourseProcessor
-from ai.schedule_generator import ScheduleGenerator
+from ai.process_pool import resolve_workers
+from ai.schedule_generator import CONFIG_DEADLINE, ScheduleGenerator, SemesterCatalog
+from ai.schedule_generator.analysis import analyze_schedule
+from ai.schedule_generator.batch import iter_batch
 from ai.optimization import ScheduleOptimizer
 from ai.models import Schedule, UserPreferences, Course
+from dataclasses import asdict
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import time
 
 
 class AIScheduleEngine:
@@ -17,6 +24,8 @@ class AIScheduleEngine:
         self.schedule_generator = ScheduleGenerator([])
         self.optimizer = ScheduleOptimizer()
         self.processed_courses = []
+        self.last_run = {}
+        self.last_batch = {}
     
     def process_course_data(self, pdf_file_path: str, department: str) -> dict:
         result = self.course_processor.process_pdf(pdf_file_path)
@@ -28,18 +37,118 @@ class AIScheduleEngine:
         self, 
         student_courses: list, 
         user_preferences: UserPreferences,
-        num_options: int = 3
+        num_options: int = 3,
+        deadline_ms: Optional[int] = CONFIG_DEADLINE,
+        search_mode: str = 'auto'
     ) -> list:
+        """
+        Generate schedules with the engine the planner picks for this request
+        (unless search_mode names one); self.last_run['plan'] records the
+        chosen engine and the reason
+        
+        deadline_ms is passed on to ScheduleGenerator.generate_schedules
+        (None = no limit, default: the configured budget)
+        """
         self.schedule_generator = ScheduleGenerator(student_courses, user_preferences.__dict__)
-        raw_schedules = self.schedule_generator.generate_schedules(num_options)
+        raw_schedules = self.schedule_generator.generate_schedules(
+            num_options, search_mode=search_mode, deadline_ms=deadline_ms
+        )
+        self.last_run = self.schedule_generator.last_run
         optimized_schedules = self.optimizer.rank_schedules(raw_schedules)
         return optimized_schedules
     
+    def generate_batch(
+        self,
+        requests: Iterable[Tuple[str, List[str], Union[UserPreferences, dict]]],
+        catalog: Union[SemesterCatalog, List[Dict]],
+        num_options: int = 3,
+        workers: int = None,
+        deadline_ms: Optional[int] = CONFIG_DEADLINE,
+        search_mode: str = 'auto',
+        progress_callback: Callable[[Dict], None] = None
+    ) -> Iterator[Dict]:
+        """
+        Generate schedules for many students, e.g. before registration opens
+        
+        The semester catalog is compiled once (meeting patterns and their
+        compatibility matrix) and every request is sliced out of it in a
+        process pool. Results stream back as students finish, not in request order.
+        
+        Args:
+            requests: (student id, course codes, preferences) tuples; may be a generator
+            catalog: Every course offered this semester in generator format, or a
+                     SemesterCatalog compiled earlier
+            workers: Processes to use; defaults to SCHEDULE_GENERATION_CONFIG['batch_workers']
+            deadline_ms: Search budget per student (None = no limit); defaults to the
+                         budget that meets SCHEDULE_GENERATION_CONFIG['batch_target_students_per_sec']
+                         (workers / target seconds)
+            progress_callback: Receives self.last_batch after every student
+        
+        Yields:
+            {'student_id', 'schedules', 'missing_courses', 'run'} ('error' instead
+            of 'run' when that student's generation failed)
+        
+        self.last_batch holds the throughput: {'students', 'elapsed_s',
+        'compile_ms', 'students_per_sec', 'target_students_per_sec',
+        'meets_target', 'workers', 'deadline_ms', 'incomplete'}
+        """
+        config = SCHEDULE_GENERATION_CONFIG
+        target = config['batch_target_students_per_sec']
+        workers = resolve_workers(workers or config['batch_workers'])
+        if deadline_ms is CONFIG_DEADLINE:
+            deadline_ms = int(1000 * workers / target)
+        
+        started = time.monotonic()
+        if not isinstance(catalog, SemesterCatalog):
+            catalog = SemesterCatalog(catalog)
+        self.last_batch = {
+            'students': 0,
+            'elapsed_s': 0.0,
+            'compile_ms': int((time.monotonic() - started) * 1000),
+            'students_per_sec': 0.0,
+            'target_students_per_sec': target,
+            'meets_target': False,
+            'workers': workers,
+            'deadline_ms': deadline_ms,
+            'incomplete': 0,
+        }
+        
+        normalized = (
+            (student_id, course_codes, getattr(preferences, '__dict__', preferences))
+            for student_id, course_codes, preferences in requests
+        )
+        for result in iter_batch(catalog, normalized, num_options, workers,
+                                 config['batch_chunk_size'], search_mode, deadline_ms):
+            result['schedules'] = self.optimizer.rank_schedules(result['schedules'])
+            
+            stats = self.last_batch
+            elapsed = time.monotonic() - started
+            stats['students'] += 1
+            stats['elapsed_s'] = round(elapsed, 3)
+            stats['students_per_sec'] = round(stats['students'] / elapsed, 2) if elapsed else 0.0
+            stats['meets_target'] = stats['students_per_sec'] >= target
+            if not result.get('run', {}).get('completed', False):
+                stats['incomplete'] += 1
+            if progress_callback:
+                progress_callback(dict(stats))
+            yield result
+        
+        print(f"Batch: {self.last_batch['students']} students in {self.last_batch['elapsed_s']}s "
+              f"({self.last_batch['students_per_sec']}/s, target {target}/s, "
+              f"{self.last_batch['incomplete']} stopped at the deadline or failed)")
+    
     def save_favorite_schedule(self, schedule_id: str) -> bool:
         return True
     
-    def get_schedule_analysis(self, schedule: Schedule) -> dict:
-        return {}
+    def get_schedule_analysis(self, schedule: Union[Schedule, Dict]) -> dict:
+        """
+        Overlaps (one sweep per day), free days, daily workload, gaps and the
+        longest block of back-to-back classes of a schedule dict or Schedule
+        
+        Returns:
+            ScheduleAnalysis as a dict
+        """
+        return asdict(analyze_schedule(schedule))
     
     def export_schedule(self, schedule: Schedule, format: str = 'pdf') -> str:
         return ""
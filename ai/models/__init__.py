@@ -7,6 +7,8 @@ from dataclasses import dataclass, field
 from typing import List, Dict, Optional
 from datetime import time
 
+from ai.schedule_generator.occupancy import time_slots_mask
+
 
 @dataclass
 class TimeSlot:
@@ -33,9 +35,13 @@ class Course:
     max_capacity: int = 0
     enrolled_students: int = 0
     
+    def occupancy_mask(self) -> int:
+        """Weekly occupancy bitmask of this course's time slots"""
+        return time_slots_mask(self.time_slots)
+    
     def has_conflict_with(self, other: 'Course') -> bool:
         """Check if this course has time conflict with another"""
-        pass
+        return (self.occupancy_mask() & other.occupancy_mask()) != 0
 
 
 @dataclass
@@ -97,6 +103,8 @@ class ScheduleAnalysis:
     total_conflicts: int = 0
     free_days: int = 0
     daily_workload: Dict[str, float] = field(default_factory=dict)  # day -> hours
+    daily_gaps: Dict[str, List[int]] = field(default_factory=dict)  # day -> minutes between blocks of classes
+    longest_consecutive_hours: float = 0.0
     conflict_reports: List[ConflictReport] = field(default_factory=list)
     optimization_score: float = 0.0
     recommendations: List[str] = field(default_factory=list)
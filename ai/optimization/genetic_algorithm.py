@@ -3,27 +3,179 @@ Genetic Algorithm for Schedule Optimization
 Uses evolutionary algorithms to find optimal schedules
 """
 
-class GeneticScheduleOptimizer:
-    """GA-based schedule optimization"""
-    
-    def __init__(self, population_size: int = 100, generations: int = 50):
-        self.population_size = population_size
-        self.generations = generations
-    
-    def create_population(self, courses: list) -> list:
-        return []
-    
-    def evaluate_fitness(self, schedule: list) -> float:
-        return 0.0
-    
-    def select_parents(self, population: list, fitness_scores: list) -> list:
-        return []
-    
-    def crossover(self, parent1: list, parent2: list) -> list:
-        return []
-    
-    def mutate(self, schedule: list) -> list:
-        return schedule
-    
-    def evolve(self, courses: list, constraints: dict = None) -> list:
-        return []
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ai.config import OPTIMIZATION_CONFIG
+from ai.schedule_generator.backtracking import PROGRESS_INTERVAL, ProgressCallback, SearchBase
+from ai.schedule_generator.compatibility import CompatibilityMatrix
+from ai.schedule_generator.scoring import ScheduleScorer
+
+# Individuals compared in one tournament
+TOURNAMENT_SIZE = 3
+
+
+class GeneticScheduleOptimizer(SearchBase):
+    """
+    GA-based schedule optimization for requests too large for exact search.
+
+    An individual is a NumPy row with one section index per course, so the
+    population is a (population_size, courses) integer array. Fitness is
+    the preference score minus a penalty per clashing section pair, with the
+    penalty larger than any score gap: every conflict-free schedule beats
+    every schedule with a conflict. The whole population is scored in one
+    vectorized pass over the compatibility matrix and the scorer's features.
+
+    Each generation keeps the `elite_size` fittest individuals, fills the
+    rest with tournament-selected parents combined by uniform crossover, and
+    mutates genes to a random section of the same course. The best distinct
+    conflict-free schedules seen in any generation are returned.
+    """
+
+    def __init__(self, population_size: int = None, generations: int = None,
+                 mutation_rate: float = None, crossover_rate: float = None,
+                 elite_size: int = None, seed: Optional[int] = None,
+                 progress_callback: Optional[ProgressCallback] = None,
+                 deadline: Optional[float] = None):
+        """
+        Args:
+            population_size, generations, mutation_rate, crossover_rate, elite_size:
+                GA parameters; default to OPTIMIZATION_CONFIG
+            seed: Seed for the random generator (same seed, same result);
+                  defaults to OPTIMIZATION_CONFIG['seed']
+            progress_callback: Receives {'explored', 'pruned', 'found'} after each generation
+            deadline: time.monotonic() value after which no new generation starts
+        """
+        super().__init__(progress_callback, PROGRESS_INTERVAL, deadline)
+        self.population_size = population_size or OPTIMIZATION_CONFIG['population_size']
+        self.generations = generations or OPTIMIZATION_CONFIG['generations']
+        self.mutation_rate = OPTIMIZATION_CONFIG['mutation_rate'] if mutation_rate is None else mutation_rate
+        self.crossover_rate = OPTIMIZATION_CONFIG['crossover_rate'] if crossover_rate is None else crossover_rate
+        self.elite_size = min(
+            OPTIMIZATION_CONFIG['elite_size'] if elite_size is None else elite_size,
+            self.population_size,
+        )
+        self.seed = OPTIMIZATION_CONFIG['seed'] if seed is None else seed
+        self.rng = np.random.default_rng(self.seed)
+
+        self.matrix: Optional[CompatibilityMatrix] = None
+        self.scorer: Optional[ScheduleScorer] = None
+        self.best: Dict[Tuple[int, ...], int] = {}
+
+    def prepare(self, matrix: CompatibilityMatrix, scorer: ScheduleScorer):
+        """Set the request to optimize and precompute the array views fitness needs"""
+        self.matrix = matrix
+        self.scorer = scorer
+        self.rng = np.random.default_rng(self.seed)
+        self.best = {}
+        self._sizes = np.asarray(matrix.sizes, dtype=np.int64)
+        self._offsets = np.asarray(matrix.offsets, dtype=np.int64)
+        self._clashes = ~matrix.matrix
+        np.fill_diagonal(self._clashes, False)
+        self.conflict_penalty = scorer.conflict_penalty
+
+    def create_population(self, courses: list = None) -> np.ndarray:
+        """Random (population_size, courses) array of section indices"""
+        if courses is not None:
+            matrix = CompatibilityMatrix(courses)
+            self.prepare(matrix, ScheduleScorer(matrix))
+        return self.rng.integers(0, self._sizes, size=(self.population_size, len(self._sizes)))
+
+    def count_conflicts(self, population: np.ndarray) -> np.ndarray:
+        """Clashing section pairs of every individual"""
+        flat = population + self._offsets
+        pairs = self._clashes[flat[:, :, None], flat[:, None, :]]
+        return pairs.sum(axis=(1, 2)) // 2
+
+    def evaluate_fitness(self, population: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns:
+            (fitness, preference scores, conflict counts) for every individual
+        """
+        population = np.atleast_2d(population)
+        scores = self.scorer.score_batch(population + self._offsets)
+        conflicts = self.count_conflicts(population)
+        return scores - self.conflict_penalty * conflicts, scores, conflicts
+
+    def select_parents(self, population: np.ndarray, fitness_scores: np.ndarray, count: int = None) -> np.ndarray:
+        """Tournament selection: the fittest of TOURNAMENT_SIZE random individuals, `count` times"""
+        count = len(population) if count is None else count
+        entrants = self.rng.integers(0, len(population), size=(count, TOURNAMENT_SIZE))
+        winners = entrants[np.arange(count), np.argmax(fitness_scores[entrants], axis=1)]
+        return population[winners]
+
+    def crossover(self, parent1: np.ndarray, parent2: np.ndarray) -> np.ndarray:
+        """Uniform crossover of paired parent rows; rows that skip crossover copy parent1"""
+        take_second = self.rng.random(parent1.shape) < 0.5
+        take_second &= (self.rng.random(len(parent1)) < self.crossover_rate)[:, None]
+        return np.where(take_second, parent2, parent1)
+
+    def mutate(self, schedule: np.ndarray) -> np.ndarray:
+        """Move each gene to a random section of its course with probability mutation_rate"""
+        mutated = self.rng.random(schedule.shape) < self.mutation_rate
+        random_genes = self.rng.integers(0, self._sizes, size=schedule.shape)
+        return np.where(mutated, random_genes, schedule)
+
+    def _remember(self, population: np.ndarray, scores: np.ndarray, conflicts: np.ndarray):
+        """Keep every distinct conflict-free individual seen so far"""
+        valid = conflicts == 0
+        if not valid.any():
+            return
+        rows, first = np.unique(population[valid], axis=0, return_index=True)
+        for row, score in zip(rows.tolist(), scores[valid][first].tolist()):
+            if tuple(row) not in self.best:
+                self.best[tuple(row)] = score
+                self.found += 1
+
+    def search(self, top_k: int) -> List[Tuple[int, Tuple[int, ...]]]:
+        """
+        Evolve the prepared request
+
+        Returns:
+            Up to top_k conflict-free schedules as [(score, section indices in course order)],
+            best first (ties in cartesian-product order)
+        """
+        if not self.matrix.sizes or not all(self.matrix.sizes):
+            self.report_progress()
+            return []
+
+        population = self.create_population()
+        fitness, scores, conflicts = self.evaluate_fitness(population)
+        self.explored += len(population)
+        self._remember(population, scores, conflicts)
+
+        for _ in range(self.generations):
+            self.checkpoint()
+            if self.timed_out:
+                break
+
+            order = np.argsort(-fitness, kind='stable')
+            elite = population[order[:self.elite_size]]
+
+            offspring_count = self.population_size - len(elite)
+            parents1 = self.select_parents(population, fitness, offspring_count)
+            parents2 = self.select_parents(population, fitness, offspring_count)
+            children = self.mutate(self.crossover(parents1, parents2))
+
+            population = np.concatenate([elite, children])
+            fitness, scores, conflicts = self.evaluate_fitness(population)
+            self.explored += len(children)
+            self.pruned += int((conflicts > 0).sum())
+            self._remember(population, scores, conflicts)
+            self.report_progress()
+
+        ranked = sorted(((score, indices) for indices, score in self.best.items()),
+                        key=lambda item: (-item[0], item[1]))
+        return ranked[:max(1, top_k)]
+
+    def evolve(self, courses: list, constraints: dict = None, top_k: int = 5) -> List[Tuple[int, Tuple[int, ...]]]:
+        """
+        Run the GA on courses in generator format
+
+        Args:
+            constraints: User preferences (max_free_days, avoid_early, avoid_late)
+        """
+        matrix = CompatibilityMatrix(courses)
+        self.prepare(matrix, ScheduleScorer(matrix, constraints))
+        return self.search(top_k)
@@ -0,0 +1,256 @@
+"""
+Local Search Optimization
+Simulated annealing over single-section swaps for very large or over-constrained selections
+"""
+
+import heapq
+import math
+import random
+import time
+from typing import List, Optional, Tuple
+
+from ai.config import OPTIMIZATION_CONFIG
+from ai.schedule_generator.backtracking import PROGRESS_INTERVAL, ProgressCallback, SearchBase, popcount
+from ai.schedule_generator.compatibility import CompatibilityMatrix
+from ai.schedule_generator.occupancy import DAYS
+from ai.schedule_generator.scoring import ScheduleScorer
+
+
+class LocalSearchOptimizer(SearchBase):
+    """
+    Simulated annealing on complete assignments (one section per course).
+
+    The search starts from a greedy assignment and repeatedly moves one
+    course to another of its sections. Everything a move changes is kept
+    incrementally, so evaluating a move never re-scores the schedule:
+      - conflicts: the chosen sections are a bitset, and each section has a
+        bitset of the sections it clashes with, so the change in clashing
+        pairs is two popcounts
+      - days: a per-day count of chosen sections; only the days of the old
+        and new section are touched
+      - early/late penalty: the difference of the two sections' penalties
+
+    Energy is the conflict penalty (larger than any score gap, as in the GA)
+    minus the preference score. The temperature cools geometrically over the
+    time budget. The best distinct conflict-free schedules seen are kept;
+    when a selection cannot be made conflict-free, the assignment with the
+    fewest clashes is kept instead and suggest_drops() names the courses to
+    remove.
+    """
+
+    def __init__(self, time_budget_ms: int = None, start_temperature: float = None,
+                 end_temperature: float = None, seed: Optional[int] = None,
+                 progress_callback: Optional[ProgressCallback] = None,
+                 deadline: Optional[float] = None):
+        """
+        Args:
+            time_budget_ms: Annealing time; defaults to OPTIMIZATION_CONFIG['local_search_time_ms']
+            start_temperature, end_temperature: Cooling range; default to OPTIMIZATION_CONFIG
+            seed: Seed for the move sequence; defaults to OPTIMIZATION_CONFIG['seed']
+            progress_callback: Receives {'explored', 'pruned', 'found'} (moves tried,
+                               moves rejected, distinct conflict-free schedules seen)
+            deadline: time.monotonic() value that ends the search even if budget remains
+        """
+        super().__init__(progress_callback, PROGRESS_INTERVAL, deadline)
+        self.time_budget_ms = time_budget_ms or OPTIMIZATION_CONFIG['local_search_time_ms']
+        self.start_temperature = start_temperature or OPTIMIZATION_CONFIG['annealing_start_temperature']
+        self.end_temperature = end_temperature or OPTIMIZATION_CONFIG['annealing_end_temperature']
+        self.seed = OPTIMIZATION_CONFIG['seed'] if seed is None else seed
+
+        self.matrix: Optional[CompatibilityMatrix] = None
+        self.scorer: Optional[ScheduleScorer] = None
+        self.min_conflicts: Optional[int] = None
+        self.least_conflicted: Optional[Tuple[int, ...]] = None
+
+    def prepare(self, matrix: CompatibilityMatrix, scorer: ScheduleScorer):
+        """Set the request to optimize and precompute per-section move data"""
+        self.matrix = matrix
+        self.scorer = scorer
+        everything = (1 << len(matrix.sections)) - 1
+
+        # Sections each section clashes with, excluding its own course
+        self.clash_bits = [
+            everything & ~row & ~matrix.spans[int(matrix.course_of[flat])]
+            for flat, row in enumerate(matrix.rows)
+        ]
+        self.section_days = [
+            [day for day in range(len(DAYS)) if bits >> day & 1] for bits in scorer.day_bits
+        ]
+        self.conflict_penalty = scorer.conflict_penalty
+
+    def greedy_start(self) -> List[int]:
+        """
+        Flat sections chosen course by course (fewest sections first), each
+        the one with the fewest clashes so far, then the fewest new days,
+        then the smallest penalty
+        """
+        matrix, scorer = self.matrix, self.scorer
+        chosen = [0] * len(matrix.sizes)
+        chosen_bits = 0
+        used_days = 0
+        for course_idx in sorted(range(len(matrix.sizes)), key=lambda c: matrix.sizes[c]):
+            offset = matrix.offsets[course_idx]
+            best = min(
+                range(offset, offset + matrix.sizes[course_idx]),
+                key=lambda flat: (popcount(self.clash_bits[flat] & chosen_bits),
+                                  popcount(scorer.day_bits[flat] & ~used_days),
+                                  scorer.penalty[flat], flat),
+            )
+            chosen[course_idx] = best
+            chosen_bits |= 1 << best
+            used_days |= scorer.day_bits[best]
+        return chosen
+
+    def search(self, top_k: int) -> List[Tuple[int, Tuple[int, ...]]]:
+        """
+        Anneal the prepared request
+
+        Returns:
+            Up to top_k conflict-free schedules as [(score, section indices in course order)],
+            best first; empty when none was found (see least_conflicted / suggest_drops)
+        """
+        matrix, scorer = self.matrix, self.scorer
+        if not matrix.sizes or not all(matrix.sizes):
+            self.report_progress()
+            return []
+
+        rng = random.Random(self.seed)
+        started = time.monotonic()
+        budget_end = started + self.time_budget_ms / 1000
+        external_deadline = self.deadline
+        if self.deadline is None or budget_end < self.deadline:
+            self.deadline = budget_end
+            self._next_check = self._plan_next_check()
+        span = max(self.deadline - started, 1e-9)
+        cooling = math.log(self.end_temperature / self.start_temperature)
+
+        offsets, sizes = matrix.offsets, matrix.sizes
+        clash_bits, section_days, penalty = self.clash_bits, self.section_days, scorer.penalty
+        day_weight, conflict_penalty = scorer.day_weight, self.conflict_penalty
+        movable = [c for c in range(len(sizes)) if sizes[c] > 1]
+
+        # Current state
+        chosen = self.greedy_start()
+        chosen_bits = 0
+        for flat in chosen:
+            chosen_bits |= 1 << flat
+        day_count = [0] * len(DAYS)
+        for flat in chosen:
+            for day in section_days[flat]:
+                day_count[day] += 1
+        conflicts = sum(popcount(clash_bits[flat] & chosen_bits) for flat in chosen) // 2
+        score = scorer.score_flat(chosen)
+
+        heap: List[Tuple[int, Tuple[int, ...]]] = []
+        kept = set()
+        self.min_conflicts = None
+        self._record(chosen, score, conflicts, heap, kept, max(1, top_k))
+
+        temperature = self.start_temperature
+        while movable:
+            self.explored += 1
+            if self.explored >= self._next_check:
+                self.checkpoint()
+                if self.timed_out:
+                    break
+                progress = min(1.0, (time.monotonic() - started) / span)
+                temperature = self.start_temperature * math.exp(cooling * progress)
+
+            course_idx = movable[rng.randrange(len(movable))]
+            old = chosen[course_idx]
+            new = offsets[course_idx] + rng.randrange(sizes[course_idx] - 1)
+            if new >= old:
+                new += 1
+
+            others = chosen_bits & ~(1 << old)
+            conflict_delta = (popcount(clash_bits[new] & others)
+                              - popcount(clash_bits[old] & others))
+
+            freed = 0
+            for day in section_days[old]:
+                if day_count[day] == 1 and day not in section_days[new]:
+                    freed += 1
+            for day in section_days[new]:
+                if day_count[day] == 0:
+                    freed -= 1
+            score_delta = day_weight * freed - (penalty[new] - penalty[old])
+
+            energy_delta = conflict_penalty * conflict_delta - score_delta
+            if energy_delta > 0 and rng.random() >= math.exp(-energy_delta / temperature):
+                self.pruned += 1
+                continue
+
+            # Apply the move
+            chosen[course_idx] = new
+            chosen_bits = others | (1 << new)
+            for day in section_days[old]:
+                day_count[day] -= 1
+            for day in section_days[new]:
+                day_count[day] += 1
+            conflicts += conflict_delta
+            score += score_delta
+            self._record(chosen, score, conflicts, heap, kept, max(1, top_k))
+
+        # Using up the annealing budget is the normal end; only the caller's deadline counts as a timeout
+        self.timed_out = external_deadline is not None and time.monotonic() >= external_deadline
+        self.deadline = external_deadline
+        self.report_progress()
+        ranked = [(entry_score, tuple(-i for i in negated)) for entry_score, negated in heap]
+        ranked.sort(key=lambda item: (-item[0], item[1]))
+        return ranked
+
+    def _record(self, chosen: List[int], score: int, conflicts: int, heap: list, kept: set, top_k: int):
+        """Track the least-conflicted state and the best distinct conflict-free ones"""
+        if self.min_conflicts is None or conflicts < self.min_conflicts:
+            self.min_conflicts = conflicts
+            self.least_conflicted = self._indices(chosen)
+        if conflicts or (len(heap) == top_k and score < heap[0][0]):
+            return
+
+        indices = self._indices(chosen)
+        if indices in kept:
+            return
+        self.found += 1
+        entry = (score, tuple(-i for i in indices))
+        if len(heap) < top_k:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            kept.discard(tuple(-i for i in heapq.heapreplace(heap, entry)[1]))
+        else:
+            return
+        kept.add(indices)
+
+    def _indices(self, chosen: List[int]) -> Tuple[int, ...]:
+        """Section indices in course order from flat indices"""
+        return tuple(flat - offset for flat, offset in zip(chosen, self.matrix.offsets))
+
+    def suggest_drops(self) -> List[int]:
+        """
+        Courses to remove from the least-conflicted assignment so the rest is
+        conflict-free: repeatedly drop the course with the most clashes
+        """
+        if self.least_conflicted is None or not self.min_conflicts:
+            return []
+        chosen = {c: self.matrix.offsets[c] + s for c, s in enumerate(self.least_conflicted)}
+        dropped = []
+        while True:
+            chosen_bits = 0
+            for flat in chosen.values():
+                chosen_bits |= 1 << flat
+            clashes = {c: popcount(self.clash_bits[flat] & chosen_bits) for c, flat in chosen.items()}
+            worst = max(clashes, key=lambda c: (clashes[c], -c))
+            if not clashes[worst]:
+                return dropped
+            dropped.append(worst)
+            del chosen[worst]
+
+    def optimize(self, courses: list, constraints: dict = None, top_k: int = 5) -> List[Tuple[int, Tuple[int, ...]]]:
+        """
+        Run the local search on courses in generator format
+
+        Args:
+            constraints: User preferences (max_free_days, avoid_early, avoid_late)
+        """
+        matrix = CompatibilityMatrix(courses)
+        self.prepare(matrix, ScheduleScorer(matrix, constraints))
+        return self.search(top_k)
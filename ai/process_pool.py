@@ -0,0 +1,108 @@
+"""
+Process Pool Helper
+Creates worker pools for the CPU-heavy AI components
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional
+
+from ai.config import COURSE_PROCESSING_CONFIG, SCHEDULE_GENERATION_CONFIG
+
+# Imported once by the fork server, so every worker forked from it starts warm
+FORKSERVER_PRELOAD = ['numpy', 'ai.schedule_generator', 'ai.course_processor.pdf_parser']
+
+
+def resolve_workers(configured: Optional[int]) -> int:
+    """Worker count from config: None or 0 means one per CPU"""
+    if configured:
+        return max(1, int(configured))
+    return max(1, os.cpu_count() or 1)
+
+
+def _context():
+    """
+    'forkserver' where available, else 'spawn'; never 'fork'
+
+    The web server is multi-threaded, and forking it can copy locks held by
+    other threads (logging, the database driver, asyncio) into a child that
+    then deadlocks. Fork-server workers are forked from a separate
+    single-threaded process instead.
+
+    Workers still import app.py as `__mp_main__`; ui.run() returns at once
+    outside the main process and app.py skips init_db() there.
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload(FORKSERVER_PRELOAD)
+        return context
+    return multiprocessing.get_context('spawn')
+
+
+def create_process_pool(max_workers: int, initializer: Callable = None, initargs: tuple = ()) -> ProcessPoolExecutor:
+    """
+    Create a dedicated process pool, e.g. for one long batch job whose
+    workers each receive a large shared object through `initargs`
+
+    Per-request work should use submit_task() instead.
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=_context(),
+        initializer=initializer,
+        initargs=initargs,
+    )
+
+
+# Process-wide pool, created on first use
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def shared_pool_workers() -> int:
+    """Size of the shared pool: the largest worker count configured for the work it runs"""
+    return max(
+        resolve_workers(SCHEDULE_GENERATION_CONFIG['parallel_workers']),
+        resolve_workers(COURSE_PROCESSING_CONFIG['parse_workers']),
+    )
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    The long-lived pool shared by every request (do not shut it down)
+
+    Workers start once, sized by shared_pool_workers(), and are reused; the
+    pool is never resized while requests may be holding it.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = create_process_pool(shared_pool_workers())
+        return _pool
+
+
+def submit_task(fn: Callable, *args) -> Future:
+    """
+    Run fn(*args) in the shared pool
+
+    A pool whose worker died (BrokenProcessPool at submit) is dropped and
+    the task goes to a fresh one; futures of the broken pool fail on their own.
+    """
+    pool = get_process_pool()
+    try:
+        return pool.submit(fn, *args)
+    except BrokenProcessPool:
+        _discard_pool(pool)
+        return get_process_pool().submit(fn, *args)
+
+
+def _discard_pool(pool: ProcessPoolExecutor):
+    """Stop handing out a broken pool (another thread may have replaced it already)"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
@@ -4,8 +4,29 @@ Generates optimal schedules based on courses and constraints
 """
 
 from .conflict_detector import ConflictDetector
-from itertools import product
-from typing import List, Dict, Any
+from .backtracking import BacktrackingSearch, popcount
+from .branch_and_bound import BranchAndBoundSearch
+from .catalog import SemesterCatalog
+from .compatibility import CompatibilityMatrix
+from .counting import ScheduleCounter
+from .meet_in_middle import MeetInTheMiddleSearch
+from .patterns import SectionPatterns
+from .planner import plan_search
+from .parallel import parallel_top_k
+from .occupancy import ALL_DAYS_MASK, DAYS, compile_masks, day_mask
+from .rerank_cache import CachedRequest, get_rerank_cache, request_key
+from .scoring import PREFERENCE_KEYS, ScheduleScorer, rank_scores
+from ai.config import SCHEDULE_GENERATION_CONFIG
+from ai.process_pool import resolve_workers
+from ai.time_parser import parse_time
+from itertools import islice, product
+from math import prod
+import numpy as np
+from typing import List, Dict, Any, Callable, Iterator, Optional
+import time
+
+# deadline_ms default meaning "SCHEDULE_GENERATION_CONFIG['deadline_ms']"; None means no limit
+CONFIG_DEADLINE = object()
 
 
 class ScheduleGenerator:
@@ -21,39 +42,271 @@ class ScheduleGenerator:
         self.courses = courses_with_sections
         self.user_preferences = user_preferences or {}
         self.detector = ConflictDetector()
+        self._patterns = None
+        self._matrix = None
+        self._scorer = None
+        self.last_run: Dict[str, Any] = {}
+        self.missing_courses: List[str] = []
+        # Candidates of the last generate_schedules() run, for cache_candidates()
+        self._last_candidates: Optional[Dict[str, Any]] = None
+    
+    @classmethod
+    def from_catalog(cls, catalog: SemesterCatalog, course_codes: List[str],
+                     user_preferences: dict = None) -> 'ScheduleGenerator':
+        """
+        Generator for some of a compiled catalog's courses, reusing its
+        patterns and compatibility matrix instead of rebuilding them
+        
+        Codes the catalog does not offer are listed in generator.missing_courses.
+        """
+        patterns, matrix, missing = catalog.select(course_codes)
+        generator = cls(patterns.source, user_preferences)
+        generator._patterns = patterns
+        generator._matrix = matrix
+        generator.missing_courses = missing
+        return generator
+    
+    @staticmethod
+    def _deadline(deadline_ms: Optional[int]) -> Optional[float]:
+        """time.monotonic() value a search should stop at, or None for no limit"""
+        if deadline_ms is None:
+            return None
+        return time.monotonic() + deadline_ms / 1000
+    
+    def get_section_patterns(self) -> SectionPatterns:
+        """Sections grouped by identical meeting times (built once, then reused)"""
+        if self._patterns is None:
+            self._patterns = SectionPatterns(self.courses)
+        return self._patterns
+    
+    def get_compatibility_matrix(self) -> CompatibilityMatrix:
+        """
+        Pairwise compatibility of the distinct meeting patterns of this request
+        (built once, then reused)
+        
+        Sections that only differ in faculty or room are one candidate here,
+        so every search works on meeting patterns and build_schedule() turns
+        the result back into concrete sections.
+        """
+        if self._matrix is None:
+            self._matrix = CompatibilityMatrix(self.get_section_patterns().courses)
+        return self._matrix
+    
+    def get_scorer(self) -> ScheduleScorer:
+        """Per-section scoring features for this request (built once, then reused)"""
+        if self._scorer is None:
+            self._scorer = ScheduleScorer(self.get_compatibility_matrix(), self.user_preferences)
+        return self._scorer
     
-    def generate_schedules(self, num_options: int = 5) -> List[Dict]:
+    def diagnose_conflicts(self) -> List[Dict]:
+        """
+        Explain structural conflicts in the request, e.g.
+        "Section A of CSE1111 clashes with every section of MAT2183"
+        """
+        patterns = self.get_section_patterns()
+        findings = self.get_compatibility_matrix().diagnose()
+        for finding in findings:
+            if finding['type'] != 'section':
+                continue
+            # Name every section that shares the clashing meeting times
+            labels = patterns.section_labels(finding['course_index'], finding['section_index'])
+            if len(labels) > 1:
+                finding['section'] = ', '.join(labels)
+                finding['message'] = (f"Sections {finding['section']} of {finding['course1']} "
+                                      f"clash with every section of {finding['course2']}")
+        return findings
+    
+    def count_schedules(self, deadline_ms: int = None) -> Dict:
+        """
+        Number of conflict-free schedules, without building any of them
+        
+        Exact (memoized DP over the compatibility bitsets) while the number of
+        distinct search states stays under SCHEDULE_GENERATION_CONFIG['count_memo_limit']
+        and the deadline has not passed; otherwise a sampled estimate.
+        
+        Args:
+            deadline_ms: Time budget; when it runs out the estimate from the
+                         probes taken so far is returned with 'exact' False
+                         and 'timed_out' True (None = no limit)
+        
+        Returns:
+            {'count', 'exact', 'search_space', 'states', 'timed_out'} plus
+            'samples' and 'std_error' when the count is an estimate
+        """
+        counter = ScheduleCounter(
+            self.get_compatibility_matrix(),
+            multiplicities=self.get_section_patterns().multiplicities(),
+            memo_limit=SCHEDULE_GENERATION_CONFIG['count_memo_limit'],
+            samples=SCHEDULE_GENERATION_CONFIG['count_estimate_samples'],
+            deadline=self._deadline(deadline_ms),
+        )
+        return counter.count()
+    
+    def iter_schedules(self, progress_callback: Callable[[Dict], None] = None,
+                       deadline_ms: int = None) -> Iterator[Dict]:
+        """
+        Lazily yield valid schedules (with stats and score) as the search finds them,
+        one per distinct combination of meeting times (see build_schedule)
+        
+        Args:
+            progress_callback: Receives {'explored', 'pruned', 'found'} periodically
+                               during the search and once when it ends
+            deadline_ms: Stop yielding once this many milliseconds have passed
+        """
+        if not self.courses:
+            return
+        
+        search = BacktrackingSearch(self.get_compatibility_matrix(), progress_callback,
+                                    deadline=self._deadline(deadline_ms))
+        for indices in search.iter_solutions():
+            schedule = self.build_schedule(indices)
+            self.score_schedules([schedule])
+            yield schedule
+    
+    def generate_schedules(self, num_options: int = 5, search_mode: str = None,
+                           progress_callback: Callable[[Dict], None] = None,
+                           deadline_ms: Optional[int] = CONFIG_DEADLINE) -> List[Dict]:
         """
         Generate multiple valid schedule options
         Returns list of schedules, each with selected sections and stats
+        
+        Args:
+            num_options: Number of schedules to return
+            search_mode: 'auto' (let planner.plan_search pick one of the modes below),
+                         'exhaustive' (rank every valid schedule),
+                         'branch_and_bound' (best num_options schedules overall),
+                         'meet_in_middle' (same result, joining two half-searches; suits
+                         many courses with moderate section counts),
+                         'genetic' (seeded genetic algorithm, approximate; for requests
+                         too large for exact search),
+                         'local_search' (simulated annealing under a time budget; also
+                         suggests courses to drop when nothing fits) or
+                         'first_valid' (rank the first num_options * 3 valid schedules);
+                         defaults to SCHEDULE_GENERATION_CONFIG['search_mode']
+            progress_callback: Receives {'explored', 'pruned', 'found'} during the search
+            deadline_ms: Time budget for the search; when it runs out the best
+                         schedules found so far are returned and
+                         self.last_run['completed'] is False. None means no
+                         limit and 0 a budget that has already run out;
+                         defaults to SCHEDULE_GENERATION_CONFIG['deadline_ms']
         """
         if not self.courses:
             return []
         
-        # Get all section combinations
-        all_sections = [course['sections'] for course in self.courses]
-        
-        # Generate all possible combinations (cartesian product)
-        all_combinations = list(product(*all_sections))
-        
-        print(f"Total combinations to check: {len(all_combinations)}")
-        
-        # Filter out conflicting schedules
-        valid_schedules = []
-        for combination in all_combinations:
-            if not self.has_conflict(list(combination)):
-                schedule = {
-                    'sections': list(combination),
-                    'courses': self.courses,
-                    'stats': self.calculate_stats(list(combination))
-                }
-                valid_schedules.append(schedule)
-                
-                # Stop if we have enough options
-                if len(valid_schedules) >= num_options * 3:  # Get extra for scoring
+        mode = search_mode or SCHEDULE_GENERATION_CONFIG['search_mode']
+        if deadline_ms is CONFIG_DEADLINE:
+            deadline_ms = SCHEDULE_GENERATION_CONFIG['deadline_ms']
+        started = time.monotonic()
+        deadline = self._deadline(deadline_ms)
+        matrix = self.get_compatibility_matrix()
+        
+        search_space = prod(len(course['sections']) for course in self.courses)
+        pattern_space = prod(matrix.sizes)
+        plan = None
+        if mode == 'auto':
+            plan = plan_search(matrix)
+            mode = plan['engine']
+            print(f"Planner chose {mode}: {plan['reason']}")
+        print(f"Search space: {search_space} combinations, "
+              f"{pattern_space} distinct meeting patterns ({mode})")
+        
+        if mode == 'branch_and_bound':
+            # Exact top-K: branches that cannot beat the K-th best are cut
+            workers = resolve_workers(SCHEDULE_GENERATION_CONFIG['parallel_workers'])
+            if workers > 1 and pattern_space >= SCHEDULE_GENERATION_CONFIG['parallel_min_search_space']:
+                ranked, counters, timed_out = parallel_top_k(
+                    matrix.courses, matrix, self.user_preferences, num_options, workers,
+                    progress_callback, deadline
+                )
+            else:
+                search = BranchAndBoundSearch(matrix, self.get_scorer(), num_options, progress_callback,
+                                              deadline=deadline)
+                ranked = search.search()
+                counters = search.progress()
+                timed_out = search.timed_out
+            found = [indices for _, indices in ranked]
+            candidates = {'found': found, 'complete': False, 'exact_top_k': not timed_out}
+        elif mode == 'genetic':
+            # Approximate: evolve whole schedules instead of enumerating them
+            from ai.optimization.genetic_algorithm import GeneticScheduleOptimizer
+            search = GeneticScheduleOptimizer(progress_callback=progress_callback, deadline=deadline)
+            search.prepare(matrix, self.get_scorer())
+            ranked = search.search(num_options)
+            counters = search.progress()
+            timed_out = search.timed_out
+            found = [indices for _, indices in ranked]
+            candidates = {'found': found, 'complete': False, 'exact_top_k': False}
+        elif mode == 'local_search':
+            # Approximate: anneal one complete assignment by single-section moves
+            from ai.optimization.local_search import LocalSearchOptimizer
+            search = LocalSearchOptimizer(progress_callback=progress_callback, deadline=deadline)
+            search.prepare(matrix, self.get_scorer())
+            ranked = search.search(num_options)
+            counters = search.progress()
+            timed_out = search.timed_out
+            found = [indices for _, indices in ranked]
+            candidates = {'found': found, 'complete': False, 'exact_top_k': False}
+            if not found:
+                counters['min_conflicts'] = search.min_conflicts
+                counters['suggested_drops'] = [self.courses[c]['code'] for c in search.suggest_drops()]
+        elif mode == 'meet_in_middle':
+            # Exact top-K from the join of the two halves' valid partial schedules
+            search = MeetInTheMiddleSearch(matrix, progress_callback, deadline=deadline)
+            ranked = search.top_k(self.get_scorer(), num_options)
+            counters = search.progress()
+            timed_out = search.timed_out
+            found = [indices for _, indices in ranked]
+            candidates = {'found': found, 'complete': False, 'exact_top_k': not timed_out}
+        else:
+            # Depth-first search: conflicting partial schedules are pruned
+            # before the rest of the combination is ever built.
+            # 'exhaustive' keeps every valid schedule, 'first_valid' a pool of them
+            pool_size = None
+            if mode != 'exhaustive':
+                pool_size = SCHEDULE_GENERATION_CONFIG['candidate_pool_size'] or num_options * 3
+            search = BacktrackingSearch(matrix, progress_callback, deadline=deadline)
+            found = []
+            exhausted = True
+            for indices in search.iter_solutions():
+                found.append(indices)
+                if pool_size is not None and len(found) >= pool_size:  # Get extra for scoring
+                    search.report_progress()
+                    exhausted = False
                     break
+            counters = search.progress()
+            timed_out = search.timed_out
+            
+            # Rank the whole pool in one vectorized pass (ties keep cartesian-product
+            # order), then build schedule dicts for the top N only
+            found.sort()
+            candidates = {'found': found, 'complete': exhausted and not timed_out,
+                          'exact_top_k': exhausted and not timed_out}
+            if found:
+                scorer = self.get_scorer()
+                order = rank_scores(scorer.score_batch(scorer.index_rows(found)))
+                found = [found[i] for i in order[:num_options].tolist()]
+        
+        self._last_candidates = {
+            **candidates,
+            'num_options': num_options,
+            'toggles': self._preference_toggles(),
+        }
+        valid_schedules = [self.build_schedule(indices) for indices in found]
+        
+        self.last_run = {
+            'engine': mode,
+            'completed': not timed_out,
+            'elapsed_ms': int((time.monotonic() - started) * 1000),
+            'deadline_ms': deadline_ms,
+            'search_space': search_space,
+            'pattern_space': pattern_space,
+            'plan': plan,
+            **counters,
+        }
         
-        print(f"Found {len(valid_schedules)} valid schedules")
+        print(f"Found {len(valid_schedules)} valid schedules "
+              f"({counters['explored']} explored, {counters['pruned']} pruned"
+              f"{'' if not timed_out else ', stopped at deadline'})")
         
         if not valid_schedules:
             return []
@@ -64,44 +317,122 @@ class ScheduleGenerator:
         # Return top N
         return scored_schedules[:num_options]
     
+    def cache_candidates(self, num_options: int = 5, deadline_ms: int = None) -> str:
+        """
+        Cache this request's candidate schedules and their feature matrix so a
+        preference change can be re-ranked without searching again
+        
+        After generate_schedules() the candidates are the schedules that run
+        already found; on their own (no earlier run) they are every valid
+        schedule when there are at most SCHEDULE_GENERATION_CONFIG['rerank_pool_size']
+        of them, otherwise the first pool. Unless that is every valid schedule,
+        the exact top num_options for the other combinations of the preference
+        toggles are added, so re-ranking stays exact for any toggle setting.
+        
+        With deadline_ms the toggle searches stop at the budget and the entry
+        is marked incomplete, so re-ranking is best-effort for that request.
+        
+        Returns the cache key (see rerank_cache.get_rerank_cache)
+        """
+        matrix = self.get_compatibility_matrix()
+        deadline = self._deadline(deadline_ms)
+        
+        pool_size = SCHEDULE_GENERATION_CONFIG['rerank_pool_size']
+        last = self._last_candidates
+        if last is not None and last['num_options'] >= num_options:
+            found = last['found'][:pool_size]
+            complete = last['complete'] and len(last['found']) <= pool_size
+            # That run already ranked its own toggle setting exactly
+            ranked_toggles = {last['toggles']} if last['exact_top_k'] else set()
+        else:
+            search = BacktrackingSearch(matrix, deadline=deadline)
+            found = list(islice(search.iter_solutions(), pool_size + 1))
+            complete = len(found) <= pool_size and not search.timed_out
+            found = found[:pool_size]
+            ranked_toggles = set()
+        
+        if not complete:
+            candidates = set(found)
+            for toggles in product([False, True], repeat=len(PREFERENCE_KEYS)):
+                if toggles in ranked_toggles:
+                    continue
+                scorer = ScheduleScorer(matrix, dict(zip(PREFERENCE_KEYS, toggles)))
+                search = BranchAndBoundSearch(matrix, scorer, num_options, deadline=deadline)
+                candidates.update(indices for _, indices in search.search())
+                if search.timed_out:
+                    break
+            found = sorted(candidates)
+        
+        scorer = self.get_scorer()
+        rows = scorer.index_rows(found).astype(np.int32)
+        entry = CachedRequest(self.courses, matrix.sections, rows, scorer.feature_batch(rows), complete,
+                              alternatives=self._flat_alternatives())
+        
+        key = request_key(self.courses)
+        get_rerank_cache().put(key, entry)
+        return key
+    
+    def _preference_toggles(self) -> tuple:
+        """This request's setting of each of PREFERENCE_KEYS"""
+        return tuple(bool(self.user_preferences.get(key, False)) for key in PREFERENCE_KEYS)
+    
+    def build_schedule(self, indices) -> Dict:
+        """
+        Build a schedule dict from one meeting-pattern index per course
+        
+        Each course gets the first section of its pattern (faculty preferences
+        are applied to the sections before generation); 'alternatives' lists
+        the other sections of each course that meet at the same times.
+        """
+        sections, alternatives = self.get_section_patterns().expand(indices)
+        return {
+            'sections': sections,
+            'courses': self.courses,
+            'stats': self.calculate_stats(sections),
+            'alternatives': alternatives
+        }
+    
+    def _flat_alternatives(self) -> List[List[Dict]]:
+        """Same-time alternatives for every flat matrix index"""
+        patterns = self.get_section_patterns()
+        return [
+            [course['sections'][i] for i in group[1:]]
+            for course, members in zip(self.courses, patterns.members)
+            for group in members
+        ]
+    
     def has_conflict(self, sections: List[Dict]) -> bool:
         """Check if a combination of sections has time conflicts"""
-        # Check each pair of sections
-        for i in range(len(sections)):
-            for j in range(i + 1, len(sections)):
-                if self.detector.detect_time_overlap(sections[i], sections[j]):
-                    return True
+        # Each section must fit into the minutes occupied by the ones before it
+        occupied = 0
+        for mask in compile_masks(sections):
+            if occupied & mask:
+                return True
+            occupied |= mask
         return False
     
+    def get_used_days(self, sections: List[Dict]) -> int:
+        """Bitmask of the days (Saturday = bit 0) that have at least one class"""
+        used_days = 0
+        for section in sections:
+            used_days |= day_mask(section)
+        return used_days
+    
     def get_free_days(self, sections: List[Dict]) -> int:
         """Count number of free days in schedule"""
-        all_days = {'Saturday', 'Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday'}
-        used_days = set()
-        
-        for section in sections:
-            days = self.detector.get_days_list(section)
-            used_days.update(days)
-        
-        free_days = len(all_days - used_days)
-        return free_days
+        return popcount(ALL_DAYS_MASK & ~self.get_used_days(sections))
     
     def calculate_stats(self, sections: List[Dict]) -> Dict:
         """Calculate statistics for a schedule"""
-        free_days = self.get_free_days(sections)
+        used_days = self.get_used_days(sections)
         
         # Count total credits
         total_credits = sum(section.get('credit', 0) for section in sections)
         
-        # Count days with classes
-        all_days = set()
-        for section in sections:
-            days = self.detector.get_days_list(section)
-            all_days.update(days)
-        
-        days_with_classes = len(all_days)
+        days_with_classes = popcount(used_days)
         
         return {
-            'free_days': free_days,
+            'free_days': len(DAYS) - days_with_classes,
             'total_credits': total_credits,
             'days_with_classes': days_with_classes,
             'total_courses': len(sections)
@@ -109,27 +440,13 @@ class ScheduleGenerator:
     
     def score_schedules(self, schedules: List[Dict]) -> List[Dict]:
         """Score and rank schedules based on preferences"""
-        for schedule in schedules:
-            score = 0
-            stats = schedule['stats']
-            
-            # Reward free days if preference is set
-            if self.user_preferences.get('max_free_days', False):
-                score += stats['free_days'] * 10
-            
-            # Penalty for early classes if preference is set
-            if self.user_preferences.get('avoid_early', False):
-                early_count = self.count_early_classes(schedule['sections'])
-                score -= early_count * 5
-            
-            # Penalty for late classes if preference is set
-            if self.user_preferences.get('avoid_late', False):
-                late_count = self.count_late_classes(schedule['sections'])
-                score -= late_count * 5
-            
-            # Bonus for balanced schedule (not too many classes per day)
-            score += (7 - stats['days_with_classes']) * 3
-            
+        if not schedules:
+            return schedules
+        
+        # Free days (+10 with max_free_days), balance (+3 per free day) and
+        # early/late penalties (-5 each) for the whole batch in one NumPy pass
+        scores = self.get_scorer().score_dicts(schedules)
+        for schedule, score in zip(schedules, scores.tolist()):
             schedule['score'] = score
         
         # Sort by score (highest first)
@@ -142,7 +459,7 @@ class ScheduleGenerator:
         count = 0
         for section in sections:
             time_str = section.get('time1', '')
-            start, _ = self.detector.parse_time(time_str)
+            start, _ = parse_time(time_str)
             if start > 0 and start < 9 * 60:  # Before 9 AM
                 count += 1
         return count
@@ -152,7 +469,7 @@ class ScheduleGenerator:
         count = 0
         for section in sections:
             time_str = section.get('time1', '')
-            _, end = self.detector.parse_time(time_str)
+            _, end = parse_time(time_str)
             if end > 17 * 60:  # After 5 PM
                 count += 1
         return count
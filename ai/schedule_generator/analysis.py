@@ -0,0 +1,128 @@
+"""
+Schedule Analysis
+Sweep-line conflict detection and daily workload for one complete schedule
+"""
+
+import heapq
+from typing import Dict, List, Tuple, Union
+
+from ai.config import OPTIMIZATION_CONFIG
+from ai.models import ConflictReport, Schedule, ScheduleAnalysis
+from .conflict_detector import ConflictDetector, ConflictType
+from .occupancy import DAYS, section_meetings, time_slot_meetings
+
+# (start, end, course code) of one meeting on one day
+DayMeeting = Tuple[int, int, str]
+
+
+def _meetings_by_day(schedule: Union[Dict, Schedule]) -> Dict[int, List[DayMeeting]]:
+    """Meetings of a generator schedule dict (or an ai.models.Schedule) grouped by day index"""
+    by_day: Dict[int, List[DayMeeting]] = {}
+    if isinstance(schedule, Schedule):
+        owners = [(course.code, time_slot_meetings(course.time_slots)) for course in schedule.courses]
+    else:
+        owners = [(section.get('course_code', ''), section_meetings(section))
+                  for section in schedule.get('sections', [])]
+    for code, meetings in owners:
+        for day, start, end in meetings:
+            by_day.setdefault(day, []).append((start, end, code))
+    return by_day
+
+
+def find_overlaps(meetings: List[DayMeeting]) -> List[Tuple[DayMeeting, DayMeeting]]:
+    """
+    Every overlapping pair of one day's meetings
+
+    Meetings are swept in start order while a heap keeps the ones still in
+    progress (by end time): O(n log n) plus one step per overlap found.
+    """
+    overlaps = []
+    active: List[Tuple[int, int, DayMeeting]] = []
+    for position, meeting in enumerate(sorted(meetings)):
+        start = meeting[0]
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+        overlaps.extend((other, meeting) for _, _, other in active)
+        heapq.heappush(active, (meeting[1], position, meeting))
+    return overlaps
+
+
+def _blocks(meetings: List[DayMeeting], min_break: int) -> List[Tuple[int, int]]:
+    """
+    Merge a day's meetings into blocks of back-to-back classes (less than
+    min_break minutes apart); returns (start, end) of each block in order
+    """
+    blocks: List[List[int]] = []
+    for start, end, _ in sorted(meetings):
+        if blocks and start - blocks[-1][1] < min_break:
+            blocks[-1][1] = max(blocks[-1][1], end)
+        else:
+            blocks.append([start, end])
+    return [(start, end) for start, end in blocks]
+
+
+def analyze_schedule(schedule: Union[Dict, Schedule], schedule_id: str = '') -> ScheduleAnalysis:
+    """
+    Conflicts, free days and daily workload of one schedule
+
+    Args:
+        schedule: A schedule dict from ScheduleGenerator ({'sections': [...], 'score': ...})
+                  or an ai.models.Schedule
+        schedule_id: Stored in the analysis; defaults to the Schedule's own id
+    """
+    if isinstance(schedule, Schedule):
+        schedule_id = schedule_id or schedule.schedule_id
+        score = schedule.score
+    else:
+        score = schedule.get('score', 0)
+
+    max_daily = OPTIMIZATION_CONFIG['max_daily_hours']
+    max_consecutive = OPTIMIZATION_CONFIG['max_consecutive_hours']
+    min_break = OPTIMIZATION_CONFIG['min_break_minutes']
+
+    reports = []
+    daily_workload = {}
+    daily_gaps = {}
+    longest_block = 0
+    recommendations = []
+
+    by_day = _meetings_by_day(schedule)
+    for day in sorted(by_day):
+        name = DAYS[day]
+        meetings = by_day[day]
+
+        for first, second in find_overlaps(meetings):
+            details = {'course1': first[2], 'course2': second[2], 'day': name}
+            reports.append(ConflictReport(
+                conflict_type=ConflictType.TIME_OVERLAP.value,
+                course1_code=first[2],
+                course2_code=second[2],
+                severity='critical',
+                description=ConflictDetector.get_conflict_details(ConflictType.TIME_OVERLAP, details),
+                affected_courses=[first[2], second[2]],
+            ))
+
+        blocks = _blocks(meetings, min_break)
+        hours = sum(end - start for start, end, _ in meetings) / 60
+        daily_workload[name] = round(hours, 2)
+        daily_gaps[name] = [blocks[i + 1][0] - blocks[i][1] for i in range(len(blocks) - 1)]
+
+        day_longest = max(end - start for start, end in blocks)
+        longest_block = max(longest_block, day_longest)
+        if hours > max_daily:
+            recommendations.append(f"{name} has {hours:.1f} hours of classes (limit {max_daily:g})")
+        if day_longest / 60 > max_consecutive:
+            recommendations.append(f"{name} has {day_longest / 60:.1f} hours of classes without a "
+                                   f"{min_break}-minute break (limit {max_consecutive:g})")
+
+    return ScheduleAnalysis(
+        schedule_id=schedule_id,
+        total_conflicts=len(reports),
+        free_days=len(DAYS) - len(by_day),
+        daily_workload=daily_workload,
+        daily_gaps=daily_gaps,
+        longest_consecutive_hours=round(longest_block / 60, 2),
+        conflict_reports=reports,
+        optimization_score=score,
+        recommendations=recommendations,
+    )
@@ -0,0 +1,139 @@
+"""
+Backtracking Search Engine
+Depth-first schedule search that rejects conflicting partial assignments early
+"""
+
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .compatibility import CompatibilityMatrix
+
+# Explored nodes between two progress reports
+PROGRESS_INTERVAL = 2000
+
+# Explored nodes between two deadline checks
+DEADLINE_CHECK_INTERVAL = 256
+
+ProgressCallback = Callable[[Dict[str, int]], None]
+
+
+# Set bits of an integer (int.bit_count is Python 3.10+)
+popcount = getattr(int, 'bit_count', None) or (lambda bits: bin(bits).count('1'))
+
+
+def iter_bits(bits: int) -> Iterator[int]:
+    """Yield the positions of the set bits of an integer, lowest first"""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class SearchBase:
+    """Counters and progress reporting shared by the search engines"""
+
+    def __init__(self, progress_callback: Optional[ProgressCallback] = None,
+                 progress_interval: int = PROGRESS_INTERVAL, deadline: Optional[float] = None):
+        """
+        Args:
+            progress_callback: Called with progress() every `progress_interval`
+                               explored nodes and once more when the search ends
+            progress_interval: Explored nodes between two progress reports
+            deadline: time.monotonic() value at which the search stops early,
+                      keeping whatever it has found so far
+        """
+        self.explored = 0
+        self.pruned = 0
+        self.found = 0
+        self.progress_callback = progress_callback
+        self.progress_interval = max(1, progress_interval)
+        self.deadline = deadline
+        self.timed_out = False
+        self._next_report = self.progress_interval
+        self._next_check = self._plan_next_check()
+
+    def progress(self) -> Dict[str, int]:
+        """Combinations explored, pruned and found so far"""
+        return {'explored': self.explored, 'pruned': self.pruned, 'found': self.found}
+
+    def report_progress(self):
+        """Send the current counters to the progress callback"""
+        self._next_report = self.explored + self.progress_interval
+        self._next_check = self._plan_next_check()
+        if self.progress_callback:
+            self.progress_callback(self.progress())
+
+    def checkpoint(self):
+        """Periodic work between nodes: progress reports and the deadline"""
+        if self.explored >= self._next_report:
+            self.report_progress()
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            self.timed_out = True
+        self._next_check = self._plan_next_check()
+
+    def _plan_next_check(self) -> int:
+        if self.deadline is None:
+            return self._next_report
+        return min(self._next_report, self.explored + DEADLINE_CHECK_INTERVAL)
+
+
+class BacktrackingSearch(SearchBase):
+    """
+    Assign one course at a time and backtrack as soon as a new section
+    conflicts with the sections already placed.
+
+    Courses are visited most-constrained-first (fewest sections), but every
+    solution is reported as a tuple of section indices in the original
+    course order so callers never see the internal visiting order.
+
+    Conflicts come from a precomputed CompatibilityMatrix: the search keeps
+    a bitset of flat sections still compatible with everything placed, so
+    each step is a row lookup and an AND. A step is also pruned when it
+    leaves some unassigned course with no compatible section.
+    """
+
+    def __init__(self, matrix: CompatibilityMatrix, progress_callback: Optional[ProgressCallback] = None,
+                 progress_interval: int = PROGRESS_INTERVAL, deadline: Optional[float] = None):
+        super().__init__(progress_callback, progress_interval, deadline)
+        self.matrix = matrix
+        self.order = sorted(range(len(matrix.sizes)), key=lambda i: matrix.sizes[i])
+
+    def iter_solutions(self) -> Iterator[Tuple[int, ...]]:
+        """Lazily yield every conflict-free assignment as section indices in course order"""
+        if not self.order or not all(self.matrix.sizes):
+            self.report_progress()
+            return
+
+        allowed = (1 << len(self.matrix.sections)) - 1
+        chosen = [0] * len(self.order)
+        yield from self._extend(0, allowed, chosen)
+        self.report_progress()
+
+    def _extend(self, depth: int, allowed: int, chosen: List[int]) -> Iterator[Tuple[int, ...]]:
+        """Try every still-compatible section of the course at `depth`"""
+        matrix = self.matrix
+        course_idx = self.order[depth]
+        offset = matrix.offsets[course_idx]
+        remaining = [matrix.spans[c] for c in self.order[depth + 1:]]
+
+        for flat_idx in iter_bits(allowed & matrix.spans[course_idx]):
+            self.explored += 1
+            if self.explored >= self._next_check:
+                self.checkpoint()
+                if self.timed_out:
+                    return
+            chosen[course_idx] = flat_idx - offset
+
+            if not remaining:
+                self.found += 1
+                yield tuple(chosen)
+                continue
+
+            next_allowed = allowed & matrix.rows[flat_idx]
+            if not all(next_allowed & span for span in remaining):
+                self.pruned += 1
+                continue
+
+            yield from self._extend(depth + 1, next_allowed, chosen)
+            if self.timed_out:
+                return
@@ -0,0 +1,98 @@
+"""
+Batch Schedule Generation
+Generates schedules for many students against one compiled semester catalog
+"""
+
+from concurrent.futures import FIRST_COMPLETED, wait
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ai.config import SCHEDULE_GENERATION_CONFIG
+from ai.process_pool import create_process_pool
+from . import CONFIG_DEADLINE, ScheduleGenerator
+from .catalog import SemesterCatalog
+
+# (student id, course codes, preferences dict)
+BatchRequest = Tuple[Any, List[str], dict]
+
+# Chunks queued per worker, so workers never wait for the next one while
+# an unbounded request stream is not read into memory all at once
+CHUNKS_IN_FLIGHT = 2
+
+# Per-process state, set once by _init_worker
+_worker_state: Dict = {}
+
+
+def _init_worker(catalog: SemesterCatalog):
+    """Keep the parent's compiled catalog (sent once per worker, not rebuilt)"""
+    _worker_state['catalog'] = catalog
+    # One search per worker: the batch already keeps every CPU busy
+    SCHEDULE_GENERATION_CONFIG['parallel_workers'] = 1
+
+
+def _run_chunk(chunk: List[BatchRequest], num_options: int, search_mode: Optional[str],
+               deadline_ms: Optional[int]) -> List[Dict]:
+    return generate_chunk(_worker_state['catalog'], chunk, num_options, search_mode, deadline_ms)
+
+
+def generate_chunk(catalog: SemesterCatalog, chunk: List[BatchRequest], num_options: int,
+                   search_mode: Optional[str], deadline_ms: Optional[int]) -> List[Dict]:
+    """
+    Schedules for each request of a chunk
+
+    A failing request is reported in its result's 'error' instead of
+    stopping the rest of the batch.
+    """
+    results = []
+    for student_id, course_codes, preferences in chunk:
+        result = {'student_id': student_id, 'missing_courses': []}
+        try:
+            generator = ScheduleGenerator.from_catalog(catalog, course_codes, preferences)
+            result['missing_courses'] = generator.missing_courses
+            result['schedules'] = generator.generate_schedules(
+                num_options, search_mode=search_mode, deadline_ms=deadline_ms
+            )
+            result['run'] = generator.last_run
+        except Exception as e:
+            result['schedules'] = []
+            result['error'] = str(e)
+        results.append(result)
+    return results
+
+
+def iter_batch(catalog: SemesterCatalog, requests: Iterable[BatchRequest], num_options: int,
+               workers: int, chunk_size: int, search_mode: Optional[str] = None,
+               deadline_ms: Optional[int] = CONFIG_DEADLINE) -> Iterator[Dict]:
+    """
+    Yield one result per request as soon as its chunk finishes (not in request order)
+
+    deadline_ms is the search budget per request, as in
+    ScheduleGenerator.generate_schedules (None = no limit).
+
+    With more than one worker the chunks run in a process pool whose workers
+    receive the catalog through the pool initializer.
+    """
+    requests = iter(requests)
+    chunks = iter(lambda: list(islice(requests, chunk_size)), [])
+
+    if workers <= 1:
+        for chunk in chunks:
+            yield from generate_chunk(catalog, chunk, num_options, search_mode, deadline_ms)
+        return
+
+    pool = create_process_pool(workers, _init_worker, (catalog,))
+    try:
+        pending = set()
+        for chunk in chunks:
+            pending.add(pool.submit(_run_chunk, chunk, num_options, search_mode, deadline_ms))
+            if len(pending) >= workers * CHUNKS_IN_FLIGHT:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+    finally:
+        # A consumer that stops early should not wait for the queued chunks
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,203 @@
+"""
+Branch-and-Bound Top-K Search
+Finds the K best-scoring schedules without ranking every valid combination
+"""
+
+import heapq
+from typing import List, Optional, Tuple
+
+from .backtracking import PROGRESS_INTERVAL, ProgressCallback, SearchBase, iter_bits
+from .compatibility import CompatibilityMatrix
+from .occupancy import ALL_DAYS_MASK
+from .scoring import ScheduleScorer
+
+
+class BranchAndBoundSearch(SearchBase):
+    """
+    Depth-first search that keeps a bounded min-heap of the K best schedules.
+
+    After each assignment an optimistic bound is computed for the best score
+    any completion could reach:
+      - days: the days already used plus the days every section of some
+        remaining course is forced to use
+      - early/late: the penalty so far plus the smallest possible penalty
+        of each remaining course
+    Once K schedules are held, a branch whose bound cannot beat the K-th
+    best score is cut. Candidates are tried best-bound-first, so the rest
+    of a sibling list is cut as soon as one candidate fails the bound.
+
+    Which schedules tie with the K-th best would then depend on the order
+    the search met them in, so a second pass walks the tree in
+    cartesian-product order (still cutting branches below the K-th score)
+    and keeps the earliest ties, as the other engines do.
+    """
+
+    def __init__(self, matrix: CompatibilityMatrix, scorer: ScheduleScorer, top_k: int,
+                 progress_callback: Optional[ProgressCallback] = None,
+                 progress_interval: int = PROGRESS_INTERVAL, deadline: Optional[float] = None):
+        super().__init__(progress_callback, progress_interval, deadline)
+        self.matrix = matrix
+        self.scorer = scorer
+        self.top_k = max(1, top_k)
+        self.order = sorted(range(len(matrix.sizes)), key=lambda i: matrix.sizes[i])
+
+        # Min-heap of (score, negated indices): the root is the current K-th best
+        self._heap: List[Tuple[int, Tuple[int, ...]]] = []
+        self._suffix_days, self._suffix_penalty = self._suffix_bounds(self.order)
+
+    def _suffix_bounds(self, order: List[int]) -> Tuple[List[int], List[int]]:
+        """Static bound pieces (forced days, smallest penalty) for the courses from each depth of `order` onwards"""
+        matrix, scorer = self.matrix, self.scorer
+        suffix_days = [0] * (len(order) + 1)
+        suffix_penalty = [0] * (len(order) + 1)
+
+        for depth in range(len(order) - 1, -1, -1):
+            course_idx = order[depth]
+            flat = range(matrix.offsets[course_idx], matrix.offsets[course_idx] + matrix.sizes[course_idx])
+
+            forced_days = ALL_DAYS_MASK
+            for flat_idx in flat:
+                forced_days &= scorer.day_bits[flat_idx]
+            min_penalty = min((scorer.penalty[flat_idx] for flat_idx in flat), default=0)
+
+            suffix_days[depth] = suffix_days[depth + 1] | forced_days
+            suffix_penalty[depth] = suffix_penalty[depth + 1] + min_penalty
+        return suffix_days, suffix_penalty
+
+    def threshold(self):
+        """Score a new schedule must beat to enter the top K (None while the heap has room)"""
+        if len(self._heap) < self.top_k:
+            return None
+        return self._heap[0][0]
+
+    def search(self, allowed: int = None) -> List[Tuple[int, Tuple[int, ...]]]:
+        """
+        Run to completion (or the deadline) and return
+        [(score, section indices in course order)], best first
+
+        Args:
+            allowed: Optional bitset of flat sections the search may use
+                     (used to shard the search space); defaults to all sections
+        """
+        if allowed is None:
+            allowed = (1 << len(self.matrix.sections)) - 1
+        if self.order and all(allowed & span for span in self.matrix.spans):
+            self._extend(0, allowed, 0, 0, [0] * len(self.order))
+            self._settle_ties(allowed)
+        self.report_progress()
+        return self.results()
+
+    def results(self) -> List[Tuple[int, Tuple[int, ...]]]:
+        """Current top K, best first; equal scores are listed in cartesian-product order"""
+        ranked = [(score, tuple(-i for i in negated)) for score, negated in self._heap]
+        ranked.sort(key=lambda item: (-item[0], item[1]))
+        return ranked
+
+    def _offer(self, score: int, indices: Tuple[int, ...]):
+        """Add a complete schedule to the heap if it makes the top K"""
+        self.found += 1
+        entry = (score, tuple(-i for i in indices))
+        if len(self._heap) < self.top_k:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def _settle_ties(self, allowed: int):
+        """Replace the schedules scoring exactly the K-th best with the earliest such in product order"""
+        if len(self._heap) < self.top_k or self.timed_out:
+            # Every valid schedule was kept, or there is no time for a second pass
+            return
+        threshold = self._heap[0][0]
+        above = [entry for entry in self._heap if entry[0] > threshold]
+        ties = self._earliest_ties(allowed, threshold, self.top_k - len(above))
+        if self.timed_out:
+            return
+        self._heap = above + [(threshold, tuple(-i for i in indices)) for indices in ties]
+        heapq.heapify(self._heap)
+
+    def _earliest_ties(self, allowed: int, score: int, count: int) -> List[Tuple[int, ...]]:
+        """The first `count` schedules scoring exactly `score`, in cartesian-product order"""
+        matrix, scorer = self.matrix, self.scorer
+        last = len(matrix.sizes) - 1
+        suffix_days, suffix_penalty = self._suffix_bounds(list(range(len(matrix.sizes))))
+        chosen = [0] * len(matrix.sizes)
+        ties: List[Tuple[int, ...]] = []
+
+        def extend(course_idx: int, allowed: int, used_days: int, penalty: int) -> bool:
+            """True once enough ties are found or the deadline passed"""
+            offset = matrix.offsets[course_idx]
+            remaining = matrix.spans[course_idx + 1:]
+            for flat_idx in iter_bits(allowed & matrix.spans[course_idx]):
+                days = used_days | scorer.day_bits[flat_idx]
+                cost = penalty + scorer.penalty[flat_idx]
+                if scorer.score_parts(days | suffix_days[course_idx + 1], cost + suffix_penalty[course_idx + 1]) < score:
+                    self.pruned += 1
+                    continue
+
+                self.explored += 1
+                if self.explored >= self._next_check:
+                    self.checkpoint()
+                    if self.timed_out:
+                        return True
+                chosen[course_idx] = flat_idx - offset
+
+                if course_idx == last:
+                    if scorer.score_parts(days, cost) == score:
+                        ties.append(tuple(chosen))
+                        if len(ties) == count:
+                            return True
+                    continue
+
+                next_allowed = allowed & matrix.rows[flat_idx]
+                if not all(next_allowed & span for span in remaining):
+                    self.pruned += 1
+                    continue
+                if extend(course_idx + 1, next_allowed, days, cost):
+                    return True
+            return False
+
+        extend(0, allowed, 0, 0)
+        return ties
+
+    def _extend(self, depth: int, allowed: int, used_days: int, penalty: int, chosen: List[int]):
+        matrix, scorer = self.matrix, self.scorer
+        course_idx = self.order[depth]
+        offset = matrix.offsets[course_idx]
+        remaining = [matrix.spans[c] for c in self.order[depth + 1:]]
+        rest_days = self._suffix_days[depth + 1]
+        rest_penalty = self._suffix_penalty[depth + 1]
+
+        # Optimistic bound for each still-compatible candidate
+        candidates = []
+        for flat_idx in iter_bits(allowed & matrix.spans[course_idx]):
+            days = used_days | scorer.day_bits[flat_idx]
+            cost = penalty + scorer.penalty[flat_idx]
+            bound = scorer.score_parts(days | rest_days, cost + rest_penalty)
+            candidates.append((bound, flat_idx, days, cost))
+        candidates.sort(key=lambda item: -item[0])
+
+        for position, (bound, flat_idx, days, cost) in enumerate(candidates):
+            threshold = self.threshold()
+            if threshold is not None and bound <= threshold:
+                self.pruned += len(candidates) - position
+                return
+
+            self.explored += 1
+            if self.explored >= self._next_check:
+                self.checkpoint()
+                if self.timed_out:
+                    return
+            chosen[course_idx] = flat_idx - offset
+
+            if not remaining:
+                self._offer(scorer.score_parts(days, cost), tuple(chosen))
+                continue
+
+            next_allowed = allowed & matrix.rows[flat_idx]
+            if not all(next_allowed & span for span in remaining):
+                self.pruned += 1
+                continue
+
+            self._extend(depth + 1, next_allowed, days, cost, chosen)
+            if self.timed_out:
+                return
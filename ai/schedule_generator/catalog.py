@@ -0,0 +1,49 @@
+"""
+Semester Catalog
+Every course of a semester compiled once, so per-student requests are slices of it
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+from .compatibility import CompatibilityMatrix
+from .patterns import SectionPatterns
+
+
+class SemesterCatalog:
+    """
+    Meeting patterns and the pattern compatibility matrix of a whole semester.
+
+    A student's request is a subset of the catalog's courses; select() slices
+    its patterns and matrix out of the compiled ones, so no meeting is parsed
+    or compared again per student.
+    """
+
+    def __init__(self, courses: List[Dict]):
+        """
+        Args:
+            courses: Every course of the semester in generator format:
+                     [{'code': 'CSE1111', 'sections': [...]}]
+        """
+        self.courses = courses
+        self.index = {course['code']: c for c, course in enumerate(courses)}
+        self.patterns = SectionPatterns(courses)
+        self.matrix = CompatibilityMatrix(self.patterns.courses)
+
+    def select(self, course_codes: Iterable[str]) -> Tuple[SectionPatterns, CompatibilityMatrix, List[str]]:
+        """
+        Patterns and matrix of the requested courses, in request order
+
+        Repeated codes are taken once; codes the catalog does not offer are
+        returned instead of raising, so one typo does not fail a whole batch.
+
+        Returns:
+            (patterns, matrix, codes not in the catalog)
+        """
+        chosen = []
+        missing = []
+        for code in dict.fromkeys(course_codes):
+            if code in self.index:
+                chosen.append(self.index[code])
+            else:
+                missing.append(code)
+        return self.patterns.subset(chosen), self.matrix.subset(chosen), missing
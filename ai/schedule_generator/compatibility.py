@@ -0,0 +1,158 @@
+"""
+Section Compatibility Matrix
+Pairwise "can these two sections share a schedule" table, built once per generation request
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .occupancy import section_meetings
+
+# Sections compared against all others per step of CompatibilityMatrix._build
+BUILD_BLOCK_ROWS = 256
+
+
+class CompatibilityMatrix:
+    """
+    Boolean matrix over every candidate section of a request.
+
+    Sections are flattened course by course: course `c` owns the flat
+    indices `offsets[c]` to `offsets[c] + sizes[c] - 1`. Two sections are
+    compatible when they belong to different courses and none of their
+    meetings overlap.
+    """
+
+    def __init__(self, courses: List[Dict]):
+        """
+        Args:
+            courses: Courses in generator format: [{'code': ..., 'sections': [...]}]
+        """
+        self._index(courses)
+        self.matrix = self._build()
+        self._bitsets()
+
+    def _index(self, courses: List[Dict]):
+        """Flat section layout of the courses"""
+        self.courses = courses
+        self.sizes = [len(course['sections']) for course in courses]
+        self.offsets = [0] * len(courses)
+        for c in range(1, len(courses)):
+            self.offsets[c] = self.offsets[c - 1] + self.sizes[c - 1]
+
+        self.sections = [section for course in courses for section in course['sections']]
+        self.course_of = np.repeat(np.arange(len(courses)), self.sizes)
+
+    def _bitsets(self):
+        """Row and course-span bitsets used by the searches"""
+        # Row bitsets: bit j of rows[i] is set when flat sections i and j are compatible
+        self.rows = [self._row_to_int(row) for row in self.matrix]
+        # Bitset of all flat indices owned by each course
+        self.spans = [((1 << size) - 1) << offset for size, offset in zip(self.sizes, self.offsets)]
+
+    def _build(self) -> np.ndarray:
+        """Vectorized interval comparison over all meeting pairs"""
+        n = len(self.sections)
+        meetings = [section_meetings(section) for section in self.sections]
+        width = max((len(m) for m in meetings), default=0) or 1
+
+        # Padded (n, width) meeting arrays; day -1 marks an empty slot
+        days = np.full((n, width), -1, dtype=np.int16)
+        starts = np.zeros((n, width), dtype=np.int16)
+        ends = np.zeros((n, width), dtype=np.int16)
+        for i, section_meets in enumerate(meetings):
+            for k, (day, start, end) in enumerate(section_meets):
+                days[i, k], starts[i, k], ends[i, k] = day, start, end
+
+        # (rows, n, width, width): meeting a of section i against meeting b of section j,
+        # a block of rows at a time so a whole-semester catalog stays within memory
+        clashes = np.empty((n, n), dtype=bool)
+        for lo in range(0, n, BUILD_BLOCK_ROWS):
+            block = slice(lo, lo + BUILD_BLOCK_ROWS)
+            same_day = (days[block, None, :, None] == days[None, :, None, :]) & (days[block, None, :, None] >= 0)
+            overlap = (starts[block, None, :, None] < ends[None, :, None, :]) & \
+                      (starts[None, :, None, :] < ends[block, None, :, None])
+            clashes[block] = (same_day & overlap).any(axis=(2, 3))
+
+        same_course = self.course_of[:, None] == self.course_of[None, :]
+        return ~(clashes | same_course)
+
+    def subset(self, course_indices: List[int]) -> 'CompatibilityMatrix':
+        """
+        Matrix of some of this matrix's courses (in the given order), sliced
+        out of the already built one instead of comparing meetings again
+        """
+        flat = [self.offsets[c] + s for c in course_indices for s in range(self.sizes[c])]
+        sub = CompatibilityMatrix.__new__(CompatibilityMatrix)
+        sub._index([self.courses[c] for c in course_indices])
+        sub.matrix = self.matrix[np.ix_(flat, flat)]
+        sub._bitsets()
+        return sub
+
+    @staticmethod
+    def _row_to_int(row: np.ndarray) -> int:
+        return int.from_bytes(np.packbits(row, bitorder='little').tobytes(), 'little')
+
+    def flat_index(self, course_idx: int, section_idx: int) -> int:
+        """Flat matrix index of a section"""
+        return self.offsets[course_idx] + section_idx
+
+    def locate(self, flat_idx: int) -> Tuple[int, int]:
+        """(course_idx, section_idx) of a flat matrix index"""
+        course_idx = int(self.course_of[flat_idx])
+        return course_idx, flat_idx - self.offsets[course_idx]
+
+    def compatible(self, flat_i: int, flat_j: int) -> bool:
+        """True when the two sections can appear in the same schedule"""
+        return bool(self.matrix[flat_i, flat_j])
+
+    def course_block(self, course_i: int, course_j: int) -> np.ndarray:
+        """Sub-matrix of sections of course_i (rows) against sections of course_j (columns)"""
+        rows = slice(self.offsets[course_i], self.offsets[course_i] + self.sizes[course_i])
+        cols = slice(self.offsets[course_j], self.offsets[course_j] + self.sizes[course_j])
+        return self.matrix[rows, cols]
+
+    def conflict_density(self) -> float:
+        """Fraction of cross-course section pairs that clash"""
+        cross = ~(self.course_of[:, None] == self.course_of[None, :])
+        total = int(cross.sum())
+        if not total:
+            return 0.0
+        return float((~self.matrix & cross).sum()) / total
+
+    def diagnose(self) -> List[Dict]:
+        """
+        Find sections that clash with every section of another course,
+        and course pairs that can never be taken together
+        """
+        findings = []
+        for ci, course_i in enumerate(self.courses):
+            for cj, course_j in enumerate(self.courses):
+                if ci == cj or not self.sizes[ci] or not self.sizes[cj]:
+                    continue
+                block = self.course_block(ci, cj)
+                blocked = ~block.any(axis=1)
+
+                if blocked.all():
+                    if ci < cj:
+                        findings.append({
+                            'type': 'course_pair',
+                            'course1': course_i['code'],
+                            'course2': course_j['code'],
+                            'message': f"No section of {course_i['code']} fits with any section of {course_j['code']}",
+                        })
+                    continue
+
+                for section_idx in np.flatnonzero(blocked):
+                    section = course_i['sections'][section_idx]
+                    findings.append({
+                        'type': 'section',
+                        'course_index': ci,
+                        'section_index': int(section_idx),
+                        'course1': course_i['code'],
+                        'section': section.get('section', str(section_idx)),
+                        'course2': course_j['code'],
+                        'message': f"Section {section.get('section', section_idx)} of {course_i['code']} "
+                                   f"clashes with every section of {course_j['code']}",
+                    })
+        return findings
@@ -4,9 +4,11 @@ Identifies and analyzes scheduling conflicts
 """
 
 from enum import Enum
-from datetime import datetime
 from typing import List, Tuple
 
+from ai.time_parser import parse_time
+from .occupancy import occupancy_mask
+
 
 class ConflictType(Enum):
     """Types of scheduling conflicts"""
@@ -23,42 +25,9 @@ class ConflictDetector:
     def parse_time(time_str: str) -> Tuple[int, int]:
         """
         Parse time string like '08:30 AM - 09:50 AM' or '08:30:AM - 09:50:AM' and return start/end minutes from midnight
-        Returns: (start_minutes, end_minutes)
+        Returns: (start_minutes, end_minutes), or (0, 0) for invalid times
         """
-        if not time_str or time_str.strip() == '' or time_str.strip() == '-':
-            return (0, 0)
-        
-        try:
-            parts = time_str.split('-')
-            if len(parts) != 2:
-                return (0, 0)
-            
-            start_str = parts[0].strip()
-            end_str = parts[1].strip()
-            
-            # Handle both formats: "08:30 AM" and "08:30:AM"
-            # Add space before AM/PM if missing
-            if ':AM' in start_str:
-                start_str = start_str.replace(':AM', ' AM')
-            if ':PM' in start_str:
-                start_str = start_str.replace(':PM', ' PM')
-            if ':AM' in end_str:
-                end_str = end_str.replace(':AM', ' AM')
-            if ':PM' in end_str:
-                end_str = end_str.replace(':PM', ' PM')
-            
-            # Parse start time
-            start_time = datetime.strptime(start_str, '%I:%M %p')
-            start_minutes = start_time.hour * 60 + start_time.minute
-            
-            # Parse end time
-            end_time = datetime.strptime(end_str, '%I:%M %p')
-            end_minutes = end_time.hour * 60 + end_time.minute
-            
-            return (start_minutes, end_minutes)
-        except Exception as e:
-            # Silently return (0, 0) for invalid times
-            return (0, 0)
+        return parse_time(time_str)
     
     @staticmethod
     def times_overlap(time1_str: str, time2_str: str) -> bool:
@@ -91,32 +60,8 @@ class ConflictDetector:
         Check if two course offerings have time overlap
         Returns True if they conflict
         """
-        # Get days for both courses
-        days1 = ConflictDetector.get_days_list(offering1)
-        days2 = ConflictDetector.get_days_list(offering2)
-        
-        # Check if they share any common day
-        common_days = set(days1) & set(days2)
-        if not common_days:
-            return False  # No common days, no conflict
-        
-        # They share at least one day, check time overlap
-        time1 = offering1.get('time1', '')
-        time2 = offering2.get('time2', '')
-        
-        # Check if times overlap
-        if ConflictDetector.times_overlap(time1, time2):
-            return True
-        
-        # Also check time2 fields if present
-        time1_alt = offering1.get('time2', '')
-        time2_alt = offering2.get('time1', '')
-        
-        if time1_alt and time2_alt:
-            if ConflictDetector.times_overlap(time1_alt, time2_alt):
-                return True
-        
-        return False
+        # Each offering's meetings are compiled (and cached) once as a weekly bitmask
+        return (occupancy_mask(offering1) & occupancy_mask(offering2)) != 0
     
     @staticmethod
     def validate_timeslot(day: str, time_str: str) -> bool:
@@ -0,0 +1,180 @@
+"""
+Schedule Counting
+Number of conflict-free schedules for a request, without building any of them
+"""
+
+import random
+import time
+from math import prod, sqrt
+from typing import Dict, List, Optional
+
+from .backtracking import DEADLINE_CHECK_INTERVAL, iter_bits
+from .compatibility import CompatibilityMatrix
+
+# Probes the estimate always takes, even when the deadline has already passed,
+# and probes between two deadline checks
+MIN_ESTIMATE_SAMPLES = 32
+
+
+class _BudgetExceeded(Exception):
+    """The exact count needs more memo entries or time than allowed"""
+
+
+class ScheduleCounter:
+    """
+    Exact counting by dynamic programming over the compatibility bitsets.
+
+    Courses are placed most-constrained-first, as in BacktrackingSearch.
+    After `depth` courses are placed, the number of ways to finish the
+    schedule only depends on which sections of the *remaining* courses are
+    still compatible, i.e. `allowed & suffix_spans[depth]`. Different
+    partial schedules that leave the same sections open share one memo
+    entry, so the work is bounded by the number of distinct states rather
+    than the number of schedules.
+
+    When the state space is larger than `memo_limit`, or the deadline
+    passes first, count() falls back to Knuth's random-probe estimator:
+    each probe walks one random path down the search tree and multiplies
+    the branching factors it sees, which is an unbiased estimate of the
+    number of leaves.
+    """
+
+    def __init__(self, matrix: CompatibilityMatrix, memo_limit: int = 200_000,
+                 samples: int = 2000, seed: Optional[int] = None,
+                 multiplicities: Optional[List[int]] = None, deadline: Optional[float] = None):
+        """
+        Args:
+            multiplicities: Concrete schedules behind each flat index (e.g. the
+                            sections sharing one meeting pattern); defaults to 1
+            deadline: time.monotonic() value at which counting stops; the
+                      estimate then uses the probes taken so far (at least
+                      MIN_ESTIMATE_SAMPLES)
+        """
+        self.matrix = matrix
+        self.multiplicities = multiplicities or [1] * len(matrix.sections)
+        self.memo_limit = memo_limit
+        self.samples = samples
+        self.seed = seed
+        self.deadline = deadline
+        self.timed_out = False
+        self.order = sorted(range(len(matrix.sizes)), key=lambda i: matrix.sizes[i])
+
+        # Sections of the courses from `depth` on, for every depth
+        self.suffix_spans = [0] * (len(self.order) + 1)
+        for depth in range(len(self.order) - 1, -1, -1):
+            self.suffix_spans[depth] = self.suffix_spans[depth + 1] | matrix.spans[self.order[depth]]
+
+    def count(self) -> Dict:
+        """
+        Returns:
+            {'count', 'exact', 'search_space', 'states', 'timed_out'} and,
+            for estimates, 'samples' and 'std_error'
+        """
+        search_space = prod(self.course_totals()) if self.matrix.sizes else 0
+        if not self.order or not all(self.matrix.sizes):
+            return {'count': 0, 'exact': True, 'search_space': search_space, 'states': 0, 'timed_out': False}
+
+        memo: Dict[tuple, int] = {}
+        try:
+            total = self._count(0, self.suffix_spans[0], memo)
+        except _BudgetExceeded:
+            estimate = self.estimate()
+            return {**estimate, 'search_space': search_space, 'states': len(memo), 'timed_out': self.timed_out}
+        return {'count': total, 'exact': True, 'search_space': search_space, 'states': len(memo),
+                'timed_out': False}
+
+    def course_totals(self) -> List[int]:
+        """Concrete choices per course (sum of multiplicities)"""
+        return [
+            sum(self.multiplicities[offset:offset + size])
+            for offset, size in zip(self.matrix.offsets, self.matrix.sizes)
+        ]
+
+    def _count(self, depth: int, allowed: int, memo: Dict[tuple, int]) -> int:
+        """Completions of a partial schedule whose open sections are `allowed`"""
+        if depth == len(self.order):
+            return 1
+
+        key = (depth, allowed)
+        cached = memo.get(key)
+        if cached is not None:
+            return cached
+        if len(memo) >= self.memo_limit:
+            raise _BudgetExceeded()
+        if len(memo) % DEADLINE_CHECK_INTERVAL == 0 and self._past_deadline():
+            raise _BudgetExceeded()
+
+        matrix = self.matrix
+        span = matrix.spans[self.order[depth]]
+        rest = self.suffix_spans[depth + 1]
+        remaining = [matrix.spans[c] for c in self.order[depth + 1:]]
+
+        total = 0
+        for flat_idx in iter_bits(allowed & span):
+            next_allowed = allowed & matrix.rows[flat_idx] & rest
+            if all(next_allowed & course_span for course_span in remaining):
+                total += self.multiplicities[flat_idx] * self._count(depth + 1, next_allowed, memo)
+
+        memo[key] = total
+        return total
+
+    def estimate(self) -> Dict:
+        """Knuth estimate of the number of valid schedules from random probes"""
+        probes = self.probe()
+        return {
+            'count': int(round(probes['solutions'])),
+            'exact': False,
+            'samples': probes['samples'],
+            'std_error': int(round(probes['std_error'])),
+        }
+
+    def probe(self) -> Dict:
+        """
+        Knuth's random probes of the backtracking tree (most-constrained-first
+        order with forward checking)
+
+        Returns:
+            {'solutions': expected valid schedules, 'nodes': expected nodes
+             visited, 'dead_ends': fraction of probes that hit a course with no
+             section left, 'samples', 'std_error' of 'solutions'}
+        """
+        rng = random.Random(self.seed)
+        matrix = self.matrix
+        weights: List[int] = []
+        nodes = 0
+        dead_ends = 0
+
+        for sample in range(self.samples):
+            if sample and sample % MIN_ESTIMATE_SAMPLES == 0 and self._past_deadline():
+                break
+            allowed = self.suffix_spans[0]
+            branching = weight = 1
+            for depth, course_idx in enumerate(self.order):
+                choices = list(iter_bits(allowed & matrix.spans[course_idx]))
+                if not choices:
+                    dead_ends += 1
+                    weight = 0
+                    break
+                choice = rng.choice(choices)
+                # Nodes are meeting patterns; multiplicities only scale the schedules
+                branching *= len(choices)
+                nodes += branching
+                weight *= len(choices) * self.multiplicities[choice]
+                allowed &= matrix.rows[choice] & self.suffix_spans[depth + 1]
+            weights.append(weight)
+
+        samples = max(1, len(weights))
+        mean = sum(weights) / samples
+        variance = sum((w - mean) ** 2 for w in weights) / max(1, len(weights) - 1)
+        return {
+            'solutions': mean,
+            'nodes': nodes / samples,
+            'dead_ends': dead_ends / samples,
+            'samples': len(weights),
+            'std_error': sqrt(variance / samples),
+        }
+
+    def _past_deadline(self) -> bool:
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            self.timed_out = True
+        return self.timed_out
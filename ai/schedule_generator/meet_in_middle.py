@@ -0,0 +1,214 @@
+"""
+Meet-in-the-Middle Search
+Enumerates the valid partial schedules of two halves of the courses and joins them on their occupancy masks
+"""
+
+import heapq
+from math import log
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .backtracking import PROGRESS_INTERVAL, ProgressCallback, SearchBase, iter_bits
+from .compatibility import CompatibilityMatrix
+from .occupancy import MINUTES_PER_DAY, day_mask, section_meetings
+from .scoring import ScheduleScorer
+
+# Bits per word of the packed occupancy masks used by the join
+WORD_BITS = 64
+
+# Partial schedules of one half: occupancy mask -> (days used, [section indices per half course])
+HalfIndex = Dict[int, Tuple[int, List[Tuple[int, ...]]]]
+
+
+def segment_masks(sections: List[Dict]) -> List[int]:
+    """
+    Occupancy masks over elementary time segments instead of minutes.
+
+    The week is cut at every meeting start and end that occurs in `sections`;
+    each piece between two cuts is one bit. Two sets of meetings overlap
+    exactly when their minute masks do, but the masks are a few dozen bits
+    wide instead of 10,080.
+    """
+    meetings = [section_meetings(section) for section in sections]
+    cuts = sorted({day * MINUTES_PER_DAY + minute
+                   for section_meets in meetings
+                   for day, start, end in section_meets
+                   for minute in (start, end)})
+    position = {cut: idx for idx, cut in enumerate(cuts)}
+
+    masks = []
+    for section_meets in meetings:
+        mask = 0
+        for day, start, end in section_meets:
+            first = position[day * MINUTES_PER_DAY + start]
+            last = position[day * MINUTES_PER_DAY + end]
+            mask |= ((1 << (last - first)) - 1) << first
+        masks.append(mask)
+    return masks
+
+
+class MeetInTheMiddleSearch(SearchBase):
+    """
+    Split the courses into two halves, enumerate each half's conflict-free
+    partial schedules once, and join them.
+
+    Two partial schedules from different halves fit together exactly when
+    their occupancy masks share no time, so partials with the same mask are
+    interchangeable for the join: each half is hashed by mask, and the join
+    tests each left mask against all right masks at once (packed into a
+    NumPy word array) before expanding the matching groups. The cost grows
+    with the number of valid partials and distinct masks instead of the full
+    cartesian product.
+    """
+
+    def __init__(self, matrix: CompatibilityMatrix, progress_callback: Optional[ProgressCallback] = None,
+                 progress_interval: int = PROGRESS_INTERVAL, deadline: Optional[float] = None):
+        super().__init__(progress_callback, progress_interval, deadline)
+        self.matrix = matrix
+        self.masks = segment_masks(matrix.sections)
+        self.day_bits = [day_mask(section) for section in matrix.sections]
+        self.left, self.right = self._split()
+
+    def _split(self) -> Tuple[List[int], List[int]]:
+        """Two course halves with roughly equal search spaces (greedy on log size)"""
+        halves: Tuple[List[int], List[int]] = ([], [])
+        weights = [0.0, 0.0]
+        for course_idx in sorted(range(len(self.matrix.sizes)), key=lambda c: -self.matrix.sizes[c]):
+            side = 0 if weights[0] <= weights[1] else 1
+            halves[side].append(course_idx)
+            weights[side] += log(max(1, self.matrix.sizes[course_idx]))
+        return sorted(halves[0]), sorted(halves[1])
+
+    def _enumerate(self, courses: List[int]) -> HalfIndex:
+        """Conflict-free partial schedules of `courses`, grouped by occupancy mask"""
+        matrix = self.matrix
+        groups: HalfIndex = {}
+        chosen = [0] * len(courses)
+
+        def extend(depth: int, allowed: int, mask: int, days: int):
+            if depth == len(courses):
+                groups.setdefault(mask, (days, []))[1].append(tuple(chosen))
+                return
+            course_idx = courses[depth]
+            offset = matrix.offsets[course_idx]
+            for flat_idx in iter_bits(allowed & matrix.spans[course_idx]):
+                self.explored += 1
+                if self.explored >= self._next_check:
+                    self.checkpoint()
+                    if self.timed_out:
+                        return
+                chosen[depth] = flat_idx - offset
+                extend(depth + 1, allowed & matrix.rows[flat_idx],
+                       mask | self.masks[flat_idx], days | self.day_bits[flat_idx])
+                if self.timed_out:
+                    return
+
+        if all(matrix.sizes[c] for c in courses):
+            extend(0, (1 << len(matrix.sections)) - 1, 0, 0)
+        return groups
+
+    def _join_pairs(self) -> Iterator[Tuple[int, List[Tuple[int, ...]], List[Tuple[int, ...]]]]:
+        """Yield (days used, left partials, right partials) for every compatible mask pair"""
+        if not self.matrix.sizes or not all(self.matrix.sizes):
+            return
+        left_groups = self._enumerate(self.left)
+        right_groups = self._enumerate(self.right)
+        if self.timed_out or not left_groups or not right_groups:
+            return
+
+        width = max(self.masks).bit_length()
+        right_entries = list(right_groups.values())
+        right_words = _pack(list(right_groups), width)
+        right_sizes = np.array([len(partials) for _, partials in right_entries], dtype=np.int64)
+
+        for left_mask, (left_days, left_partials) in left_groups.items():
+            self.checkpoint()
+            if self.timed_out:
+                return
+            clashes = (right_words & _pack([left_mask], width)[0]).any(axis=1)
+            self.pruned += len(left_partials) * int(right_sizes[clashes].sum())
+            for right_idx in np.flatnonzero(~clashes).tolist():
+                right_days, right_partials = right_entries[right_idx]
+                yield left_days | right_days, left_partials, right_partials
+
+    def _merge(self, left: Tuple[int, ...], right: Tuple[int, ...]) -> Tuple[int, ...]:
+        """Section indices in course order from one partial of each half"""
+        indices = [0] * len(self.matrix.sizes)
+        for course_idx, section_idx in zip(self.left, left):
+            indices[course_idx] = section_idx
+        for course_idx, section_idx in zip(self.right, right):
+            indices[course_idx] = section_idx
+        return tuple(indices)
+
+    def iter_solutions(self) -> Iterator[Tuple[int, ...]]:
+        """Yield every conflict-free assignment as section indices in course order (no particular order)"""
+        for _, left_partials, right_partials in self._join_pairs():
+            for left in left_partials:
+                for right in right_partials:
+                    self.found += 1
+                    yield self._merge(left, right)
+        self.report_progress()
+
+    def count(self) -> int:
+        """Number of conflict-free schedules, without building any of them"""
+        total = 0
+        for _, left_partials, right_partials in self._join_pairs():
+            total += len(left_partials) * len(right_partials)
+        self.found = total
+        self.report_progress()
+        return total
+
+    def top_k(self, scorer: ScheduleScorer, k: int) -> List[Tuple[int, Tuple[int, ...]]]:
+        """
+        Best k schedules as [(score, section indices in course order)], best
+        first; among equal scores the earliest in cartesian-product order are kept.
+
+        Within one compatible mask pair the used days are fixed, so only the
+        early/late penalty varies: partials are tried in ascending penalty
+        order and the pair is left as soon as nothing can beat the K-th best.
+        """
+        k = max(1, k)
+        # Min-heap of (score, negated indices): the root is the current K-th best
+        heap: List[Tuple[int, Tuple[int, ...]]] = []
+        penalties = {}
+
+        def by_penalty(courses: List[int], partials: List[Tuple[int, ...]]) -> List[Tuple[int, Tuple[int, ...]]]:
+            key = id(partials)
+            if key not in penalties:
+                penalties[key] = sorted(
+                    (sum(scorer.penalty[self.matrix.offsets[c] + s] for c, s in zip(courses, partial)), partial)
+                    for partial in partials
+                )
+            return penalties[key]
+
+        for used_days, left_partials, right_partials in self._join_pairs():
+            base = scorer.score_parts(used_days, 0)
+            lefts = by_penalty(self.left, left_partials)
+            rights = by_penalty(self.right, right_partials)
+
+            for left_penalty, left in lefts:
+                if len(heap) == k and base - left_penalty - rights[0][0] < heap[0][0]:
+                    break
+                for right_penalty, right in rights:
+                    score = base - left_penalty - right_penalty
+                    if len(heap) == k and score < heap[0][0]:
+                        break
+                    self.found += 1
+                    entry = (score, tuple(-i for i in self._merge(left, right)))
+                    if len(heap) < k:
+                        heapq.heappush(heap, entry)
+                    elif entry > heap[0]:
+                        heapq.heapreplace(heap, entry)
+
+        self.report_progress()
+        ranked = [(score, tuple(-i for i in negated)) for score, negated in heap]
+        ranked.sort(key=lambda item: (-item[0], item[1]))
+        return ranked
+
+
+def _pack(masks: List[int], width: int) -> np.ndarray:
+    """(len(masks), words) uint64 array holding the bits of each mask"""
+    words = max(1, -(-width // WORD_BITS))
+    packed = b''.join(mask.to_bytes(words * WORD_BITS // 8, 'little') for mask in masks)
+    return np.frombuffer(packed, dtype='<u8').reshape(len(masks), words)
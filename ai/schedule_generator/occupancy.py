@@ -0,0 +1,128 @@
+"""
+Weekly Occupancy Encoding
+Compiles section meeting times into integer bitmasks so conflict checks are a single AND
+"""
+
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from ai.config import TIME_SLOT_CONFIG
+from ai.time_parser import parse_time
+
+# One bit per minute of the week: day_index * MINUTES_PER_DAY + minute
+MINUTES_PER_DAY = 24 * 60
+DAYS = TIME_SLOT_CONFIG['class_days']
+DAY_ABBREVIATIONS = {day[:3].lower(): idx for idx, day in enumerate(DAYS)}
+ALL_DAYS_MASK = (1 << len(DAYS)) - 1
+
+# (day_index, start_minute, end_minute)
+Meeting = Tuple[int, int, int]
+
+
+def day_index(day_str: str) -> Optional[int]:
+    """
+    Map a day string to its index in DAYS
+    Accepts full names, abbreviations and PDF artifacts like ')Tue'
+    """
+    if not day_str:
+        return None
+    cleaned = day_str.strip().lstrip(')(').strip()
+    return DAY_ABBREVIATIONS.get(cleaned[:3].lower())
+
+
+@lru_cache(maxsize=4096)
+def _compile_meetings(day1: str, day2: str, time1: str, time2: str) -> Tuple[Meeting, ...]:
+    """Parse one meeting pattern; cached because catalogs repeat a handful of patterns"""
+    meetings = []
+    first = parse_time(time1)
+    second = parse_time(time2)
+
+    # Day 2 falls back to Time 1 when its own time is missing ('-' in the PDFs)
+    if second[1] <= second[0]:
+        second = first
+
+    for day, (start, end) in ((day1, first), (day2, second)):
+        idx = day_index(day)
+        if idx is None or end <= start:
+            continue
+        meeting = (idx, start, end)
+        if meeting not in meetings:
+            meetings.append(meeting)
+
+    return tuple(meetings)
+
+
+def section_meetings(section: dict) -> Tuple[Meeting, ...]:
+    """
+    Get the (day, start, end) meetings of a section dict
+
+    Sections loaded from the database carry 'meeting_slots' parsed at upload
+    time; the day/time strings are only parsed for sections without them.
+    """
+    slots = section.get('meeting_slots')
+    if slots is not None:
+        return tuple((slot['day'], slot['start'], slot['end']) for slot in slots)
+    return _compile_meetings(
+        section.get('day1') or '',
+        section.get('day2') or '',
+        section.get('time1') or '',
+        section.get('time2') or '',
+    )
+
+
+def meetings_mask(meetings) -> int:
+    """Encode meetings as a weekly occupancy bitmask"""
+    mask = 0
+    for day, start, end in meetings:
+        mask |= ((1 << (end - start)) - 1) << (day * MINUTES_PER_DAY + start)
+    return mask
+
+
+def occupancy_mask(section: dict) -> int:
+    """Weekly occupancy bitmask of a section dict"""
+    return _meetings_mask_cached(section_meetings(section))
+
+
+@lru_cache(maxsize=4096)
+def _meetings_mask_cached(meetings: Tuple[Meeting, ...]) -> int:
+    return meetings_mask(meetings)
+
+
+def day_mask(section: dict) -> int:
+    """7-bit mask of the days a section meets on"""
+    mask = 0
+    for day, _, _ in section_meetings(section):
+        mask |= 1 << day
+    return mask
+
+
+@lru_cache(maxsize=4096)
+def _compile_slot(day: str, start_time: str, end_time: str) -> Tuple[Meeting, ...]:
+    idx = day_index(day)
+    start, end = parse_time(f"{start_time} - {end_time}")
+    if idx is None or end <= start:
+        return ()
+    return ((idx, start, end),)
+
+
+def time_slot_meetings(time_slots) -> Tuple[Meeting, ...]:
+    """(day, start, end) meetings of ai.models.TimeSlot objects"""
+    meetings = []
+    for slot in time_slots:
+        meetings.extend(_compile_slot(slot.day, slot.start_time, slot.end_time))
+    return tuple(meetings)
+
+
+def time_slots_mask(time_slots) -> int:
+    """Weekly occupancy bitmask of ai.models.TimeSlot objects"""
+    return _meetings_mask_cached(time_slot_meetings(time_slots))
+
+
+def compile_masks(sections: List[Dict]) -> List[int]:
+    """Occupancy masks for a list of sections, in the same order"""
+    return [occupancy_mask(section) for section in sections]
+
+
+def masks_conflict(mask1: int, mask2: int) -> bool:
+    """Two occupancy masks conflict when they share any minute"""
+    return (mask1 & mask2) != 0
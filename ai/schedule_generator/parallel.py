@@ -0,0 +1,106 @@
+"""
+Parallel Sharded Search
+Splits a large branch-and-bound search across a process pool
+"""
+
+import os
+from collections import OrderedDict
+from concurrent.futures import as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ai.process_pool import submit_task
+from .backtracking import iter_bits
+from .branch_and_bound import BranchAndBoundSearch
+from .compatibility import CompatibilityMatrix
+from .scoring import ScheduleScorer
+
+# Shards per worker, so one slow shard does not leave the other workers idle
+SHARDS_PER_WORKER = 4
+
+# Requests a worker keeps compiled; the shared pool may interleave the shards
+# of concurrent requests
+WORKER_CACHE_SIZE = 4
+
+# Per-process compiled requests: request id -> (matrix, scorer)
+_compiled: 'OrderedDict[str, Tuple[CompatibilityMatrix, ScheduleScorer]]' = OrderedDict()
+
+
+def _compile(request_id: str, courses: List[Dict], user_preferences: dict
+             ) -> Tuple[CompatibilityMatrix, ScheduleScorer]:
+    """Compile a request once per worker process"""
+    compiled = _compiled.get(request_id)
+    if compiled is None:
+        matrix = CompatibilityMatrix(courses)
+        compiled = _compiled[request_id] = (matrix, ScheduleScorer(matrix, user_preferences))
+        while len(_compiled) > WORKER_CACHE_SIZE:
+            _compiled.popitem(last=False)
+    return compiled
+
+
+def _search_shard(request_id: str, courses: List[Dict], user_preferences: dict, allowed: int,
+                  top_k: int, deadline: Optional[float]
+                  ) -> Tuple[List[Tuple[int, Tuple[int, ...]]], Dict[str, int], bool]:
+    """Local top-K of one shard of the search space"""
+    matrix, scorer = _compile(request_id, courses, user_preferences)
+    search = BranchAndBoundSearch(matrix, scorer, top_k, deadline=deadline)
+    results = search.search(allowed)
+    return results, search.progress(), search.timed_out
+
+
+def make_shards(matrix: CompatibilityMatrix, shard_count: int) -> List[int]:
+    """
+    Split the search space by the sections of one course.
+
+    The course with the most sections is split round-robin into at most
+    `shard_count` groups; each shard is an allowed-section bitset where that
+    course is restricted to one group and every other course is untouched.
+    """
+    split_course = max(range(len(matrix.sizes)), key=lambda c: matrix.sizes[c])
+    everything = (1 << len(matrix.sections)) - 1
+    others = everything & ~matrix.spans[split_course]
+
+    groups = [0] * min(shard_count, matrix.sizes[split_course])
+    for position, flat_idx in enumerate(iter_bits(matrix.spans[split_course])):
+        groups[position % len(groups)] |= 1 << flat_idx
+    return [others | group for group in groups]
+
+
+def parallel_top_k(courses: List[Dict], matrix: CompatibilityMatrix, user_preferences: dict, top_k: int,
+                   workers: int,
+                   progress_callback: Optional[Callable[[Dict], None]] = None,
+                   deadline: Optional[float] = None
+                   ) -> Tuple[List[Tuple[int, Tuple[int, ...]]], Dict[str, int], bool]:
+    """
+    Run branch-and-bound on every shard in a process pool and merge the local top-K lists
+
+    Args:
+        deadline: time.monotonic() value shared by every shard (the monotonic
+                  clock is system-wide, so workers can compare against it)
+
+    Returns:
+        ([(score, section indices in course order)] best first, merged search counters,
+         whether any shard stopped at the deadline)
+    """
+    shards = make_shards(matrix, workers * SHARDS_PER_WORKER)
+    totals = {'explored': 0, 'pruned': 0, 'found': 0}
+    merged = []
+    timed_out = False
+
+    # The long-lived shared pool: workers are not started per request
+    request_id = os.urandom(8).hex()
+    futures = [
+        submit_task(_search_shard, request_id, courses, user_preferences, allowed, top_k, deadline)
+        for allowed in shards
+    ]
+    for future in as_completed(futures):
+        results, progress, shard_timed_out = future.result()
+        merged.extend(results)
+        timed_out = timed_out or shard_timed_out
+        for key in totals:
+            totals[key] += progress[key]
+        if progress_callback:
+            progress_callback(dict(totals))
+
+    # Global top-K is contained in the union of the local top-K lists
+    merged.sort(key=lambda item: (-item[0], item[1]))
+    return merged[:top_k], totals, timed_out
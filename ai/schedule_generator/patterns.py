@@ -0,0 +1,77 @@
+"""
+Section Meeting Patterns
+Collapses sections that meet at identical times into one search candidate
+"""
+
+from typing import Dict, List, Tuple
+
+from ai.time_parser import parse_time
+from .occupancy import section_meetings
+
+
+def pattern_key(section: dict) -> tuple:
+    """
+    Everything the search and the score look at: the parsed meetings plus
+    Time 1 (which drives the early/late preferences). Sections with equal
+    keys differ only in faculty, room or section number.
+    """
+    return section_meetings(section), parse_time(section.get('time1') or '')
+
+
+class SectionPatterns:
+    """
+    Courses reduced to one representative section per meeting pattern.
+
+    `courses` has the same course dicts as the request, but each `sections`
+    list holds only the first section of every pattern, in order of first
+    appearance. `members[c][p]` lists the indices (into the original course's
+    sections) of every section sharing pattern `p` of course `c`.
+    """
+
+    def __init__(self, courses: List[Dict]):
+        self.source = courses
+        self.courses: List[Dict] = []
+        self.members: List[List[List[int]]] = []
+
+        for course in courses:
+            groups: Dict[tuple, List[int]] = {}
+            for section_idx, section in enumerate(course['sections']):
+                groups.setdefault(pattern_key(section), []).append(section_idx)
+            members = list(groups.values())
+            self.members.append(members)
+            self.courses.append({
+                **course,
+                'sections': [course['sections'][group[0]] for group in members],
+            })
+
+    def subset(self, course_indices: List[int]) -> 'SectionPatterns':
+        """Patterns of some of these courses (in the given order) without regrouping"""
+        sub = SectionPatterns([])
+        sub.source = [self.source[c] for c in course_indices]
+        sub.courses = [self.courses[c] for c in course_indices]
+        sub.members = [self.members[c] for c in course_indices]
+        return sub
+
+    def multiplicities(self) -> List[int]:
+        """Sections behind each flat pattern index (course by course)"""
+        return [len(group) for members in self.members for group in members]
+
+    def expand(self, indices) -> Tuple[List[Dict], List[List[Dict]]]:
+        """
+        Concrete sections for one pattern index per course
+
+        Returns:
+            (chosen sections, other sections with the same meeting times for each course)
+        """
+        sections = []
+        alternatives = []
+        for course, members, pattern_idx in zip(self.source, self.members, indices):
+            group = members[pattern_idx]
+            sections.append(course['sections'][group[0]])
+            alternatives.append([course['sections'][i] for i in group[1:]])
+        return sections, alternatives
+
+    def section_labels(self, course_idx: int, pattern_idx: int) -> List[str]:
+        """Section numbers sharing one pattern"""
+        sections = self.source[course_idx]['sections']
+        return [str(sections[i].get('section', i)) for i in self.members[course_idx][pattern_idx]]
@@ -0,0 +1,97 @@
+"""
+Search Engine Planner
+Picks the cheapest schedule search engine expected to meet the latency target for a request
+"""
+
+from math import comb, prod
+from typing import Dict, List, Tuple
+
+from ai.config import SCHEDULE_GENERATION_CONFIG
+from .compatibility import CompatibilityMatrix
+from .counting import ScheduleCounter
+
+
+def estimate_tree_size(matrix: CompatibilityMatrix, samples: int, seed: int = 0) -> Dict[str, float]:
+    """
+    Knuth estimate of the backtracking tree (see ScheduleCounter.probe)
+
+    Returns:
+        {'nodes': expected nodes visited, 'solutions': expected valid schedules,
+         'dead_ends': fraction of probes that hit a course with no section left}
+    """
+    probes = ScheduleCounter(matrix, samples=samples, seed=seed).probe()
+    return {key: probes[key] for key in ('nodes', 'solutions', 'dead_ends')}
+
+
+def estimate_half_partials(matrix: CompatibilityMatrix, density: float) -> Tuple[int, int]:
+    """
+    Expected valid partial schedules of the two meet-in-the-middle halves,
+    assuming independent clashes at the request's conflict density
+    """
+    sizes = sorted(matrix.sizes, reverse=True)
+    halves: List[List[int]] = [[], []]
+    for size in sizes:
+        halves[0 if prod(halves[0]) <= prod(halves[1]) else 1].append(size)
+    left, right = (int(prod(half) * (1 - density) ** comb(len(half), 2)) for half in halves)
+    return left, right
+
+
+def plan_search(matrix: CompatibilityMatrix, latency_target_ms: int = None) -> Dict:
+    """
+    Choose a search engine for one request
+
+    Engines, cheapest first:
+      - 'exhaustive': enumerate and rank every valid schedule (tiny requests)
+      - 'branch_and_bound': exact top-K when the estimated tree fits the latency target
+      - 'meet_in_middle': exact top-K for many courses whose halves stay small
+      - 'local_search': heuristic for everything else, including selections
+        that cannot be made conflict-free (it suggests courses to drop)
+
+    Returns:
+        {'engine', 'reason', 'search_space', 'density', 'estimated_nodes',
+         'estimated_solutions', 'latency_target_ms'}
+    """
+    config = SCHEDULE_GENERATION_CONFIG
+    target = latency_target_ms or config['latency_target_ms']
+    search_space = prod(matrix.sizes) if matrix.sizes else 0
+    density = matrix.conflict_density()
+    plan = {
+        'search_space': search_space,
+        'density': round(density, 4),
+        'latency_target_ms': target,
+    }
+
+    if search_space <= config['planner_exhaustive_max']:
+        return {**plan, 'engine': 'exhaustive',
+                'reason': f"{search_space} combinations <= {config['planner_exhaustive_max']}: rank them all"}
+
+    impossible = [f for f in matrix.diagnose() if f['type'] == 'course_pair']
+    if impossible:
+        pair = impossible[0]
+        return {**plan, 'engine': 'local_search',
+                'reason': f"no section of {pair['course1']} fits with {pair['course2']}: "
+                          f"find the fewest courses to drop"}
+
+    tree = estimate_tree_size(matrix, config['planner_samples'])
+    plan['estimated_nodes'] = int(tree['nodes'])
+    plan['estimated_solutions'] = int(tree['solutions'])
+    node_budget = target * config['planner_nodes_per_ms']
+
+    if tree['nodes'] <= node_budget:
+        return {**plan, 'engine': 'branch_and_bound',
+                'reason': f"~{int(tree['nodes'])} search nodes fit the {target} ms budget "
+                          f"({node_budget} nodes)"}
+
+    if len(matrix.sizes) >= config['planner_mitm_min_courses']:
+        left, right = estimate_half_partials(matrix, density)
+        plan['estimated_half_partials'] = [left, right]
+        if left * right <= target * config['planner_mitm_pairs_per_ms']:
+            return {**plan, 'engine': 'meet_in_middle',
+                    'reason': f"{len(matrix.sizes)} courses with ~{left} x {right} partial pairs to join "
+                              f"(~{int(tree['nodes'])} backtracking nodes)"}
+
+    if tree['solutions'] == 0 and tree['dead_ends'] == 1:
+        reason = f"no valid schedule in {config['planner_samples']} probes at density {density:.2f}"
+    else:
+        reason = f"~{int(tree['nodes'])} search nodes exceed the {target} ms budget ({node_budget} nodes)"
+    return {**plan, 'engine': 'local_search', 'reason': reason}
@@ -0,0 +1,147 @@
+"""
+Re-ranking Cache
+Keeps each request's candidate schedules and feature matrix so preference changes re-rank without searching
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ai.config import SCHEDULE_GENERATION_CONFIG
+from .scoring import rank_scores, score_feature_arrays, weight_vector
+
+# Rough in-memory cost of one section dict, on top of the NumPy buffers
+SECTION_OVERHEAD_BYTES = 1024
+
+
+def request_key(courses: List[Dict]) -> str:
+    """Stable key for a generation request: its courses and their sections' meeting data"""
+    digest = hashlib.sha256()
+    for course in courses:
+        digest.update(str(course.get('code', '')).encode())
+        for section in course['sections']:
+            fields = (section.get('id'), section.get('section'), section.get('day1'),
+                      section.get('day2'), section.get('time1'), section.get('time2'))
+            digest.update(repr(fields).encode())
+    return digest.hexdigest()
+
+
+class CachedRequest:
+    """Candidate schedules of one request as flat index rows plus their features"""
+
+    def __init__(self, courses: List[Dict], sections: List[Dict], rows: np.ndarray,
+                 features: Dict[str, np.ndarray], complete: bool, alternatives: List[List[Dict]] = None):
+        """
+        Args:
+            courses: The request's courses (returned with every schedule)
+            sections: Section for each flat index used in `rows`
+            alternatives: Same-time sections for each flat index, if any
+        """
+        self.courses = courses
+        self.sections = sections
+        self.alternatives = alternatives
+        self.rows = rows
+        self.features = features
+        self.complete = complete
+        self.created_at = time.time()
+        self.nbytes = (
+            rows.nbytes
+            + sum(array.nbytes for array in features.values())
+            + len(self.sections) * SECTION_OVERHEAD_BYTES
+        )
+
+    def rerank(self, preferences: dict, num_options: int) -> List[Dict]:
+        """Top schedules for new preferences, built from the cached features"""
+        scores = score_feature_arrays(self.features, weight_vector(preferences))
+        order = rank_scores(scores)[:num_options].tolist()
+
+        schedules = []
+        for i in order:
+            flat_row = self.rows[i].tolist()
+            schedules.append({
+                'sections': [self.sections[flat] for flat in flat_row],
+                'courses': self.courses,
+                'stats': {
+                    'free_days': int(self.features['free_days'][i]),
+                    'total_credits': self.features['total_credits'][i].item(),
+                    'days_with_classes': int(self.features['days_with_classes'][i]),
+                    'total_courses': len(self.courses),
+                },
+                'score': int(scores[i]),
+            })
+            if self.alternatives is not None:
+                schedules[-1]['alternatives'] = [self.alternatives[flat] for flat in flat_row]
+        return schedules
+
+
+class RerankCache:
+    """LRU cache of CachedRequest entries bounded by total size and age"""
+
+    def __init__(self, max_bytes: int, ttl: int):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: 'OrderedDict[str, CachedRequest]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def put(self, key: str, entry: CachedRequest) -> bool:
+        """Store an entry, evicting least recently used ones; False if it can never fit"""
+        if entry.nbytes > self.max_bytes:
+            return False
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = entry
+            self._bytes += entry.nbytes
+            while self._bytes > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+        return True
+
+    def get(self, key: str) -> Optional[CachedRequest]:
+        """Fetch a live entry and mark it recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry.created_at > self.ttl:
+                self._discard(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def rerank(self, key: str, preferences: dict, num_options: int) -> Optional[List[Dict]]:
+        """Re-rank a cached request; None on a cache miss"""
+        entry = self.get(key)
+        if entry is None:
+            return None
+        return entry.rerank(preferences, num_options)
+
+    def _discard(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.nbytes
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Singleton instance
+_cache = None
+
+
+def get_rerank_cache() -> RerankCache:
+    """Get or create the process-wide re-ranking cache"""
+    global _cache
+    if _cache is None:
+        _cache = RerankCache(
+            SCHEDULE_GENERATION_CONFIG['rerank_cache_bytes'],
+            SCHEDULE_GENERATION_CONFIG['rerank_cache_ttl'],
+        )
+    return _cache
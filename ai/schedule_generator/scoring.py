@@ -0,0 +1,199 @@
+"""
+Schedule Scoring Model
+Per-section features and preference weights behind ScheduleGenerator.score_schedules
+"""
+
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+
+from ai.time_parser import parse_time
+from .backtracking import popcount
+from .compatibility import CompatibilityMatrix
+from .occupancy import DAYS, day_mask
+from .patterns import pattern_key
+
+# Class start/end boundaries used by the early/late preferences (minutes from midnight)
+EARLY_BEFORE = 9 * 60
+LATE_AFTER = 17 * 60
+
+# Boolean user preferences that change the score
+PREFERENCE_KEYS = ('max_free_days', 'avoid_early', 'avoid_late')
+
+
+def preference_weights(user_preferences: dict = None) -> Dict[str, int]:
+    """Points per free day and penalties per early/late class for a set of preferences"""
+    prefs = user_preferences or {}
+    return {
+        'day': 3 + (10 if prefs.get('max_free_days', False) else 0),
+        'early': 5 if prefs.get('avoid_early', False) else 0,
+        'late': 5 if prefs.get('avoid_late', False) else 0,
+    }
+
+
+def weight_vector(user_preferences: dict = None) -> np.ndarray:
+    """Weights applied to [free days, early classes, late classes]"""
+    weights = preference_weights(user_preferences)
+    return np.array([weights['day'], -weights['early'], -weights['late']], dtype=np.int64)
+
+
+def score_feature_arrays(features: Dict[str, np.ndarray], weights: np.ndarray) -> np.ndarray:
+    """Scores from per-candidate feature arrays: [free days, early, late] @ weights"""
+    stacked = np.stack([features['free_days'], features['early'], features['late']], axis=1)
+    return stacked.astype(np.int64) @ weights
+
+
+def is_early(section: dict) -> bool:
+    """Class starts before 9 AM"""
+    start, _ = parse_time(section.get('time1', ''))
+    return 0 < start < EARLY_BEFORE
+
+
+def is_late(section: dict) -> bool:
+    """Class ends after 5 PM"""
+    _, end = parse_time(section.get('time1', ''))
+    return end > LATE_AFTER
+
+
+class ScheduleScorer:
+    """
+    Score = day_weight * (days without classes)
+            - early_weight * (early classes) - late_weight * (late classes)
+
+    which is exactly what score_schedules computes: 10 points per free day
+    when max_free_days is set, 3 points per free day for balance, and 5
+    points off per early/late class when those preferences are set.
+    """
+
+    def __init__(self, matrix: CompatibilityMatrix, user_preferences: dict = None):
+        self.matrix = matrix
+
+        weights = preference_weights(user_preferences)
+        self.day_weight = weights['day']
+        self.early_weight = weights['early']
+        self.late_weight = weights['late']
+
+        # Flat per-section features
+        self.day_bits = [day_mask(section) for section in matrix.sections]
+        self.early = [is_early(section) for section in matrix.sections]
+        self.late = [is_late(section) for section in matrix.sections]
+        self.penalty = [
+            self.early_weight * early + self.late_weight * late
+            for early, late in zip(self.early, self.late)
+        ]
+
+        # The same features as arrays for batch scoring:
+        # one row per flat section -> [7 day flags | early | late | credits]
+        day_columns = [[bool(bits >> day & 1) for day in range(len(DAYS))] for bits in self.day_bits]
+        self.day_matrix = np.array(day_columns, dtype=bool).reshape(len(self.day_bits), len(DAYS))
+        self.early_vector = np.array(self.early, dtype=np.int32)
+        self.late_vector = np.array(self.late, dtype=np.int32)
+        self.credit_vector = np.array(
+            [_credit(section) for section in matrix.sections], dtype=np.float64
+        )
+        self.weight_vector = weight_vector(user_preferences)
+        self._flat_by_id = {id(section): flat for flat, section in enumerate(matrix.sections)}
+        # Sections outside the matrix (e.g. a same-time alternative) map to their pattern
+        self._flat_by_pattern = {
+            (int(matrix.course_of[flat]), pattern_key(section)): flat
+            for flat, section in enumerate(matrix.sections)
+        }
+
+    def score_parts(self, used_days: int, penalty: int) -> int:
+        """Score from the used-day bitmask and the summed early/late penalty"""
+        return self.day_weight * (len(DAYS) - popcount(used_days)) - penalty
+
+    def score_flat(self, flat_indices: Iterable[int]) -> int:
+        """Score of a schedule given as flat matrix indices"""
+        used_days = 0
+        penalty = 0
+        for flat_idx in flat_indices:
+            used_days |= self.day_bits[flat_idx]
+            penalty += self.penalty[flat_idx]
+        return self.score_parts(used_days, penalty)
+
+    def weights(self) -> Dict[str, int]:
+        return {'day': self.day_weight, 'early': self.early_weight, 'late': self.late_weight}
+
+    @property
+    def conflict_penalty(self) -> int:
+        """
+        Cost of one clashing section pair in the approximate engines: more than
+        the best preference score minus the worst, so one conflict always costs more
+        """
+        score_range = self.day_weight * len(DAYS) + (self.early_weight + self.late_weight) * len(self.matrix.sizes)
+        return score_range + 1
+
+    def index_rows(self, section_indices: Sequence[Sequence[int]]) -> np.ndarray:
+        """(candidates, courses) array of flat indices from per-course section indices"""
+        rows = np.asarray(section_indices, dtype=np.int64).reshape(-1, len(self.matrix.offsets))
+        return rows + np.asarray(self.matrix.offsets, dtype=np.int64)
+
+    def _flat_of(self, course_idx: int, section: dict):
+        """Flat matrix index of a section dict, or None if it is not in this request"""
+        flat = self._flat_by_id.get(id(section))
+        if flat is None:
+            flat = self._flat_by_pattern.get((course_idx, pattern_key(section)))
+        return flat
+
+    def score_sections(self, sections: List[Dict]) -> int:
+        """Score of one schedule computed from its section dicts (no matrix lookup)"""
+        used_days = 0
+        penalty = 0
+        for section in sections:
+            used_days |= day_mask(section)
+            penalty += self.early_weight * is_early(section) + self.late_weight * is_late(section)
+        return self.score_parts(used_days, penalty)
+
+    def score_dicts(self, schedules: List[Dict]) -> np.ndarray:
+        """
+        Scores of any schedule dicts: one batched pass over those whose
+        sections are all in the matrix, per-dict features for the rest
+        (e.g. sections edited since the request was compiled)
+        """
+        scores = np.zeros(len(schedules), dtype=np.int64)
+        known, rows = [], []
+        course_count = len(self.matrix.offsets)
+        for i, schedule in enumerate(schedules):
+            sections = schedule['sections']
+            row = [self._flat_of(course_idx, section) for course_idx, section in enumerate(sections)]
+            if len(row) == course_count and None not in row:
+                known.append(i)
+                rows.append(row)
+            else:
+                scores[i] = self.score_sections(sections)
+        if known:
+            batch = np.asarray(rows, dtype=np.int64).reshape(len(rows), course_count)
+            scores[known] = self.score_batch(batch)
+        return scores
+
+    def feature_batch(self, rows: np.ndarray) -> Dict[str, np.ndarray]:
+        """Per-candidate features computed with NumPy reductions over flat index rows"""
+        days_used = self.day_matrix[rows].any(axis=1).sum(axis=1)
+        return {
+            'free_days': len(DAYS) - days_used,
+            'days_with_classes': days_used,
+            'early': self.early_vector[rows].sum(axis=1),
+            'late': self.late_vector[rows].sum(axis=1),
+            'total_credits': self.credit_vector[rows].sum(axis=1),
+        }
+
+    def score_features(self, features: Dict[str, np.ndarray]) -> np.ndarray:
+        """Scores from feature_batch() output: features @ weight_vector"""
+        return score_feature_arrays(features, self.weight_vector)
+
+    def score_batch(self, rows: np.ndarray) -> np.ndarray:
+        """Scores for a batch of flat index rows"""
+        return self.score_features(self.feature_batch(rows))
+
+
+def rank_scores(scores: np.ndarray) -> np.ndarray:
+    """Candidate order, best score first; ties keep their input order"""
+    return np.argsort(-scores, kind='stable')
+
+
+def _credit(section: dict) -> float:
+    try:
+        return float(section.get('credit', 0) or 0)
+    except (TypeError, ValueError):
+        return 0.0
@@ -0,0 +1,54 @@
+"""
+Time String Parsing
+Shared parser for catalog times like '08:30 AM - 09:50 AM' and '08:30:AM - 09:50:AM'
+"""
+
+import re
+from functools import lru_cache
+from typing import Optional, Tuple
+
+# Same fields datetime.strptime accepts for '%I:%M %p': hour 1-12 (optional
+# leading zero), minute 0-59 (one or two digits), AM/PM in any case,
+# separated from the minutes by whitespace
+_CLOCK = re.compile(r'(1[0-2]|0[1-9]|[1-9]):([0-5]\d|\d)\s+([AaPp][Mm])')
+
+# Catalogs repeat a few dozen distinct time strings; the caches only bound memory
+CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_clock(text: str) -> Optional[int]:
+    """
+    Minutes from midnight of one time like '08:30 AM' or '08:30:AM'
+
+    Returns None when the text is not a valid 12-hour time.
+    """
+    match = _CLOCK.fullmatch(text.replace(':AM', ' AM').replace(':PM', ' PM').strip())
+    if match is None:
+        return None
+    hour, minute, meridiem = match.groups()
+    return int(hour) % 12 * 60 + int(minute) + (720 if meridiem.upper() == 'PM' else 0)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_range(time_str: str) -> Optional[Tuple[int, int]]:
+    """
+    (start, end) minutes from midnight of a range like '08:30:AM - 09:50:AM'
+
+    Returns None unless the string is exactly two valid times joined by '-'.
+    """
+    parts = time_str.split('-')
+    if len(parts) != 2:
+        return None
+    start = parse_clock(parts[0])
+    end = parse_clock(parts[1])
+    if start is None or end is None:
+        return None
+    return start, end
+
+
+def parse_time(time_str: str) -> Tuple[int, int]:
+    """(start, end) minutes from midnight, or (0, 0) for a missing or malformed time"""
+    if not time_str:
+        return (0, 0)
+    return parse_range(time_str) or (0, 0)
@@ -5,6 +5,7 @@ A NiceGUI-based system for generating optimal course schedules
 
 import sys
 import os
+import multiprocessing
 
 # Add current directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -19,9 +20,10 @@ from pages.admin import (
     admin_manage_data_page, admin_upload_courses_page
 )
 
-# Initialize database on startup
+# Initialize database on startup (not again in AI worker processes, which import this module too)
 from backend.database import init_db
-init_db()
+if multiprocessing.parent_process() is None:
+    init_db()
 
 # =====================================================
 # APP CONFIGURATION
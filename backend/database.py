@@ -4,7 +4,7 @@ Using SQLAlchemy for ORM
 Supports both SQLite (local) and PostgreSQL (Supabase)
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import DATABASE_URL
@@ -48,6 +48,19 @@ def get_db():
 # Initialize database tables
 def init_db():
     """Create all database tables"""
-    from .models import user, course, schedule, semester, course_offering, completed_course, course_list  # Import all models
+    from .models import user, course, schedule, semester, course_offering, completed_course, course_list, meeting_slot  # Import all models
+    had_meeting_slots = inspect(engine).has_table(meeting_slot.MeetingSlot.__tablename__)
     Base.metadata.create_all(bind=engine)
     print("✅ Database tables created successfully")
+    
+    if had_meeting_slots:
+        return
+    
+    # Offerings uploaded before meeting slots existed get them once, when the table is created
+    db = SessionLocal()
+    try:
+        filled = meeting_slot.backfill_meeting_slots(db)
+        if filled:
+            print(f"✅ Built meeting slots for {filled} existing course offerings")
+    finally:
+        db.close()
@@ -10,5 +10,6 @@ from .semester import Semester
 from .course_offering import CourseOffering
 from .completed_course import CompletedCourse
 from .course_list import CourseList
+from .meeting_slot import MeetingSlot
 
-__all__ = ['User', 'Course', 'Schedule', 'Semester', 'CourseOffering', 'CompletedCourse', 'CourseList']
+__all__ = ['User', 'Course', 'Schedule', 'Semester', 'CourseOffering', 'CompletedCourse', 'CourseList', 'MeetingSlot']
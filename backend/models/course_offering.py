@@ -42,5 +42,9 @@ class CourseOffering(Base):
     # Relationship to semester
     semester = relationship("Semester", back_populates="course_offerings")
     
+    # Parsed meetings, rebuilt whenever days, times or rooms change (see meeting_slot.sync_meeting_slots)
+    meeting_slots = relationship("MeetingSlot", back_populates="offering", cascade="all, delete-orphan",
+                                 order_by="MeetingSlot.id")
+    
     def __repr__(self):
         return f"<CourseOffering {self.course_code}-{self.section}>"
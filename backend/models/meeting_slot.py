@@ -0,0 +1,77 @@
+"""
+Meeting Slot Model
+Parsed weekly meetings of a course offering (day index and minutes from midnight)
+"""
+
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from ..database import Base
+from .course_offering import CourseOffering
+
+
+class MeetingSlot(Base):
+    __tablename__ = "meeting_slots"
+    __table_args__ = (
+        Index("ix_meeting_slots_day_start", "day", "start_minute"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    offering_id = Column(Integer, ForeignKey("course_offerings.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    # Day index into TIME_SLOT_CONFIG['class_days'] (0 = Saturday)
+    day = Column(Integer, nullable=False)
+    start_minute = Column(Integer, nullable=False)  # minutes from midnight
+    end_minute = Column(Integer, nullable=False)
+    room = Column(String, nullable=True)
+
+    # Relationship to course offering
+    offering = relationship("CourseOffering", back_populates="meeting_slots")
+
+    def to_dict(self) -> dict:
+        """Slot in the section-dict format the generator and results page read"""
+        return {'day': self.day, 'start': self.start_minute, 'end': self.end_minute, 'room': self.room or ''}
+
+    def __repr__(self):
+        return f"<MeetingSlot offering={self.offering_id} day={self.day} {self.start_minute}-{self.end_minute}>"
+
+
+def build_meeting_slots(offering) -> list:
+    """
+    Meeting slots of an offering from its day/time strings
+
+    The meetings are exactly the ones the schedule generator uses (see
+    ai.schedule_generator.occupancy.section_meetings); Day 1 meets in Room 1,
+    Day 2 in Room 2 (or Room 1 when Room 2 is empty).
+    """
+    # Imported here: the AI package is only needed when slots are (re)built
+    from ai.schedule_generator.occupancy import day_index, section_meetings
+
+    section = {
+        'day1': offering.day1, 'day2': offering.day2,
+        'time1': offering.time1, 'time2': offering.time2,
+    }
+    rooms = {}
+    rooms.setdefault(day_index(offering.day1 or ''), offering.room1 or '')
+    rooms.setdefault(day_index(offering.day2 or ''), offering.room2 or offering.room1 or '')
+    return [
+        MeetingSlot(day=day, start_minute=start, end_minute=end, room=rooms.get(day, ''))
+        for day, start, end in section_meetings(section)
+    ]
+
+
+def sync_meeting_slots(offering):
+    """Replace an offering's meeting slots after its days, times or rooms changed"""
+    offering.meeting_slots = build_meeting_slots(offering)
+
+
+def backfill_meeting_slots(db) -> int:
+    """
+    Build slots for offerings saved before the meeting_slots table existed;
+    returns how many got slots (init_db runs this once, when it creates the table)
+    """
+    filled = 0
+    for offering in db.query(CourseOffering).filter(~CourseOffering.meeting_slots.any()).all():
+        sync_meeting_slots(offering)
+        filled += bool(offering.meeting_slots)
+    db.commit()
+    return filled
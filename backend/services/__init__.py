@@ -4,5 +4,6 @@ Contains core business logic separated from API routes
 """
 
 from .auth_service import AuthService
+from .semester_upload import SemesterUploadService
 
-__all__ = ['AuthService']
+__all__ = ['AuthService', 'SemesterUploadService']
@@ -0,0 +1,215 @@
+"""
+Semester Upload Service
+Applies an uploaded offering list to its semester as inserts, updates and deletes
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from ..database import SessionLocal
+from ..models.course_list import CourseList
+from ..models.course_offering import CourseOffering
+from ..models.meeting_slot import sync_meeting_slots
+from ..models.semester import Semester
+
+# Offering columns filled from an uploaded row, with the value used when the row lacks one
+OFFERING_DEFAULTS = {
+    'program': '', 'course_code': '', 'title': '', 'section': '', 'course_type': 'T', 'credit': 0,
+    'day1': '', 'day2': '', 'time1': '', 'time2': '', 'room1': '', 'room2': '',
+    'faculty_name': '', 'faculty_initial': '',
+}
+
+# Columns the meeting slots are built from
+SLOT_FIELDS = ('day1', 'day2', 'time1', 'time2', 'room1', 'room2')
+
+OfferingKey = Tuple[str, str]
+
+
+def offering_key(row) -> OfferingKey:
+    """(course code, section) of an uploaded row dict or a CourseOffering"""
+    if isinstance(row, dict):
+        return str(row.get('course_code') or '').strip(), str(row.get('section') or '').strip()
+    return (row.course_code or '').strip(), (row.section or '').strip()
+
+
+def offering_values(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Column values of an uploaded row as they are stored"""
+    values = {field: row.get(field, default) for field, default in OFFERING_DEFAULTS.items()}
+    values['credit'] = int(values['credit'] or 0)
+    return values
+
+
+def _changed_fields(offering: CourseOffering, values: Dict[str, Any]) -> List[str]:
+    return [
+        field for field, value in values.items()
+        if (getattr(offering, field) or OFFERING_DEFAULTS[field]) != (value or OFFERING_DEFAULTS[field])
+    ]
+
+
+class SemesterUploadService:
+    """Service class for saving uploaded semesters"""
+
+    @staticmethod
+    def find_semester(db: Session, semester_name: str, year: int, program: str) -> Optional[Semester]:
+        """The semester an upload replaces: the latest one with the same name, year and program"""
+        return db.query(Semester).filter(
+            Semester.semester_name == semester_name,
+            Semester.year == year,
+            Semester.program == program,
+        ).order_by(Semester.id.desc()).first()
+
+    @staticmethod
+    def plan(db: Session, semester: Optional[Semester], rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Match uploaded rows to a semester's offerings by (course code, section)
+
+        Returns:
+            {'inserts': [values], 'updates': [(offering, values, changed fields)],
+             'deletes': [offering], 'unchanged': int, 'duplicates': [key]}
+            Rows repeating an earlier row's key are listed in 'duplicates'
+            and otherwise ignored; so are extra offerings sharing one key.
+        """
+        existing: Dict[OfferingKey, CourseOffering] = {}
+        deletes = []
+        if semester is not None:
+            offerings = db.query(CourseOffering).filter(
+                CourseOffering.semester_id == semester.id
+            ).order_by(CourseOffering.id).all()
+            for offering in offerings:
+                if offering_key(offering) in existing:
+                    deletes.append(offering)
+                else:
+                    existing[offering_key(offering)] = offering
+
+        inserts, updates, duplicates = [], [], []
+        unchanged = 0
+        seen = set()
+        for row in rows:
+            key = offering_key(row)
+            if key in seen:
+                duplicates.append(key)
+                continue
+            seen.add(key)
+
+            values = offering_values(row)
+            offering = existing.pop(key, None)
+            if offering is None:
+                inserts.append(values)
+                continue
+            changed = _changed_fields(offering, values)
+            if changed:
+                updates.append((offering, values, changed))
+            else:
+                unchanged += 1
+
+        deletes.extend(existing.values())
+        return {'inserts': inserts, 'updates': updates, 'deletes': deletes,
+                'unchanged': unchanged, 'duplicates': duplicates}
+
+    @staticmethod
+    def diff_summary(semester_name: str, year: int, program: str, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        What saving the rows would change, for the upload preview
+
+        Returns:
+            {'semester_exists', 'inserts', 'updates', 'deletes', 'unchanged', 'duplicates'}
+            with the counts, plus 'changes': up to a few '<code>-<section>: fields' samples
+        """
+        db = SessionLocal()
+        try:
+            semester = SemesterUploadService.find_semester(db, semester_name, year, program)
+            plan = SemesterUploadService.plan(db, semester, rows)
+            return {
+                'semester_exists': semester is not None,
+                'inserts': len(plan['inserts']),
+                'updates': len(plan['updates']),
+                'deletes': len(plan['deletes']),
+                'unchanged': plan['unchanged'],
+                'duplicates': len(plan['duplicates']),
+                'changes': [
+                    f"{offering.course_code}-{offering.section}: {', '.join(changed)}"
+                    for offering, _, changed in plan['updates'][:5]
+                ],
+            }
+        finally:
+            db.close()
+
+    @staticmethod
+    def save_semester(semester_name: str, year: int, program: str, rows: List[Dict[str, Any]],
+                      uploaded_by: Optional[int] = None) -> Dict[str, int]:
+        """
+        Create the semester, or bring an existing one in line with the rows
+
+        Offerings keep their ids when their (course code, section) is still
+        listed; only changed columns are written, and meeting slots are only
+        rebuilt when days, times or rooms changed. New course codes are added
+        to the course list.
+
+        Returns:
+            {'semester_id', 'inserts', 'updates', 'deletes', 'unchanged', 'duplicates'}
+        """
+        db = SessionLocal()
+        try:
+            semester = SemesterUploadService.find_semester(db, semester_name, year, program)
+            plan = SemesterUploadService.plan(db, semester, rows)
+            if semester is None:
+                semester = Semester(semester_name=semester_name, year=year, program=program)
+                db.add(semester)
+            else:
+                semester.uploaded_at = func.now()
+            semester.uploaded_by = uploaded_by
+            db.flush()  # Get semester ID
+
+            for values in plan['inserts']:
+                offering = CourseOffering(semester_id=semester.id, **values)
+                # Parse days and times once here instead of on every generation request
+                sync_meeting_slots(offering)
+                db.add(offering)
+
+            for offering, values, changed in plan['updates']:
+                for field in changed:
+                    setattr(offering, field, values[field])
+                if any(field in SLOT_FIELDS for field in changed):
+                    sync_meeting_slots(offering)
+
+            for offering in plan['deletes']:
+                db.delete(offering)
+
+            SemesterUploadService._add_to_course_list(db, rows)
+            db.commit()
+            return {
+                'semester_id': semester.id,
+                'inserts': len(plan['inserts']),
+                'updates': len(plan['updates']),
+                'deletes': len(plan['deletes']),
+                'unchanged': plan['unchanged'],
+                'duplicates': len(plan['duplicates']),
+            }
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    @staticmethod
+    def _add_to_course_list(db: Session, rows: List[Dict[str, Any]]):
+        """Add course codes not yet in the master course list (existing entries are kept)"""
+        unique_courses = {}
+        for row in rows:
+            course_code = row.get('course_code', '')
+            if course_code and course_code not in unique_courses:
+                unique_courses[course_code] = {'title': row.get('title', ''), 'credit': row.get('credit', 0)}
+        if not unique_courses:
+            return
+
+        known = {
+            code for (code,) in db.query(CourseList.course_code).filter(
+                CourseList.course_code.in_(list(unique_courses))
+            )
+        }
+        for course_code, course_info in unique_courses.items():
+            if course_code not in known:
+                db.add(CourseList(course_code=course_code, title=course_info['title'],
+                                  credit=course_info['credit']))
@@ -120,9 +120,28 @@ class ScheduleGenerator:
         # TODO: Implement export functionality
         return f"schedule_{schedule['id']}.{format}"
 
-def optimize_schedule(schedules: List[Dict], preferences: Dict) -> List[Dict]:
+def optimize_schedule(schedules: List[Dict], preferences: Dict,
+                      cache_key: str = None, num_options: int = None) -> List[Dict]:
     """
     Re-rank schedules based on updated preferences
+    
+    With a cache_key from ScheduleGenerator.cache_candidates, the request's cached
+    candidate set is re-ranked from its feature matrix (no new search). On a cache
+    miss the given schedules are re-scored and re-sorted instead.
     """
-    # TODO: Implement re-ranking logic
-    return schedules
+    from ai.schedule_generator import ScheduleGenerator
+    from ai.schedule_generator.rerank_cache import get_rerank_cache
+    
+    num_options = num_options or len(schedules)
+    
+    if cache_key:
+        reranked = get_rerank_cache().rerank(cache_key, preferences, num_options)
+        if reranked is not None:
+            return reranked
+    
+    if not schedules:
+        return schedules
+    
+    generator = ScheduleGenerator(schedules[0].get('courses', []), preferences)
+    # Scoring writes 'score' into each dict; leave the caller's schedules as they are
+    return generator.score_schedules([dict(schedule) for schedule in schedules])[:num_options]
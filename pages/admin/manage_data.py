@@ -1,6 +1,7 @@
 from nicegui import ui, app
 from backend.database import SessionLocal
 from backend.models import Semester, CourseOffering
+from backend.models.meeting_slot import sync_meeting_slots
 from sqlalchemy import desc
 
 
@@ -201,6 +202,7 @@ def admin_manage_data_page():
                         offering.faculty_name = faculty_input.value
                         offering.faculty_initial = initial_input.value
                         offering.credit = int(credit_input.value)
+                        sync_meeting_slots(offering)
                         
                         db.commit()
                         ui.notify('Course updated successfully', type='positive')
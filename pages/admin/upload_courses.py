@@ -4,12 +4,12 @@ Upload PDF with course offerings and preview/edit extracted data
 """
 
 from nicegui import ui, app
+import asyncio
 import os
 import tempfile
 from typing import List, Dict, Any
-from ai.course_processor.pdf_parser import PDFParser, CourseExtractor
-from backend.database import SessionLocal
-from backend.models import Semester, CourseOffering, CourseList
+from ai.course_processor.pdf_parser import CourseExtractor
+from backend.services.semester_upload import SemesterUploadService
 
 
 # Semester options
@@ -37,6 +37,18 @@ def nav_button(icon: str, label: str, path: str, active: bool = False):
     return ui.button(label, icon=icon, on_click=lambda: ui.navigate.to(path) if path != '#' else None).props('flat').classes(classes)
 
 
+def show_parse_progress(progress_bar, progress_label, parse_progress):
+    """Show pages parsed and rows found under the upload widget"""
+    total_pages = parse_progress['total_pages']
+    if not total_pages:
+        return
+    progress_bar.value = parse_progress['pages_done'] / total_pages
+    progress_label.text = (
+        f"{parse_progress['pages_done']}/{total_pages} pages · "
+        f"{parse_progress['rows']:,} rows"
+    )
+
+
 class CourseUploadPage:
     def __init__(self):
         self.extracted_courses: List[Dict[str, Any]] = []
@@ -44,7 +56,9 @@ class CourseUploadPage:
         self.year_input = None
         self.program_select = None
         self.upload_area = None
+        self.progress_container = None
         self.preview_container = None
+        self.diff_container = None
         self.save_button = None
         
     def render(self):
@@ -93,7 +107,8 @@ class CourseUploadPage:
                             ui.label('Semester').classes('text-sm font-semibold text-gray-700')
                             self.semester_select = ui.select(
                                 SEMESTERS,
-                                value=SEMESTERS[0]
+                                value=SEMESTERS[0],
+                                on_change=self.show_diff_summary
                             ).classes('w-full')
                         
                         # Year Input
@@ -103,7 +118,8 @@ class CourseUploadPage:
                                 value=2026,
                                 min=2020,
                                 max=2030,
-                                step=1
+                                step=1,
+                                on_change=self.show_diff_summary
                             ).classes('w-full')
                         
                         # Program Selection
@@ -111,7 +127,8 @@ class CourseUploadPage:
                             ui.label('Program').classes('text-sm font-semibold text-gray-700')
                             self.program_select = ui.select(
                                 PROGRAMS,
-                                value=PROGRAMS[0]
+                                value=PROGRAMS[0],
+                                on_change=self.show_diff_summary
                             ).classes('w-full')
                     
                     ui.separator()
@@ -128,6 +145,9 @@ class CourseUploadPage:
                         ).props('accept=".pdf"').classes('w-full')
                         
                         ui.label('Accepted format: PDF only (Max 10MB)').classes('text-xs text-gray-500')
+                        
+                        # Parsing progress (hidden until a file is uploaded)
+                        self.progress_container = ui.column().classes('w-full gap-1').style('display: none')
                 
                     # Preview Container (hidden initially)
                     self.preview_container = ui.column().classes('w-full max-w-6xl gap-4 mt-6').style('display: none')
@@ -140,23 +160,30 @@ class CourseUploadPage:
             # Get the file path - NiceGUI already saved it to a temp location
             file_path = str(e.file._path)
             
-            # Extract courses from PDF directly
-            courses = PDFParser.parse_pdf(file_path)
+            # Parse in a worker thread; the parser reports its page and row
+            # counts there and the UI polls them
+            self.progress_container.clear()
+            self.progress_container.style('display: flex')
+            with self.progress_container:
+                progress_bar = ui.linear_progress(value=0, show_value=False).classes('w-full')
+                progress_label = ui.label('Opening PDF...').classes('text-xs text-gray-600')
             
-            if not courses:
-                ui.notify('No course data found in PDF', type='negative')
-                return
-            
-            # Process and validate courses
-            self.extracted_courses = []
-            for course in courses:
-                # Clean and validate
-                cleaned = CourseExtractor.clean_course_data(course)
-                if CourseExtractor.validate_course_data(cleaned):
-                    self.extracted_courses.append(cleaned)
+            parse_progress = {'pages_done': 0, 'total_pages': 0, 'rows': 0}
+            parsing = asyncio.create_task(asyncio.to_thread(
+                CourseExtractor.extract_courses, file_path, progress_callback=parse_progress.update
+            ))
+            while not parsing.done():
+                show_parse_progress(progress_bar, progress_label, parse_progress)
+                await asyncio.sleep(0.1)
+            self.extracted_courses, cached = await parsing
+            if cached:
+                progress_bar.value = 1
+                progress_label.text = f'Same file as an earlier upload · {len(self.extracted_courses):,} rows'
+            else:
+                show_parse_progress(progress_bar, progress_label, parse_progress)
             
             if not self.extracted_courses:
-                ui.notify('No valid courses extracted', type='negative')
+                ui.notify('No valid courses found in PDF', type='negative')
                 return
             
             ui.notify(f'Extracted {len(self.extracted_courses)} courses successfully', type='positive')
@@ -184,6 +211,10 @@ class CourseUploadPage:
                         ui.button('Save All Courses', icon='save', on_click=self.save_courses, color='positive')
                 
                 ui.label('Review and edit the extracted data before saving').classes('text-sm text-gray-600 mb-4')
+                
+                # What saving changes in the selected semester (refreshed when it changes)
+                self.diff_container = ui.column().classes('w-full gap-1 mb-4')
+                self.show_diff_summary()
                 ui.label('💡 Click on any cell to edit. Changes are saved automatically.').classes('text-xs text-orange-600 mb-2')
                 
                 # Create editable grid
@@ -201,10 +232,13 @@ class CourseUploadPage:
                     {'name': 'credit', 'label': 'Credit', 'field': 'credit', 'sortable': True, 'align': 'center', 'editable': True},
                 ]
                 
+                # Course codes repeat across sections; rows are keyed by their position
+                for row_id, course in enumerate(self.extracted_courses):
+                    course['row_id'] = row_id
                 table = ui.table(
                     columns=columns,
                     rows=self.extracted_courses,
-                    row_key='course_code'
+                    row_key='row_id'
                 ).classes('w-full')
                 
                 # Make table cells editable
@@ -243,8 +277,10 @@ class CourseUploadPage:
                 
                 def save_edit(row, field, value, dialog):
                     """Save edited value"""
-                    row[field] = value
+                    # The event carries a copy of the row; edit the extracted course it came from
+                    self.extracted_courses[row['row_id']][field] = value
                     table.update()
+                    self.show_diff_summary()
                     ui.notify(f'Updated {field}', type='positive')
                     dialog.close()
                 
@@ -255,100 +291,70 @@ class CourseUploadPage:
                     ui.button('Cancel', icon='close', on_click=self.cancel_upload).props('outline').classes('text-gray-600')
                     ui.button('Save All Courses', icon='save', on_click=self.save_courses, color='positive')
     
+    def show_diff_summary(self, _=None):
+        """Show how saving would change the selected semester's offerings"""
+        if self.diff_container is None or not self.extracted_courses or not self.year_input.value:
+            return
+        diff = SemesterUploadService.diff_summary(
+            self.semester_select.value, int(self.year_input.value), self.program_select.value, self.extracted_courses
+        )
+        
+        self.diff_container.clear()
+        with self.diff_container:
+            if not diff['semester_exists']:
+                ui.label(f"New semester: {diff['inserts']} sections will be added").classes('text-sm text-gray-700')
+                return
+            
+            with ui.row().classes('gap-2 items-center'):
+                ui.label('Changes to the saved semester:').classes('text-sm font-semibold text-gray-700')
+                ui.badge(f"+{diff['inserts']} new", color='positive')
+                ui.badge(f"~{diff['updates']} changed", color='warning')
+                ui.badge(f"-{diff['deletes']} removed", color='negative')
+                ui.badge(f"{diff['unchanged']} unchanged", color='grey')
+            for change in diff['changes']:
+                ui.label(change).classes('text-xs text-gray-600')
+            if diff['updates'] > len(diff['changes']):
+                ui.label(f"... and {diff['updates'] - len(diff['changes'])} more changed sections").classes('text-xs text-gray-600')
+            if diff['duplicates']:
+                ui.label(f"{diff['duplicates']} rows repeat a course code and section and will be skipped").classes('text-xs text-orange-600')
+    
     def cancel_upload(self):
         """Cancel and clear upload"""
         self.extracted_courses = []
+        self.diff_container = None
         self.preview_container.clear()
         self.preview_container.style('display: none')
         ui.notify('Upload cancelled', type='info')
     
     async def save_courses(self):
-        """Save all courses to database"""
+        """Save the courses, applying only the differences to an existing semester"""
         try:
             ui.notify('Saving courses to database...', type='info')
             
-            db = SessionLocal()
+            result = SemesterUploadService.save_semester(
+                self.semester_select.value,
+                int(self.year_input.value),
+                self.program_select.value,
+                self.extracted_courses,
+                uploaded_by=app.storage.user.get('id')
+            )
             
-            try:
-                # Create semester record
-                semester = Semester(
-                    semester_name=self.semester_select.value,
-                    year=int(self.year_input.value),
-                    program=self.program_select.value,
-                    uploaded_by=app.storage.user.get('id')
-                )
-                db.add(semester)
-                db.flush()  # Get semester ID
-                
-                # Track unique courses for course_list
-                unique_courses = {}
-                
-                # Create course offering records
-                for course in self.extracted_courses:
-                    # Add to course offerings
-                    offering = CourseOffering(
-                        semester_id=semester.id,
-                        program=course.get('program', ''),
-                        course_code=course.get('course_code', ''),
-                        title=course.get('title', ''),
-                        section=course.get('section', ''),
-                        course_type=course.get('course_type', 'T'),
-                        credit=course.get('credit', 0),
-                        day1=course.get('day1', ''),
-                        day2=course.get('day2', ''),
-                        time1=course.get('time1', ''),
-                        time2=course.get('time2', ''),
-                        room1=course.get('room1', ''),
-                        room2=course.get('room2', ''),
-                        faculty_name=course.get('faculty_name', ''),
-                        faculty_initial=course.get('faculty_initial', '')
-                    )
-                    db.add(offering)
-                    
-                    # Track unique courses by course_code
-                    course_code = course.get('course_code', '')
-                    if course_code and course_code not in unique_courses:
-                        unique_courses[course_code] = {
-                            'title': course.get('title', ''),
-                            'credit': course.get('credit', 0)
-                        }
-                
-                # Update course_list table (add new courses, skip existing)
-                for course_code, course_info in unique_courses.items():
-                    # Check if course already exists in course_list
-                    existing = db.query(CourseList).filter(
-                        CourseList.course_code == course_code
-                    ).first()
-                    
-                    if not existing:
-                        # Add new course to master list
-                        new_course = CourseList(
-                            course_code=course_code,
-                            title=course_info['title'],
-                            credit=course_info['credit']
-                        )
-                        db.add(new_course)
-                
-                db.commit()
-                
-                ui.notify(f'Successfully saved {len(self.extracted_courses)} courses!', type='positive')
-                
-                # Clear and reset
-                self.extracted_courses = []
-                self.preview_container.clear()
-                self.preview_container.style('display: none')
-                
-            except Exception as e:
-                db.rollback()
-                raise e
-            finally:
-                db.close()
+            ui.notify(
+                f"Saved: {result['inserts']} added, {result['updates']} updated, "
+                f"{result['deletes']} removed, {result['unchanged']} unchanged",
+                type='positive'
+            )
+            
+            # Clear and reset
+            self.extracted_courses = []
+            self.diff_container = None
+            self.preview_container.clear()
+            self.preview_container.style('display: none')
                 
         except Exception as ex:
             ui.notify(f'Error saving courses: {str(ex)}', type='negative')
             print(f"Save error: {ex}")
 
-
 def admin_upload_courses_page():
     """Entry point for the upload courses page"""
     page = CourseUploadPage()
@@ -2,8 +2,11 @@ from nicegui import ui, app
 from components import create_header, create_footer
 from backend.database import SessionLocal
 from backend.models import CourseOffering
+from sqlalchemy.orm import selectinload
 from ai.schedule_generator import ScheduleGenerator
+from ai.config import SCHEDULE_GENERATION_CONFIG
 import asyncio
+import time
 
 # Analysis steps
 analysis_steps = [
@@ -56,13 +59,14 @@ def processing_page():
                         ui.label('Overall Progress').classes('text-sm font-medium text-gray-700')
                         progress_label = ui.label('0%').classes('text-sm font-bold text-[#ff6900]')
                     progress_bar = ui.linear_progress(value=0).classes('w-full').props('size=8px color=primary')
+                    search_label = ui.label('').classes('text-xs text-gray-500')
         
-        # Start processing simulation
-        ui.timer(0.1, lambda: start_processing(step_cards, progress_bar, progress_label), once=True)
+        # Start processing
+        ui.timer(0.1, lambda: start_processing(step_cards, progress_bar, progress_label, search_label), once=True)
     
     create_footer()
 
-async def start_processing(step_cards, progress_bar, progress_label):
+async def start_processing(step_cards, progress_bar, progress_label, search_label):
     """Process schedule generation with visual updates"""
     
     try:
@@ -83,14 +87,15 @@ async def start_processing(step_cards, progress_bar, progress_label):
         
         # Step 2: Fetch course sections from database
         await update_step(step_cards, progress_bar, progress_label, 1, "Fetching course sections...")
-        await asyncio.sleep(1)
         
         db = SessionLocal()
         try:
             courses_with_sections = []
             for course_code in selected_course_codes:
                 # Get all sections for this course
-                offerings = db.query(CourseOffering).filter(
+                offerings = db.query(CourseOffering).options(
+                    selectinload(CourseOffering.meeting_slots)
+                ).filter(
                     CourseOffering.semester_id == semester_id,
                     CourseOffering.course_code == course_code
                 ).all()
@@ -109,7 +114,8 @@ async def start_processing(step_cards, progress_bar, progress_label):
                             'time2': offering.time2,
                             'faculty_name': offering.faculty_name,
                             'room1': offering.room1,
-                            'room2': offering.room2
+                            'room2': offering.room2,
+                            'meeting_slots': [slot.to_dict() for slot in offering.meeting_slots]
                         }
                         sections.append(section_data)
                     
@@ -124,7 +130,6 @@ async def start_processing(step_cards, progress_bar, progress_label):
         
         # Step 3: Apply faculty preferences
         await update_step(step_cards, progress_bar, progress_label, 2, "Applying faculty preferences...")
-        await asyncio.sleep(1)
         
         # Filter sections based on faculty preferences if specified
         if faculty_preferences:
@@ -136,32 +141,63 @@ async def start_processing(step_cards, progress_bar, progress_label):
         
         # Step 4: Initialize schedule generator
         await update_step(step_cards, progress_bar, progress_label, 3, "Detecting time conflicts...")
-        await asyncio.sleep(0.5)
+        
+        # One budget for everything the response waits on: generation, counting, caching
+        deadline_ms = SCHEDULE_GENERATION_CONFIG['deadline_ms']
+        deadline = None if deadline_ms is None else time.monotonic() + deadline_ms / 1000
         
         generator = ScheduleGenerator(courses_with_sections, user_preferences)
+        await asyncio.to_thread(generator.get_compatibility_matrix)
         
         # Step 5: Generate schedules
         await update_step(step_cards, progress_bar, progress_label, 4, "Generating schedule combinations...")
         
-        # Run generation in chunks to show progress
-        schedules = await asyncio.to_thread(generator.generate_schedules, num_options=10)
+        # The search reports its counters from the worker thread; the UI polls them
+        search_progress = {'explored': 0, 'pruned': 0, 'found': 0}
+        generation = asyncio.create_task(asyncio.to_thread(
+            generator.generate_schedules, num_options=10, progress_callback=search_progress.update,
+            deadline_ms=remaining_ms(deadline)
+        ))
+        while not generation.done():
+            show_search_progress(search_label, search_progress)
+            await asyncio.sleep(0.1)
+        schedules = await generation
+        show_search_progress(search_label, search_progress)
+        if generator.last_run and not generator.last_run['completed']:
+            ui.notify('Search time limit reached - showing the best schedules found so far', type='info')
         
         # Step 6: Score and rank
         await update_step(step_cards, progress_bar, progress_label, 5, "Scoring and ranking schedules...")
-        await asyncio.sleep(0.5)
         
         if not schedules:
             ui.notify('⚠️ No valid schedules found. Conflicts detected between selected courses.', type='warning')
+            # Point at the sections/courses that make the selection impossible
+            for finding in generator.diagnose_conflicts()[:3]:
+                ui.notify(finding['message'], type='info')
+            drops = generator.last_run.get('suggested_drops')
+            if drops:
+                ui.notify(f"Removing {', '.join(drops)} would leave a conflict-free selection", type='info')
             await asyncio.sleep(3)
             ui.navigate.to('/upload')
             return
         
+        # How many conflict-free combinations exist (counted, not enumerated)
+        # (an estimate if the budget runs out first)
+        schedule_count = await asyncio.to_thread(generator.count_schedules, remaining_ms(deadline))
+        
+        # Keep the candidate set server-side so /results can re-rank on preference changes
+        cache_key = await asyncio.to_thread(generator.cache_candidates, 10, remaining_ms(deadline))
+        
         # Store results in session
         app.storage.user['generated_schedules'] = schedules
         app.storage.user['generation_metadata'] = {
             'total_courses': len(selected_course_codes),
             'total_schedules': len(schedules),
-            'preferences_applied': user_preferences
+            'preferences_applied': user_preferences,
+            'cache_key': cache_key,
+            'num_options': 10,
+            'search': generator.last_run,
+            'valid_schedule_count': schedule_count
         }
         
         # Complete
@@ -179,6 +215,13 @@ async def start_processing(step_cards, progress_bar, progress_label):
         ui.navigate.to('/upload')
 
 
+def remaining_ms(deadline):
+    """Milliseconds left before a time.monotonic() deadline (None = no limit)"""
+    if deadline is None:
+        return None
+    return max(0, int((deadline - time.monotonic()) * 1000))
+
+
 async def update_step(step_cards, progress_bar, progress_label, current_step, message):
     """Update progress display"""
     total_steps = len(analysis_steps)
@@ -202,4 +245,14 @@ async def update_step(step_cards, progress_bar, progress_label, current_step, me
                     ui.icon('radio_button_unchecked', size='sm').classes('text-gray-400')
                     ui.label(step).classes('text-gray-500')
     
-    await asyncio.sleep(0.5)
+    # Yield so the update reaches the browser before the next step starts
+    await asyncio.sleep(0)
+
+
+def show_search_progress(search_label, search_progress):
+    """Show live search counters under the progress bar"""
+    search_label.text = (
+        f"{search_progress['explored']:,} combinations explored · "
+        f"{search_progress['pruned']:,} pruned · "
+        f"{search_progress['found']:,} valid schedules found"
+    )
@@ -2,6 +2,8 @@ from nicegui import ui, app
 from components import (
     create_header, create_footer, create_primary_button, create_secondary_button
 )
+from core.scheduler import optimize_schedule
+from ai.time_parser import parse_clock
 from io import BytesIO
 from datetime import datetime
 
@@ -86,6 +88,31 @@ def results_page():
                         with ui.column().classes('gap-1'):
                             ui.label('Options Generated').classes('text-sm text-gray-600')
                             ui.label(str(len(schedules))).classes('text-2xl font-bold text-gray-800')
+                
+                schedule_count = metadata.get('valid_schedule_count')
+                if schedule_count:
+                    prefix = '' if schedule_count['exact'] else '~'
+                    with ui.card().classes('flex-1 p-6 bg-blue-50 border-l-4 border-blue-500'):
+                        with ui.row().classes('items-center gap-3'):
+                            ui.icon('calculate', size='lg').classes('text-blue-600')
+                            with ui.column().classes('gap-1'):
+                                ui.label('Valid Combinations').classes('text-sm text-gray-600')
+                                ui.label(f"{prefix}{schedule_count['count']:,}").classes('text-2xl font-bold text-gray-800')
+            
+            # Preference adjustments (re-ranked from the cached candidates, no new search)
+            applied = metadata.get('preferences_applied', {})
+            with ui.card().classes('w-full p-6 shadow-sm'):
+                ui.label('Adjust Preferences').classes('text-lg font-semibold text-gray-800 mb-2')
+                with ui.row().classes('w-full items-center gap-6'):
+                    max_free = ui.checkbox('Maximize free days', value=applied.get('max_free_days', False))
+                    avoid_early = ui.checkbox('Avoid early classes (before 9 AM)', value=applied.get('avoid_early', False))
+                    avoid_late = ui.checkbox('Avoid evening classes (after 5 PM)', value=applied.get('avoid_late', False))
+                    ui.space()
+                    create_secondary_button(
+                        'Re-rank Schedules',
+                        on_click=lambda: rerank_schedules(max_free.value, avoid_early.value, avoid_late.value),
+                        icon='sort'
+                    )
             
             # Schedule Options Tabs
             schedule_tabs = ui.tabs().classes('w-full')
@@ -117,45 +144,62 @@ def results_page():
     create_footer()
 
 
+def rerank_schedules(max_free, avoid_early, avoid_late):
+    """Re-rank the generated schedules for new preferences and reload the page"""
+    metadata = app.storage.user.get('generation_metadata', {})
+    schedules = app.storage.user.get('generated_schedules', [])
+    preferences = {
+        'max_free_days': max_free,
+        'avoid_early': avoid_early,
+        'avoid_late': avoid_late
+    }
+    
+    reranked = optimize_schedule(
+        schedules, preferences,
+        cache_key=metadata.get('cache_key'),
+        num_options=metadata.get('num_options', len(schedules))
+    )
+    
+    app.storage.user['generated_schedules'] = reranked
+    metadata['preferences_applied'] = preferences
+    metadata['total_schedules'] = len(reranked)
+    app.storage.user['generation_metadata'] = metadata
+    
+    ui.notify('✓ Schedules re-ranked for your new preferences', type='positive')
+    ui.navigate.to('/results')
+
+
 def time_to_minutes(time_str):
     """Convert time string to minutes from midnight"""
-    try:
-        # Extract start time from range like "08:30 AM - 09:50 AM"
-        if ' - ' in time_str:
-            time_str = time_str.split(' - ')[0].strip()
-        elif '-' in time_str:
-            time_str = time_str.split('-')[0].strip()
-        
-        # Handle formats: "08:30 AM" or "08:30:AM"
-        time_str = time_str.replace(':AM', ' AM').replace(':PM', ' PM')
-        from datetime import datetime
-        time_obj = datetime.strptime(time_str.strip(), '%I:%M %p')
-        return time_obj.hour * 60 + time_obj.minute
-    except Exception as e:
-        print(f"Error parsing time '{time_str}': {e}")
+    time_str = time_str or ''
+    # Extract start time from range like "08:30 AM - 09:50 AM"
+    if ' - ' in time_str:
+        time_str = time_str.split(' - ')[0]
+    elif '-' in time_str:
+        time_str = time_str.split('-')[0]
+    
+    # Handles "08:30 AM" and "08:30:AM"
+    minutes = parse_clock(time_str)
+    if minutes is None:
+        print(f"Error parsing time '{time_str.strip()}'")
         return 0
+    return minutes
 
 def get_time_duration(time_str):
     """Get duration in minutes from time range like '08:30 AM - 10:30 AM'"""
-    try:
-        if ' - ' in time_str:
-            parts = time_str.split(' - ')
-        elif '-' in time_str:
-            parts = time_str.split('-')
-        else:
-            return 80  # Default duration
-        
-        start_str = parts[0].strip().replace(':AM', ' AM').replace(':PM', ' PM')
-        end_str = parts[1].strip().replace(':AM', ' AM').replace(':PM', ' PM')
-        
-        from datetime import datetime
-        start = datetime.strptime(start_str, '%I:%M %p')
-        end = datetime.strptime(end_str, '%I:%M %p')
-        
-        duration = (end.hour * 60 + end.minute) - (start.hour * 60 + start.minute)
-        return duration
-    except:
+    time_str = time_str or ''
+    if ' - ' in time_str:
+        parts = time_str.split(' - ')
+    elif '-' in time_str:
+        parts = time_str.split('-')
+    else:
+        return 80  # Default duration
+    
+    start = parse_clock(parts[0])
+    end = parse_clock(parts[1])
+    if start is None or end is None:
         return 80
+    return end - start
 
 def normalize_day(day_str):
     """Normalize day name from various formats"""
@@ -175,8 +219,10 @@ def normalize_day(day_str):
 
 def find_time_slot(start_time):
     """Find which time slot index a start time falls into"""
-    start_minutes = time_to_minutes(start_time)
-    
+    return find_time_slot_minutes(time_to_minutes(start_time))
+
+def find_time_slot_minutes(start_minutes):
+    """Find which time slot index a start minute (from midnight) falls into"""
     if start_minutes == 0:
         return None
     
@@ -213,6 +259,27 @@ def convert_schedule_to_calendar(schedule):
         course_code = section.get('course_code', '')
         course_title = course_titles.get(course_code, course_code)
         
+        # Sections loaded from the database carry meetings parsed at upload time
+        if section.get('meeting_slots') is not None:
+            for slot in section['meeting_slots']:
+                slot_idx = find_time_slot_minutes(slot['start'])
+                if slot['day'] >= len(WEEKDAYS) or slot_idx is None:
+                    continue
+                if course_type == 'Lab':
+                    calendar_key = f"{WEEKDAYS[slot['day']]}_{slot_idx}_lab"
+                else:
+                    calendar_key = f"{WEEKDAYS[slot['day']]}_{slot_idx}"
+                calendar[calendar_key] = {
+                    'course': course_title,
+                    'code': course_code,
+                    'section': section.get('section', ''),
+                    'faculty': section.get('faculty_name', ''),
+                    'room': slot['room'] or 'TBA',
+                    'type': course_type,
+                    'duration': slot['end'] - slot['start']
+                }
+            continue
+        
         # Process day1/time1
         day1 = section.get('day1', '').strip()
         time1 = section.get('time1', '').strip()
@@ -356,6 +423,11 @@ def render_calendar_view(schedule, schedule_number):
         with ui.card().classes('w-full p-6 mt-4 shadow-lg'):
             ui.label('Course Details').classes('text-xl font-bold text-gray-800 mb-4')
             
+            # Other sections meeting at the same times (grouped by the generator)
+            same_time = {}
+            for section, alternatives in zip(schedule.get('sections', []), schedule.get('alternatives', [])):
+                same_time[f"{section.get('course_code', '')}_{section.get('section', '')}"] = alternatives
+            
             # Deduplicate courses by code + section
             unique_courses = {}
             for course_key in calendar.keys():
@@ -387,6 +459,14 @@ def render_calendar_view(schedule, schedule_number):
                                     ui.icon('meeting_room', size='sm').classes('text-gray-600')
                                     ui.label(course['room']).classes('text-sm text-gray-600')
                                     ui.badge(course['type'], color='primary').classes('text-xs ml-2')
+                                
+                                alternatives = same_time.get(unique_key, [])
+                                if alternatives:
+                                    options = ', '.join(
+                                        f"Section {alt.get('section', '')} ({alt.get('faculty_name', '')})"
+                                        for alt in alternatives
+                                    )
+                                    ui.label(f'Same time: {options}').classes('text-xs text-gray-500')
 
 
 def render_course_cell(course, is_lab=False, span_slots=1):